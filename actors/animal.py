@@ -3,7 +3,10 @@ from ui.text_randomizer import rt
 
 
 class Animal:
-    def __init__(self, name, hostile, biome, room_id, legendary=False, den_id=None):
+    def __init__(self, name, hostile, biome, room_id, legendary=False, den_id=None, rng=None):
+        # World generation passes its own seeded RNG so rooms are reproducible
+        rng = rng or random
+
         self.name = name
         self.hostile = hostile
         self.biome = biome
@@ -12,7 +15,7 @@ class Animal:
         self.den_id = den_id
 
         # Personalities: timid, aggressive, curious, territorial
-        self.personality = random.choice(["timid", "aggressive", "curious", "territorial"])
+        self.personality = rng.choice(["timid", "aggressive", "curious", "territorial"])
 
         # Stats
         if legendary:
@@ -22,16 +25,16 @@ class Animal:
             self.speed = 6
             self.tier = 5
         elif hostile:
-            self.hp = random.randint(20, 35)
-            self.atk = random.randint(3, 6)
-            self.defense = random.randint(1, 3)
-            self.speed = random.randint(2, 4)
+            self.hp = rng.randint(20, 35)
+            self.atk = rng.randint(3, 6)
+            self.defense = rng.randint(1, 3)
+            self.speed = rng.randint(2, 4)
             self.tier = 1
         else:
-            self.hp = random.randint(10, 20)
+            self.hp = rng.randint(10, 20)
             self.atk = 0
             self.defense = 0
-            self.speed = random.randint(1, 3)
+            self.speed = rng.randint(1, 3)
             self.tier = 0
 
         self.status_effects = []
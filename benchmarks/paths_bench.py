@@ -0,0 +1,132 @@
+"""
+Pathfinding cost per simulated day.
+
+Caravans and emissaries move on their own schedules (World.schedule_agents)
+and ask core.pathfinding for their next step. This benchmark builds a
+world, lets whole days pass with World.advance_time(24), and reports how
+much of each day went into pathfinding: distance-field builds, A* routes
+and the total, next to the length of the whole day. Faction fields are
+built by populate_world (see core.pathfinding), so its time is reported
+too:
+
+    python -m benchmarks.paths_bench --sizes 60 120 240 --days 10 --output paths.json
+
+Tracing (core.trace) is switched off while the benchmark runs.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from core.trace import tracer
+from core.world import World
+
+DEFAULT_SIZES = (60, 120, 240)
+
+
+class _Timed:
+    """Wraps a Pathfinder method, counting calls and the time spent in them."""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+        self.seconds = 0.0
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.fn(*args, **kwargs)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.calls += 1
+
+
+def bench_size(size: int, days=10, seed=0) -> dict:
+    """Simulate `days` days of one world size; returns a JSON-ready dict."""
+    random.seed(seed)
+    world = World(size=size, seed=seed)
+    world.generate()
+    start = time.perf_counter()
+    world.populate_world()
+    populate_seconds = time.perf_counter() - start
+
+    paths = world.paths
+    fields = paths.build_field = _Timed(paths.build_field)
+    routes = paths.find = _Timed(paths.find)
+
+    day_seconds, path_seconds = [], []
+    for _ in range(days):
+        before = fields.seconds + routes.seconds
+        start = time.perf_counter()
+        tracer.begin_tick()
+        world.advance_time(24)
+        day_seconds.append(time.perf_counter() - start)
+        path_seconds.append(fields.seconds + routes.seconds - before)
+
+    return {
+        "size": size,
+        "rooms": size * size,
+        "days": days,
+        "caravans": len(world.traveling_merchants),
+        "emissaries": len(world.faction_emissaries),
+        "populate_seconds": round(populate_seconds, 6),
+        "seconds_per_day": round(sum(day_seconds) / days, 6),
+        "max_day_seconds": round(max(day_seconds), 6),
+        "path_seconds_per_day": round(sum(path_seconds) / days, 6),
+        "max_day_path_seconds": round(max(path_seconds), 6),
+        "field_builds": fields.calls,
+        "field_seconds": round(fields.seconds, 6),
+        "routes": routes.calls,
+        "route_seconds": round(routes.seconds, 6),
+    }
+
+
+def run(sizes=DEFAULT_SIZES, days=10, seed=0, progress=None) -> dict:
+    results = []
+    with tracer.silenced():
+        for size in sizes:
+            if progress:
+                progress(f"size {size} ...")
+            results.append(bench_size(size, days, seed))
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"days": days, "seed": seed},
+        "results": results,
+    }
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure pathfinding cost per simulated day.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--days", type=int, default=10, help="days to simulate per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(
+        sizes=args.sizes,
+        days=max(1, args.days),
+        seed=args.seed,
+        progress=lambda msg: print(msg, file=sys.stderr),
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Replay a recorded session headless (see core.replay).
+
+Runs main.run_game with the recorded seed and inputs, checks every tick
+against the log, and times how long each command took to handle, so a
+slow tick from a real session can be reproduced and benchmarked:
+
+    MYTH_REPLAY=session.jsonl python main.py
+    python -m benchmarks.replay session.jsonl --repeat 5 --output replay.json
+
+With --repeat the session is played several times and each command's
+median time is reported, along with the tick stage latencies of the last
+run (core.profiler). Tracing (core.trace) is switched off unless
+--trace is given.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from core.profiler import Profiler
+from core.replay import ReplayDiverged, ReplayFinished, replay_log
+from core.trace import tracer
+
+
+def replay_once(path: str) -> dict:
+    """Play a log back once; raises ReplayDiverged if the world drifts from it."""
+    from main import run_game
+
+    replay_log.__init__()
+    header = replay_log.load(path)
+    saved, tracer.profiler = tracer.profiler, Profiler()
+
+    start = time.perf_counter()
+    finished = True
+    try:
+        run_game(header.get("snapshot"))
+    except ReplayFinished:
+        # The recording stopped without a clean quit
+        finished = False
+    finally:
+        elapsed = time.perf_counter() - start
+        profiler, tracer.profiler = tracer.profiler, saved
+
+    replay_log.close()
+    return {
+        "seconds": round(elapsed, 6),
+        "inputs": replay_log.inputs,
+        "ticks": replay_log.ticks,
+        "state_verified": finished,
+        "timings": replay_log.timings,
+        "stages": profiler.summary(),
+    }
+
+
+def run(path: str, repeat: int = 1, top: int = 10, trace: bool = False) -> dict:
+    runs = []
+    for _ in range(repeat):
+        if trace:
+            runs.append(replay_once(path))
+        else:
+            with tracer.silenced():
+                runs.append(replay_once(path))
+
+    # Median time per command across runs
+    commands = []
+    for i, (n, text, _) in enumerate(runs[0]["timings"]):
+        ms = statistics.median(r["timings"][i][2] for r in runs) * 1000
+        commands.append({"n": n, "text": text, "ms": round(ms, 3)})
+
+    return {
+        "log": path,
+        "seed": replay_log.header["seed"],
+        "inputs": runs[0]["inputs"],
+        "ticks": runs[0]["ticks"],
+        "state_verified": runs[0]["state_verified"],
+        "seconds": [r["seconds"] for r in runs],
+        "stages": runs[-1]["stages"],
+        "slowest": sorted(commands, key=lambda c: c["ms"], reverse=True)[:top],
+        "commands": commands,
+    }
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded session and time every command.")
+    parser.add_argument("log", help="replay log written with MYTH_REPLAY")
+    parser.add_argument("--repeat", type=int, default=1, help="play the session this many times")
+    parser.add_argument("--top", type=int, default=10, help="slowest commands to list")
+    parser.add_argument("--trace", action="store_true", help="keep MYTH_TRACE settings while replaying")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        tracer.configure_from_env()
+
+    try:
+        report = run(args.log, repeat=max(1, args.repeat), top=args.top, trace=args.trace)
+    except ReplayDiverged as exc:
+        print(f"Replay diverged: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Headless soak and throughput runner.
+
+Builds a world of a given size and seed and plays N commands through
+main.handle_command the way a player would: a random walk (or a script
+of commands), resting when hurt or tired, answering every combat and
+dialogue prompt. All output goes to a null sink. Every --sample-every
+commands it records throughput, process memory and entity counts, so
+leaks and slowdowns in long sessions show up as trends:
+
+    python -m benchmarks.soak --size 100 --moves 20000 --output soak.json
+    python -m benchmarks.soak --size 50 --script route.txt --moves 5000
+
+A script holds one command per line and is repeated until --moves have
+been played. The run stops at the first exception, which is reported
+with the command that raised it (exit status 1).
+
+"ticks" counts the world ticks the commands ran: one per move that went
+through, each rest and each wait.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import traceback
+from contextlib import redirect_stdout
+
+from core.player import Player
+from core.trace import tracer
+from core.world import World
+from ui.text_effects import set_headless, set_input
+
+# Nested prompts (combat rounds, dialogue choices) allowed per command
+MAX_PROMPTS = 500
+
+
+class SoakError(Exception):
+    pass
+
+
+# ============================================================
+# POLICIES
+# ============================================================
+
+class RandomPolicy:
+    """Wander at random, now and then looking around; rest when worn down."""
+
+    # (command, weight) besides moving. No "talk": NPC has no describe() or
+    # greet() yet, so the talk command fails on its first line.
+    EXTRAS = (("look", 3), ("map", 2), ("quests", 2))
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def command(self, world, player) -> str:
+        if player.hp < player.max_hp * 0.4 or player.fatigue > 80:
+            return "rest"
+
+        roll = self.rng.randrange(100)
+        for cmd, weight in self.EXTRAS:
+            if roll < weight:
+                return cmd
+            roll -= weight
+
+        exits = sorted(world.get_room(player.room_id).exits)
+        return self.rng.choice(exits) if exits else "look"
+
+
+class ScriptPolicy:
+    """Replay a list of commands, over and over."""
+
+    def __init__(self, commands: list):
+        if not commands:
+            raise SoakError("The script has no commands")
+        self.commands = commands
+        self.next = 0
+
+    def command(self, world, player) -> str:
+        cmd = self.commands[self.next % len(self.commands)]
+        self.next += 1
+        return cmd
+
+
+class _Prompts:
+    """Answers every prompt inside a command: attack in combat, first choice, then goodbye."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, prompt):
+        self.count += 1
+        if self.count > MAX_PROMPTS:
+            raise SoakError(f"More than {MAX_PROMPTS} prompts in one command")
+        return "bye" if prompt.startswith("You") else "1"
+
+
+class _CountingTicker:
+    """The session's ticker, counting the world ticks moves start on it."""
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+        self.count = 0
+
+    def start(self, fn, *args):
+        self.count += 1
+        self.ticker.start(fn, *args)
+
+    def join(self):
+        return self.ticker.join()
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+
+def _rss_bytes():
+    """Resident memory of this process (peak RSS where /proc isn't available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _sample(world, player, moves, ticks, start, last) -> dict:
+    now = time.perf_counter()
+    entities = world.entities
+    animals = sum(len(a) for _, a in entities.animal_rooms())
+
+    sample = {
+        "moves": moves,
+        "seconds": round(now - start, 4),
+        "ticks": ticks,
+        "world_hours": world.world_time,
+        "day": world.day,
+        "rss_bytes": _rss_bytes(),
+        "entities": len(entities),
+        "npcs": len(entities) - animals,
+        "animals": animals,
+        "scheduled_jobs": len(world.scheduler),
+        "player_hp": player.hp,
+    }
+    if last is not None:
+        elapsed = now - start - last["seconds"]
+        ticks = sample["ticks"] - last["ticks"]
+        sample["ticks_per_sec"] = round(ticks / elapsed, 2) if elapsed > 0 else None
+        sample["moves_per_sec"] = round((moves - last["moves"]) / elapsed, 2) if elapsed > 0 else None
+    return sample
+
+
+# ============================================================
+# RUN
+# ============================================================
+
+def run(size, seed, moves, policy, sample_every=500, chunked=False, progress=None) -> dict:
+    import main
+
+    random.seed(seed)
+    set_headless()
+    report = {"size": size, "seed": seed, "moves": moves, "chunked": chunked, "samples": []}
+
+    with open(os.devnull, "w") as null, redirect_stdout(null):
+        start = time.perf_counter()
+        world = World(size=size, seed=seed, chunked=chunked)
+        world.generate()
+        world.populate_world()
+        report["build_seconds"] = round(time.perf_counter() - start, 4)
+
+        player = Player("Soak", world.start_room_id)
+        player.mount = None
+        sim, ticker = main.start_session(world, player)
+
+        prompts = _Prompts()
+        set_input(prompts)
+        ticks = _CountingTicker(ticker)
+
+        start = time.perf_counter()
+        last = _sample(world, player, 0, 0, start, None)
+        report["samples"].append(last)
+
+        cmd = None
+        try:
+            for move in range(1, moves + 1):
+                cmd = policy.command(world, player)
+                prompts.count = 0
+                before = world.world_time
+                main.handle_command(cmd, world, player, ticks)
+
+                # Rest and wait tick the world without the ticker
+                if (cmd == "rest" or cmd.startswith("wait ")) and world.world_time != before:
+                    ticks.count += 1
+
+                if move % sample_every == 0 or move == moves:
+                    last = _sample(world, player, move, ticks.count, start, last)
+                    report["samples"].append(last)
+                    if progress:
+                        progress(f"{move} moves, {last['ticks_per_sec']} ticks/s, "
+                                 f"{last['entities']} entities, rss {last['rss_bytes']}")
+        except Exception as exc:
+            report["error"] = f"move {move} ({cmd!r}): {exc!r}"
+            report["traceback"] = traceback.format_exc()
+            report["samples"].append(_sample(world, player, move, ticks.count, start, last))
+        finally:
+            main.end_session(world, player, sim, ticker)
+            set_input(None)
+
+    samples = report["samples"]
+    first, final = samples[0], samples[-1]
+    report["summary"] = {
+        "seconds": final["seconds"],
+        "ticks": final["ticks"] - first["ticks"],
+        "ticks_per_sec": round((final["ticks"] - first["ticks"]) / final["seconds"], 2) if final["seconds"] else None,
+        "rss_growth_bytes": (
+            final["rss_bytes"] - first["rss_bytes"]
+            if final["rss_bytes"] is not None and first["rss_bytes"] is not None else None
+        ),
+        "entity_growth": final["entities"] - first["entities"],
+    }
+    return report
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play a long headless session and track throughput and memory.")
+    parser.add_argument("--size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--moves", type=int, default=5000, help="commands to play")
+    parser.add_argument("--script", help="file with one command per line (default: random walk)")
+    parser.add_argument("--sample-every", type=int, default=500)
+    parser.add_argument("--chunked", action="store_true", help="chunked world (World(chunked=True))")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.script:
+        with open(args.script) as f:
+            policy = ScriptPolicy([line.strip().lower() for line in f if line.strip()])
+    else:
+        policy = RandomPolicy(args.seed)
+
+    with tracer.silenced():
+        report = run(
+            size=args.size,
+            seed=args.seed,
+            moves=args.moves,
+            policy=policy,
+            sample_every=max(1, args.sample_every),
+            chunked=args.chunked,
+            progress=lambda msg: print(msg, file=sys.stderr),
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if "error" in report:
+        print(f"Soak failed at {report['error']}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+World scaling benchmarks.
+
+Times World.generate, populate_world and simulate_faction_war across a
+range of world sizes and records wall time, tracemalloc peak memory and
+object counts for every phase. Results are written as JSON so runs can be
+compared over time:
+
+    python -m benchmarks.world_bench --sizes 10 50 100 --output bench.json
+
+Tracing (core.trace) is switched off while the benchmarks run.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from core.trace import tracer
+from core.world import World
+
+# World edge lengths benchmarked by default
+DEFAULT_SIZES = (10, 50, 100, 250, 500, 1000, 2000)
+
+# Above this edge length "auto" mode benchmarks chunked worlds; an eager
+# 2000x2000 world needs several GB of Room objects
+EAGER_LIMIT = 500
+
+MODES = ("auto", "eager", "chunked", "compact")
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+
+def _measure(fn, trace_memory: bool) -> dict:
+    """Run fn once; wall time plus the tracemalloc peak reached during it."""
+    gc.collect()
+    if trace_memory:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+
+    result = {"seconds": round(elapsed, 6)}
+    if trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        result["peak_bytes"] = peak - before
+        result["retained_bytes"] = current - before
+    return result
+
+
+def _object_counts(world) -> dict:
+    """How much the world holds right now (resident rooms only when chunked)."""
+    rooms = world.rooms.values()
+    npcs = sum(len(room.npcs) for room in rooms)
+    animals = sum(len(room.animals) for room in rooms)
+    count = len(rooms) or 1
+
+    return {
+        "rooms": len(rooms),
+        "npcs": npcs,
+        "animals": animals,
+        "npcs_per_room": round(npcs / count, 4),
+        "animals_per_room": round(animals / count, 4),
+        "gc_objects": len(gc.get_objects()),
+    }
+
+
+# ============================================================
+# BENCHMARK RUN
+# ============================================================
+
+def _resolve_mode(size: int, mode: str) -> str:
+    if mode == "auto":
+        return "eager" if size <= EAGER_LIMIT else "chunked"
+    return mode
+
+
+def bench_size(size: int, mode="auto", days=5, seed=0, workers=None,
+               trace_memory=True) -> dict:
+    """Benchmark one world size; returns a JSON-ready dict."""
+    mode = _resolve_mode(size, mode)
+
+    # populate_world and the war draw from the global generator
+    random.seed(seed)
+    world = World(
+        size=size,
+        seed=seed,
+        chunked=mode == "chunked",
+        compact=mode == "compact",
+    )
+
+    phases = {}
+    phases["generate"] = _measure(lambda: world.generate(workers), trace_memory)
+    phases["generate"]["counts"] = _object_counts(world)
+
+    phases["populate_world"] = _measure(lambda: world.populate_world(workers), trace_memory)
+    phases["populate_world"]["counts"] = _object_counts(world)
+
+    def war():
+        for _ in range(days):
+            tracer.begin_tick()
+            world.simulate_faction_war()
+
+    phases["simulate_faction_war"] = _measure(war, trace_memory)
+    phases["simulate_faction_war"]["days"] = days
+    phases["simulate_faction_war"]["seconds_per_day"] = round(
+        phases["simulate_faction_war"]["seconds"] / max(days, 1), 6
+    )
+    phases["simulate_faction_war"]["counts"] = _object_counts(world)
+    phases["simulate_faction_war"]["territory"] = world.faction_counts()
+
+    return {"size": size, "rooms": size * size, "mode": mode, "phases": phases}
+
+
+def run(sizes=DEFAULT_SIZES, mode="auto", days=5, seed=0, workers=None,
+        trace_memory=True, progress=None) -> dict:
+    """Benchmark every size in turn with tracing silenced."""
+    if trace_memory:
+        tracemalloc.start()
+
+    results = []
+    try:
+        with tracer.silenced():
+            for size in sizes:
+                if progress:
+                    progress(f"size {size} ...")
+                results.append(bench_size(size, mode, days, seed, workers, trace_memory))
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "mode": mode,
+            "days": days,
+            "seed": seed,
+            "workers": workers,
+            "tracemalloc": trace_memory,
+        },
+        "results": results,
+    }
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark world generation and simulation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--mode", choices=MODES, default="auto",
+                        help=f"room storage (auto = eager up to {EAGER_LIMIT}, chunked above)")
+    parser.add_argument("--days", type=int, default=5, help="faction war days to simulate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-tracemalloc", action="store_true",
+                        help="skip memory tracing (it slows every allocation down)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(
+        sizes=args.sizes,
+        mode=args.mode,
+        days=args.days,
+        seed=args.seed,
+        workers=args.workers,
+        trace_memory=not args.no_tracemalloc,
+        progress=lambda msg: print(msg, file=sys.stderr),
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Chunked room storage for very large worlds.
+
+The map is cut into square chunks of CHUNK_SIZE x CHUNK_SIZE rooms. Every
+chunk is generated from its own seed (derived from the world seed and the
+chunk coordinates), so a chunk can be built on demand, dropped, and built
+again later with exactly the same rooms.
+"""
+
+# Default edge length of a chunk, in rooms
+CHUNK_SIZE = 16
+
+
+# ============================================================
+# CHUNK GEOMETRY
+# ============================================================
+
+def chunk_of(room_id: int, size: int, chunk_size: int = CHUNK_SIZE) -> tuple:
+    """Chunk coordinates (cx, cy) that contain a room."""
+    y, x = divmod(room_id, size)
+    return x // chunk_size, y // chunk_size
+
+
+def chunk_room_ids(cx: int, cy: int, size: int, chunk_size: int = CHUNK_SIZE) -> list:
+    """Room ids inside a chunk, in row-major order."""
+    x0, y0 = cx * chunk_size, cy * chunk_size
+    x1, y1 = min(x0 + chunk_size, size), min(y0 + chunk_size, size)
+    return [y * size + x for y in range(y0, y1) for x in range(x0, x1)]
+
+
+def chunks_per_side(size: int, chunk_size: int = CHUNK_SIZE) -> int:
+    return (size + chunk_size - 1) // chunk_size
+
+
+def chunk_seed(world_seed: int, cx: int, cy: int, stream: str) -> str:
+    """
+    Seed for one chunk and one random stream ("biome", "rooms", ...).
+    Strings are hashed with SHA-512 by random.Random, so the seed is
+    stable across processes and Python runs.
+    """
+    return f"{world_seed}:{cx}:{cy}:{stream}"
+
+
+def _fingerprint(rooms) -> int:
+    """
+    Cheap identity of a chunk's mutable state (biome, tags, occupants).
+    Faction control isn't part of it: the territory bitsets hold it and a
+    rebuilt chunk takes it from them (World._apply_territories).
+    """
+    return hash(tuple(
+        (
+            room.biome,
+            frozenset(room.tags),
+            tuple(map(id, room.npcs)),
+            tuple(map(id, room.animals)),
+        )
+        for room in rooms
+    ))
+
+
+# ============================================================
+# CHUNKED ROOM MAPPING
+# ============================================================
+
+class ChunkedRooms:
+    """
+    Dict-like stand-in for World.rooms that materializes chunks lazily.
+
+    - rooms[rid] builds the owning chunk on first access
+    - iteration (keys/values/items, len) only covers resident rooms
+    - `rid in rooms` is true for every room id on the map
+
+    A chunk is "pristine" while its biomes, tags and occupants are the
+    ones it was built with. Only pristine chunks are ever evicted,
+    because they can be rebuilt from their seed; anything the player or
+    the simulation touched stays resident.
+    """
+
+    def __init__(self, world, chunk_size: int = CHUNK_SIZE):
+        self.world = world
+        self.size = world.size
+        self.chunk_size = chunk_size
+
+        self._rooms = {}        # room_id -> Room (resident rooms only)
+        self._chunks = {}       # (cx, cy) -> list of room ids
+        self._pristine = {}     # (cx, cy) -> fingerprint at build time
+        self._visited = set()   # chunks the player has stood in
+
+    # ------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------
+
+    def __getitem__(self, room_id: int):
+        room = self._rooms.get(room_id)
+        if room is not None:
+            return room
+        if room_id not in self:
+            raise KeyError(room_id)
+        self.load_chunk(*chunk_of(room_id, self.size, self.chunk_size))
+        return self._rooms[room_id]
+
+    def __setitem__(self, room_id: int, room):
+        self._rooms[room_id] = room
+
+    def __contains__(self, room_id) -> bool:
+        return isinstance(room_id, int) and 0 <= room_id < self.size * self.size
+
+    def __iter__(self):
+        return iter(list(self._rooms))
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def get(self, room_id, default=None):
+        return self[room_id] if room_id in self else default
+
+    def keys(self):
+        return list(self._rooms.keys())
+
+    def values(self):
+        return list(self._rooms.values())
+
+    def items(self):
+        return list(self._rooms.items())
+
+    # ------------------------------------------------------------
+    # Residency
+    # ------------------------------------------------------------
+
+    def is_resident(self, room_id: int) -> bool:
+        return room_id in self._rooms
+
+    def resident_chunks(self) -> list:
+        return list(self._chunks.keys())
+
+    def load_chunk(self, cx: int, cy: int) -> list:
+        """Build a chunk (if needed) and return its rooms."""
+        key = (cx, cy)
+        if key not in self._chunks:
+            rooms = self.world._build_chunk(cx, cy)
+            self.world._register_chunk(cx, cy, rooms)
+            for room in rooms:
+                self._rooms[room.id] = room
+            self._chunks[key] = [room.id for room in rooms]
+
+            # A chunk born after populate_world gets its local NPCs now
+            if self.world._populated:
+                self.world._populate_chunk(cx, cy, rooms)
+
+            self._pristine[key] = _fingerprint(rooms)
+
+        return [self._rooms[rid] for rid in self._chunks[key]]
+
+    def mark_visited(self, room_id: int):
+        self._visited.add(chunk_of(room_id, self.size, self.chunk_size))
+
+    def is_pristine(self, cx: int, cy: int) -> bool:
+        key = (cx, cy)
+        if key in self._visited or key not in self._pristine:
+            return False
+        rooms = [self._rooms[rid] for rid in self._chunks[key]]
+        if _fingerprint(rooms) == self._pristine[key]:
+            return True
+
+        # Touched once means touched for good
+        del self._pristine[key]
+        return False
+
+    def evict_far_chunks(self, room_id: int, radius: int = 1) -> int:
+        """
+        Drop pristine chunks further than `radius` chunks from a room.
+        Returns the number of chunks evicted.
+        """
+        ccx, ccy = chunk_of(room_id, self.size, self.chunk_size)
+        evicted = 0
+
+        for key in list(self._chunks.keys()):
+            cx, cy = key
+            if max(abs(cx - ccx), abs(cy - ccy)) <= radius:
+                continue
+            if not self.is_pristine(cx, cy):
+                continue
+
+            ids = self._chunks.pop(key)
+            self.world._unregister_chunk(cx, cy, [self._rooms[rid] for rid in ids])
+            for rid in ids:
+                del self._rooms[rid]
+            del self._pristine[key]
+            evicted += 1
+
+        return evicted
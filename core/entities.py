@@ -0,0 +1,228 @@
+"""
+Central registry of where every NPC and animal is.
+
+EntityIndex maps each entity to its room and each room to an ordered set
+of occupants. room.npcs / room.animals are Occupants views owned by the
+index, so moving an entity is two dict operations instead of a list scan,
+and npc.room_id is only ever written here, in step with room membership.
+
+Only rooms in memory are indexed: a chunked world drops the entities of
+an evicted chunk. A loaded snapshot indexes every room's occupants up
+front (core.snapshot), though its rooms are only built when looked up.
+"""
+
+from collections import Counter
+
+
+# ============================================================
+# OCCUPANTS (ORDERED SET VIEW)
+# ============================================================
+
+class Occupants:
+    """
+    Read-only, insertion-ordered view of the NPCs or animals in one room.
+    Supports iteration, len, `in` and indexing like the old lists; all
+    changes go through the EntityIndex.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items=()):
+        self._items = dict.fromkeys(items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, entity):
+        return entity in self._items
+
+    def __getitem__(self, index):
+        return list(self._items)[index]
+
+    def __repr__(self):
+        return f"Occupants({list(self._items)!r})"
+
+    # --- index only ----------------------------------------------
+
+    def _add(self, entity):
+        self._items[entity] = None
+
+    def _discard(self, entity):
+        self._items.pop(entity, None)
+        if not self._items:
+            # Dicts never shrink; a room a big herd passed through would
+            # keep its table forever
+            self._items = {}
+
+
+# ============================================================
+# ENTITY INDEX
+# ============================================================
+
+class EntityIndex:
+    def __init__(self, world):
+        self.world = world
+
+        self._where = {}        # entity -> room_id
+        self._npcs = {}         # room_id -> Occupants
+        self._animals = {}      # room_id -> Occupants
+        self._by_id = {}        # npc_id -> npc
+        self._names = Counter() # npc name -> count
+
+        # Animals per room by temperament, for hunting lookups (zero counts removed)
+        self.prey = Counter()       # room_id -> non-hostile animals
+        self.predators = Counter()  # room_id -> hostile animals
+
+    @staticmethod
+    def _kind(entity) -> str:
+        return "animals" if getattr(entity, "is_animal", False) else "npcs"
+
+    def _table(self, kind: str) -> dict:
+        return self._animals if kind == "animals" else self._npcs
+
+    def _occupants(self, kind: str, room_id: int) -> Occupants:
+        """The room's Occupants, created and attached to the room on first use."""
+        table = self._table(kind)
+        occupants = table.get(room_id)
+        if occupants is None:
+            # Building a lazy room may adopt its occupants, so look again
+            room = self.world.rooms[room_id]
+            occupants = table.get(room_id)
+            if occupants is None:
+                occupants = table[room_id] = Occupants()
+                setattr(room, kind, occupants)
+        return occupants
+
+    def _track(self, entity, room_id: int):
+        self._where[entity] = room_id
+        if self._kind(entity) == "npcs":
+            self._by_id[entity.npc_id] = entity
+            self._names[entity.name] += 1
+        else:
+            (self.predators if entity.hostile else self.prey)[room_id] += 1
+
+    def _untrack(self, entity):
+        room_id = self._where.pop(entity)
+        if self._kind(entity) == "npcs":
+            if self._by_id.get(entity.npc_id) is entity:
+                del self._by_id[entity.npc_id]
+            self._names[entity.name] -= 1
+        else:
+            counts = self.predators if entity.hostile else self.prey
+            counts[room_id] -= 1
+            if not counts[room_id]:
+                del counts[room_id]
+
+    def _materialize(self, entity):
+        """Lazy worlds: build the entity's recorded room so its occupants are indexed."""
+        room_id = getattr(entity, "room_id", None)
+        if entity not in self._where and room_id is not None and room_id in self.world.rooms:
+            self.world.rooms[room_id]
+
+    # ------------------------------------------------------------
+    # Rooms entering / leaving memory
+    # ------------------------------------------------------------
+
+    def adopt_room(self, room):
+        """Index the occupants a room was built or loaded with."""
+        for kind in ("npcs", "animals"):
+            if not getattr(room, kind):
+                continue
+
+            # Anyone already indexed has moved on since the room was saved
+            entities = [e for e in getattr(room, kind) if e not in self._where]
+            setattr(room, kind, self.adopt(room.id, kind, entities))
+
+    def adopt(self, room_id: int, kind: str, entities) -> Occupants:
+        """Index entities standing in a room, built or not; returns its Occupants view."""
+        occupants = Occupants(entities)
+        self._table(kind)[room_id] = occupants
+        for entity in entities:
+            entity.room_id = room_id
+            self._track(entity, room_id)
+        return occupants
+
+    def views(self, room_id: int) -> tuple:
+        """(npcs, animals) Occupants of a room being built after its occupants were indexed."""
+        found = []
+        for kind in ("npcs", "animals"):
+            table = self._table(kind)
+            occupants = table.get(room_id)
+            if occupants is None:
+                occupants = table[room_id] = Occupants()
+            found.append(occupants)
+        return tuple(found)
+
+    def drop_room(self, room):
+        """Forget a room's occupants (its chunk is being evicted)."""
+        for table in (self._npcs, self._animals):
+            for entity in table.pop(room.id, ()):
+                self._untrack(entity)
+
+    # ------------------------------------------------------------
+    # Movement
+    # ------------------------------------------------------------
+
+    def add(self, entity, room_id: int):
+        """Place an entity in a room (moving it if it is already somewhere)."""
+        self._materialize(entity)
+
+        old = self._where.get(entity)
+        if old is not None:
+            self._table(self._kind(entity))[old]._discard(entity)
+            self._untrack(entity)
+
+        self._occupants(self._kind(entity), room_id)._add(entity)
+        self._track(entity, room_id)
+        entity.room_id = room_id
+
+    move = add
+
+    def remove(self, entity) -> bool:
+        """Despawn an entity; False if it wasn't in any room."""
+        self._materialize(entity)
+
+        room_id = self._where.get(entity)
+        if room_id is None:
+            return False
+
+        self._table(self._kind(entity))[room_id]._discard(entity)
+        self._untrack(entity)
+        return True
+
+    # ------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------
+
+    def room_of(self, entity):
+        """Room id of an indexed entity, or None."""
+        return self._where.get(entity)
+
+    def placed(self, entity) -> bool:
+        """Whether an entity is still in the world (building its room if it is lazy)."""
+        self._materialize(entity)
+        return entity in self._where
+
+    def find_npc(self, npc_id: str):
+        return self._by_id.get(npc_id)
+
+    def has_npc_named(self, name: str) -> bool:
+        return self._names[name] > 0
+
+    def npcs_in(self, room_id: int):
+        return self._npcs.get(room_id, ())
+
+    def animals_in(self, room_id: int):
+        return self._animals.get(room_id, ())
+
+    def animal_rooms(self):
+        """(room_id, animals) for every indexed room that has animals."""
+        for room_id, animals in self._animals.items():
+            if animals:
+                yield room_id, animals
+
+    def __len__(self):
+        return len(self._where)
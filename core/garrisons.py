@@ -0,0 +1,76 @@
+"""
+Faction garrisons as counters.
+
+A garrison is a number of defenders per (room, faction) rather than one
+NPC object each, so reinforcing a room every day costs a counter bump
+instead of an ever-growing crowd of Defender NPCs. The war reads and
+writes the counters directly; World.materialize_garrison turns a room's
+counters into real NPCs while the player is there, and
+World.fold_garrison puts the survivors back when they leave.
+"""
+
+from collections import Counter
+
+
+class Garrisons:
+    def __init__(self):
+        self._rooms = {}    # room_id -> Counter(faction -> defenders)
+
+    def reinforce(self, room_id: int, faction: str, count: int = 1):
+        if count > 0:
+            self._rooms.setdefault(room_id, Counter())[faction] += count
+
+    def count(self, room_id: int, faction: str | None = None) -> int:
+        """Defenders in a room (of one faction, or all of them)."""
+        garrison = self._rooms.get(room_id)
+        if not garrison:
+            return 0
+        return garrison[faction] if faction else garrison.total()
+
+    def factions_in(self, room_id: int) -> set:
+        return set(self._rooms.get(room_id, ()))
+
+    def take(self, room_id: int) -> Counter:
+        """Remove and return a room's whole garrison."""
+        return self._rooms.pop(room_id, Counter())
+
+    def keep_only(self, room_id: int, faction: str) -> int:
+        """Drop every other faction's defenders from a room; returns how many fell."""
+        garrison = self._rooms.get(room_id)
+        if not garrison:
+            return 0
+
+        kept = garrison[faction]
+        lost = garrison.total() - kept
+        if kept:
+            self._rooms[room_id] = Counter({faction: kept})
+        else:
+            del self._rooms[room_id]
+        return lost
+
+    def totals(self) -> Counter:
+        """Defenders per faction across the whole world."""
+        totals = Counter()
+        for garrison in self._rooms.values():
+            totals.update(garrison)
+        return totals
+
+    # ------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------
+
+    def entries(self) -> list:
+        """[[room_id, faction, count], ...], ordered by room."""
+        return [
+            [rid, faction, count]
+            for rid in sorted(self._rooms)
+            for faction, count in self._rooms[rid].items()
+        ]
+
+    def load(self, entries):
+        self._rooms = {}
+        for rid, faction, count in entries:
+            self.reinforce(rid, faction, count)
+
+    def __len__(self):
+        return len(self._rooms)
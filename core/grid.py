@@ -0,0 +1,97 @@
+"""
+Implicit grid adjacency.
+
+The world is a regular size x size grid, so a room's neighbors follow
+from its coordinates. GridAdjacency computes them on the fly and only
+stores the exceptions: custom links between rooms and locked exits.
+"""
+
+import random
+
+# Exit order matches the order rooms were originally built with
+DIRECTIONS = ("west", "east", "north", "south")
+
+
+class _SparseDict(dict):
+    """Empty per-room dict that only joins its owner once written to."""
+
+    __slots__ = ("_owner", "_rid")
+
+    def __init__(self, owner, rid):
+        super().__init__()
+        self._owner = owner
+        self._rid = rid
+
+    def __setitem__(self, key, value):
+        self._owner.setdefault(self._rid, self)
+        super().__setitem__(key, value)
+
+
+class GridAdjacency:
+    def __init__(self, size: int):
+        self.size = size
+        self.count = size * size
+
+        # Neighbor offsets, in DIRECTIONS order
+        self._offsets = (-1, 1, -size, size)
+
+        # Exceptions only
+        self.links = {}     # room_id -> {direction: room_id}
+        self.locked = {}    # room_id -> {direction: key/reason}
+
+    # ------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------
+
+    def _is_interior(self, room_id: int) -> bool:
+        x = room_id % self.size
+        return 0 < x < self.size - 1 and self.size <= room_id < self.count - self.size
+
+    def exits(self, room_id: int) -> dict:
+        """direction -> room id, as the old per-room exits dict."""
+        size = self.size
+        y, x = divmod(room_id, size)
+
+        exits = {}
+        if x > 0:
+            exits["west"] = room_id - 1
+        if x < size - 1:
+            exits["east"] = room_id + 1
+        if y > 0:
+            exits["north"] = room_id - size
+        if y < size - 1:
+            exits["south"] = room_id + size
+
+        custom = self.links.get(room_id)
+        if custom:
+            exits.update(custom)
+        return exits
+
+    def neighbors(self, room_id: int) -> tuple:
+        """Ids of every room reachable in one step."""
+        if room_id not in self.links and self._is_interior(room_id):
+            return (room_id - 1, room_id + 1, room_id - self.size, room_id + self.size)
+        return tuple(self.exits(room_id).values())
+
+    def random_neighbor(self, room_id: int, rng=random):
+        """
+        A uniformly random neighbor, or None for a room with no exits.
+        Draws exactly like random.choice over the exits dict's values.
+        """
+        if room_id not in self.links and self._is_interior(room_id):
+            return room_id + self._offsets[rng.randrange(4)]
+
+        options = self.neighbors(room_id)
+        return rng.choice(options) if options else None
+
+    # ------------------------------------------------------------
+    # Exceptions
+    # ------------------------------------------------------------
+
+    def link(self, room_id: int, direction: str, target_id: int):
+        """Add (or redirect) a single exit, e.g. a tunnel or portal."""
+        self.links.setdefault(room_id, {})[direction] = target_id
+
+    def locked_exits(self, room_id: int) -> dict:
+        found = self.locked.get(room_id)
+        return found if found is not None else _SparseDict(self.locked, room_id)
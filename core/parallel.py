@@ -0,0 +1,100 @@
+"""
+Multi-process world generation.
+
+The grid is split into horizontal bands of chunk rows, one band per
+ProcessPoolExecutor worker. Every chunk already has its own seed derived
+from the world seed, so how the bands are cut never changes the rooms:
+a parallel build is identical to a single-process build with the same
+seed.
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+
+# ============================================================
+# BANDS
+# ============================================================
+
+def split_bands(coords: list, workers: int) -> list:
+    """
+    Split row-major chunk coords into at most `workers` bands of whole
+    chunk rows, keeping their order.
+    """
+    rows = []
+    for cx, cy in coords:
+        if not rows or rows[-1][0][1] != cy:
+            rows.append([])
+        rows[-1].append((cx, cy))
+
+    workers = max(1, min(workers, len(rows)))
+    per_band, extra = divmod(len(rows), workers)
+
+    bands, start = [], 0
+    for i in range(workers):
+        end = start + per_band + (1 if i < extra else 0)
+        bands.append([c for row in rows[start:end] for c in row])
+        start = end
+    return bands
+
+
+def _run_bands(fn, jobs: list, workers: int) -> list:
+    """Run one job per worker and return the results in job order."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, *zip(*jobs)))
+
+
+# ============================================================
+# WORKERS (module level so they can be pickled)
+# ============================================================
+
+def _generate_band(size: int, seed: int, chunk_size: int, coords: list) -> list:
+    import core.world as world_module
+    from core.trace import tracer
+
+    tracer.silence()
+    world = world_module.World(size=size, seed=seed, chunk_size=chunk_size)
+    return [world._build_chunk(cx, cy) for cx, cy in coords]
+
+
+def _ambient_band(seed: int, jobs: list) -> list:
+    from core.chunks import chunk_seed
+    from core.world import World
+
+    return [
+        World._ambient_specs(room_biomes, random.Random(chunk_seed(seed, cx, cy, "ambient")))
+        for cx, cy, room_biomes in jobs
+    ]
+
+
+# ============================================================
+# ENTRY POINTS (used by World.generate / World.populate_world)
+# ============================================================
+
+def generate_chunks(world, coords: list, workers: int) -> list:
+    """Rooms for every chunk in `coords`, built across worker processes."""
+    bands = split_bands(coords, workers)
+    jobs = [(world.size, world.seed, world.chunk_size, band) for band in bands]
+
+    chunks = []
+    for band_rooms in _run_bands(_generate_band, jobs, len(bands)):
+        chunks.extend(band_rooms)
+    return chunks
+
+
+def ambient_specs(seed: int, chunk_jobs: list, workers: int) -> list:
+    """
+    Ambient NPC specs per chunk. chunk_jobs holds (cx, cy, [(room_id, biome)])
+    in row-major chunk order.
+    """
+    bands = split_bands([(cx, cy) for cx, cy, _ in chunk_jobs], workers)
+
+    jobs, start = [], 0
+    for band in bands:
+        jobs.append((seed, chunk_jobs[start:start + len(band)]))
+        start += len(band)
+
+    specs = []
+    for band_specs in _run_bands(_ambient_band, jobs, len(bands)):
+        specs.extend(band_specs)
+    return specs
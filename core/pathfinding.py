@@ -0,0 +1,272 @@
+"""
+Pathfinding over the room grid.
+
+Moving into a room costs MOVE_COSTS[biome]. Pathfinder answers two kinds
+of question:
+
+    find(start, goal, budget)   one A* path, for a single destination;
+                                with a budget, the way to the closest room
+                                it reached (caravans and emissaries walk
+                                that leg, then ask again)
+    toward_faction(faction)     a DistanceField: cost to the nearest room
+    toward_biome(biome)         in a target set, and the next room to step
+                                into, for every room on the map
+
+Distance fields are one multi-source Dijkstra from the targets, run
+backwards over the exits, and are cached. Any number of agents can then
+follow shortest paths with one array lookup per step (field.next_room).
+Biome fields live until the map itself changes (World.set_biome,
+World.link_rooms).
+
+A field is a whole-map pure-Python search (about 1.3 s at 512x512), far
+too slow for a player's move, so faction fields are only built by
+prepare_factions(), when the world is populated or loaded, and never
+during a tick. Borders move every war day after that; the old field
+still leads to where the territory was, and an agent it strands falls
+back to budgeted find() legs towards a room the faction holds now.
+"""
+
+import heapq
+from array import array
+
+from core.chunks import chunk_room_ids
+
+MOVE_COSTS = {
+    "plains": 1,
+    "forest": 2,
+    "desert": 2,
+    "swamp": 3,
+    "mountain": 4,
+}
+DEFAULT_COST = 2
+
+UNREACHABLE = -1
+
+# Rooms find() expands per leg when it is given a budget (ROUTE_BUDGET)
+ROUTE_BUDGET = 4096
+
+
+class DistanceField:
+    """Cost to the nearest target and next step towards it, per room."""
+
+    __slots__ = ("key", "token", "dist", "step")
+
+    def __init__(self, key, token, dist: array, step: array):
+        self.key = key
+        self.token = token  # what the field was built from, to spot stale ones
+        self.dist = dist
+        self.step = step
+
+    def distance(self, room_id: int):
+        """Move cost to the nearest target, or None if none is reachable."""
+        d = self.dist[room_id]
+        return None if d == UNREACHABLE else d
+
+    def next_room(self, room_id: int):
+        """Room to move into from room_id; None at a target or when stuck."""
+        nxt = self.step[room_id]
+        return None if nxt == UNREACHABLE else nxt
+
+
+class ChunkCosts:
+    """Move costs of a chunked world, indexed like the bytearray; decodes one chunk at a time."""
+
+    def __init__(self, world):
+        self.world = world
+        self._chunks = {}   # (cx, cy) -> {room_id: cost}
+
+    def __getitem__(self, room_id: int) -> int:
+        key = self.world._chunk_of(room_id)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._chunks[key] = {
+                rid: MOVE_COSTS.get(self.world.biome_of(rid), DEFAULT_COST)
+                for rid in chunk_room_ids(*key, self.world.size, self.world.chunk_size)
+            }
+        return chunk[room_id]
+
+
+class Pathfinder:
+    def __init__(self, world):
+        self.world = world
+        self._fields = {}       # key -> DistanceField
+        self._costs = None      # bytearray, move cost into each room
+        self._version = 0       # bumped whenever the map changes
+
+    # ------------------------------------------------------------
+    # Map data
+    # ------------------------------------------------------------
+
+    def costs(self):
+        """
+        Per-room move costs, built from the biome index (no rooms are built).
+        A chunked world has no map-wide index; its costs are looked up per
+        room and cached per chunk (ChunkCosts).
+        """
+        if self._costs is None:
+            if self.world.chunked:
+                self._costs = ChunkCosts(self.world)
+                return self._costs
+            costs = bytearray([DEFAULT_COST]) * self.world.grid.count
+            for biome, room_ids in self.world.biome_index.items():
+                cost = MOVE_COSTS.get(biome, DEFAULT_COST)
+                for rid in room_ids:
+                    costs[rid] = cost
+            self._costs = costs
+        return self._costs
+
+    def invalidate(self):
+        """The map changed (biomes or exits): drop every cached field."""
+        self._version += 1
+        self._costs = None
+        self._fields.clear()
+
+    def _predecessors(self):
+        """room_id -> rooms with an exit into it (the grid, minus redirected exits)."""
+        grid = self.world.grid
+        if not grid.links:
+            # Plain grid exits are symmetric
+            return grid.neighbors
+
+        reverse = {}
+        for rid, exits in grid.links.items():
+            for target in exits.values():
+                reverse.setdefault(target, []).append(rid)
+
+        size = grid.size
+
+        def predecessors(room_id):
+            y, x = divmod(room_id, size)
+            found = []
+            for v, ok in (
+                (room_id - 1, x > 0),
+                (room_id + 1, x < size - 1),
+                (room_id - size, y > 0),
+                (room_id + size, y < size - 1),
+            ):
+                # A custom link may have redirected v's exit towards us
+                if ok and (v not in grid.links or room_id in grid.exits(v).values()):
+                    found.append(v)
+            found.extend(reverse.get(room_id, ()))
+            return found
+
+        return predecessors
+
+    # ------------------------------------------------------------
+    # Distance fields
+    # ------------------------------------------------------------
+
+    def build_field(self, key, token, targets) -> DistanceField:
+        """Multi-source Dijkstra from `targets` (uncached)."""
+        count = self.world.grid.count
+        costs = self.costs()
+        predecessors = self._predecessors()
+
+        dist = array("i", [UNREACHABLE]) * count
+        step = array("i", [UNREACHABLE]) * count
+
+        heap = []
+        for rid in targets:
+            dist[rid] = 0
+            heap.append((0, rid))
+        heapq.heapify(heap)
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+
+            # Stepping from v into u costs u's biome
+            nd = d + costs[u]
+            for v in predecessors(u):
+                if dist[v] == UNREACHABLE or nd < dist[v]:
+                    dist[v] = nd
+                    step[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        return DistanceField(key, token, dist, step)
+
+    def _cached(self, key, token, targets):
+        field = self._fields.get(key)
+        if field is None or field.token != token:
+            field = self._fields[key] = self.build_field(key, token, targets())
+        return field
+
+    def prepare_factions(self):
+        """Build a field towards every faction's current territory (world setup only)."""
+        territories = self.world.territories
+        for faction in territories:
+            mask = territories.masks.get(faction, 0)
+            if mask:
+                self._cached(("faction", faction), mask, lambda: territories.rooms(faction))
+
+    def toward_faction(self, faction: str):
+        """
+        Field towards a faction's territory as it was at prepare_factions(),
+        or None if there is none (chunked worlds, factions with no land).
+        """
+        return self._fields.get(("faction", faction))
+
+    def toward_biome(self, biome: str) -> DistanceField:
+        biome_index = self.world.biome_index
+        return self._cached(("biome", biome), self._version, lambda: biome_index.get(biome, ()))
+
+    # ------------------------------------------------------------
+    # Single paths
+    # ------------------------------------------------------------
+
+    def find(self, start: int, goal: int, budget=None):
+        """
+        Cheapest route as a list of room ids from start to goal (both
+        included), or None. A* with a Manhattan heuristic on the plain
+        grid; custom links can shortcut it, so with links it is Dijkstra.
+        With a budget, at most that many rooms are expanded; if the goal
+        wasn't reached by then, the route ends at the expanded room
+        nearest to it (None when that is the start itself).
+        """
+        grid = self.world.grid
+        costs = self.costs()
+        size = grid.size
+        min_cost = min(MOVE_COSTS.values()) if not grid.links else 0
+        gy, gx = divmod(goal, size)
+
+        def manhattan(rid):
+            y, x = divmod(rid, size)
+            return abs(x - gx) + abs(y - gy)
+
+        def path_to(u):
+            path = [u]
+            while u in came_from:
+                u = came_from[u]
+                path.append(u)
+            return path[::-1]
+
+        best = {start: 0}
+        came_from = {}
+        heap = [(manhattan(start) * min_cost, 0, start)]
+        closest, closest_left = start, manhattan(start)
+        expanded = 0
+
+        while heap:
+            _, d, u = heapq.heappop(heap)
+            if u == goal:
+                return path_to(u)
+            if d > best[u]:
+                continue
+
+            if budget is not None:
+                left = manhattan(u)
+                if left < closest_left:
+                    closest, closest_left = u, left
+                expanded += 1
+                if expanded > budget:
+                    return path_to(closest) if closest != start else None
+
+            for v in grid.neighbors(u):
+                nd = d + costs[v]
+                if nd < best.get(v, nd + 1):
+                    best[v] = nd
+                    came_from[v] = u
+                    heapq.heappush(heap, (nd + manhattan(v) * min_cost, nd, v))
+
+        return None
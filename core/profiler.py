@@ -0,0 +1,104 @@
+"""
+Rolling latency stats per tick stage.
+
+While a Profiler is attached to the tracer (tracer.profiler), every
+tracer.span also lands here, so the stages that are already spanned
+(tick.world, tick.plan_herds, war.day, encounter, ...) need no timers of
+their own. Each stage keeps its last WINDOW durations, and p50/p95/p99
+are read from those, so the numbers follow the current session rather
+than its whole history. Time spent waiting for the player to type
+(combat and dialogue prompts) is not counted.
+
+    python main.py              # then type `stats`
+    MYTH_PROFILE_FILE=stats.json python main.py   # also dumped on quit
+"""
+
+import json
+import math
+import os
+from collections import deque
+
+# Samples kept per stage
+WINDOW = 1000
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(ordered: list, pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Stage:
+    __slots__ = ("samples", "count", "total", "max")
+
+    def __init__(self, window: int):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        found = {"count": self.count, "mean_ms": round(self.total / self.count * 1000, 4)}
+        for pct in PERCENTILES:
+            found[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 4)
+        found["max_ms"] = round(self.max * 1000, 4)
+        return found
+
+
+class Profiler:
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.stages = {}        # span name -> Stage
+        self.path = None        # JSON dump on quit (MYTH_PROFILE_FILE)
+
+    def configure_from_env(self, environ=os.environ):
+        if environ.get("MYTH_PROFILE_FILE"):
+            self.path = environ["MYTH_PROFILE_FILE"]
+
+    def record(self, name: str, seconds: float):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = Stage(self.window)
+        stage.add(seconds)
+
+    def reset(self):
+        self.stages.clear()
+
+    def summary(self) -> dict:
+        return {name: self.stages[name].summary() for name in sorted(self.stages)}
+
+    def lines(self) -> list:
+        """Table for the `stats` command, slowest p95 first."""
+        if not self.stages:
+            return ["No ticks timed yet."]
+
+        rows = sorted(self.summary().items(), key=lambda item: item[1]["p95_ms"], reverse=True)
+        width = max(len(name) for name, _ in rows)
+        lines = [f"{'stage':<{width}}  {'n':>6}  {'p50':>8}  {'p95':>8}  {'p99':>8}  {'max':>8}  (ms)"]
+        for name, s in rows:
+            lines.append(
+                f"{name:<{width}}  {s['count']:>6}  {s['p50_ms']:>8.3f}  {s['p95_ms']:>8.3f}"
+                f"  {s['p99_ms']:>8.3f}  {s['max_ms']:>8.3f}"
+            )
+        return lines
+
+    def dump(self, path=None):
+        """Write the summary as JSON (to self.path by default); no-op without a path."""
+        path = path or self.path
+        if not path:
+            return
+        with open(path, "w") as f:
+            json.dump({"window": self.window, "stages": self.summary()}, f, indent=2)
+            f.write("\n")
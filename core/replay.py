@@ -0,0 +1,197 @@
+"""
+Deterministic session replay.
+
+A replay log is a JSONL file that records everything a session needs to
+be played back exactly: the seed of the global `random` module (every
+system draws from it, and the world seed is drawn from it too), every
+line the player typed, and the RNG stream position at each of those
+lines and at every world tick:
+
+    {"type": "session", "version": 1, "seed": 1234, "snapshot": null}
+    {"type": "input", "n": 0, "prompt": "Enter your name: ", "text": "Ana", "rng": [624, 1931044127]}
+    {"type": "tick", "n": 1, "rng": [17, 398213302]}
+    ...
+    {"type": "end", "state": 2783644410}
+
+Recording: set MYTH_REPLAY=session.jsonl (configure_from_env). Playing
+back: python -m benchmarks.replay session.jsonl, which runs the same
+game loop headless, feeding it the recorded lines. Every checkpoint
+compares the RNG position with the recorded one and the final world
+state with the "end" record, so the first tick that diverges is reported
+instead of a silently different world.
+"""
+
+import json
+import os
+import random
+import time
+import zlib
+from array import array
+
+from ui.text_effects import set_headless, set_input
+
+VERSION = 1
+
+
+class ReplayError(Exception):
+    pass
+
+
+class ReplayDiverged(ReplayError):
+    """Playback drew different random numbers, or ended in a different state."""
+
+
+class ReplayFinished(ReplayError):
+    """Every recorded input has been played back."""
+
+
+def rng_position(rng=random) -> list:
+    """[index into the Mersenne Twister state, crc32 of the state words]."""
+    state = rng.getstate()[1]
+    return [state[-1], zlib.crc32(array("I", state[:-1]).tobytes())]
+
+
+def state_digest(world, player) -> int:
+    """Checksum of the simulated state: clock, territory, every entity's room, the player."""
+    digest = zlib.crc32(repr((world.day, world.time_of_day, world.weather)).encode())
+    for faction in sorted(world.territories.keys()):
+        mask = world.territories.masks[faction]
+        digest = zlib.crc32(faction.encode() + mask.to_bytes((mask.bit_length() + 7) // 8, "little"), digest)
+
+    rooms = array("q", world.entities._where.values())
+    digest = zlib.crc32(rooms.tobytes(), digest)
+    return zlib.crc32(repr((player.room_id, player.hp, player.fatigue, player.xp)).encode(), digest)
+
+
+class ReplayLog:
+    def __init__(self):
+        self._sink = None       # file being recorded
+        self._records = None    # records being played back
+        self._pos = 0
+        self.header = None
+        self.inputs = 0
+        self.ticks = 0
+        self.timings = []       # playback: (input n, text, seconds until the next input)
+        self._last = None
+
+    @property
+    def recording(self) -> bool:
+        return self._sink is not None
+
+    @property
+    def replaying(self) -> bool:
+        return self._records is not None
+
+    # ------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------
+
+    def configure_from_env(self, environ=os.environ, **info):
+        if environ.get("MYTH_REPLAY"):
+            self.record(environ["MYTH_REPLAY"], **info)
+
+    def record(self, path: str, seed=None, **info):
+        """Seed the global RNG and start recording the session to `path`."""
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
+        random.seed(seed)
+
+        self._sink = open(path, "w", encoding="utf-8")
+        self.header = {"type": "session", "version": VERSION, "seed": seed, **info}
+        self._write(self.header)
+        set_input(self._recorded_input)
+
+    def _write(self, record: dict):
+        self._sink.write(json.dumps(record) + "\n")
+        self._sink.flush()
+
+    def _recorded_input(self, prompt):
+        position = rng_position()
+        text = input(prompt)
+        self._write({"type": "input", "n": self.inputs, "prompt": prompt, "text": text, "rng": position})
+        self.inputs += 1
+        return text
+
+    # ------------------------------------------------------------
+    # Playback
+    # ------------------------------------------------------------
+
+    def load(self, path: str) -> dict:
+        """Read a recorded session, seed the RNG and feed its inputs to the game, headless."""
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+
+        if not records or records[0].get("type") != "session":
+            raise ReplayError(f"{path} is not a replay log")
+        if records[0]["version"] != VERSION:
+            raise ReplayError(f"Unsupported replay version {records[0]['version']} (expected {VERSION})")
+
+        self.header = records[0]
+        self._records = records
+        self._pos = 1
+        random.seed(self.header["seed"])
+        set_headless()
+        set_input(self._replayed_input)
+        return self.header
+
+    def _next(self, kind: str) -> dict:
+        if self._pos >= len(self._records):
+            raise ReplayFinished(f"Replay finished after {self.inputs} inputs")
+        record = self._records[self._pos]
+        if record["type"] != kind:
+            raise ReplayDiverged(f"Expected a {record['type']} record, reached a {kind} (record {self._pos})")
+        self._pos += 1
+        return record
+
+    def _check_rng(self, record: dict):
+        if rng_position() != record["rng"]:
+            raise ReplayDiverged(f"RNG diverged at {record['type']} {record['n']} (record {self._pos - 1})")
+
+    def _replayed_input(self, prompt):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.timings.append(self._last + (now - self._last_time,))
+
+        record = self._next("input")
+        self._check_rng(record)
+        self.inputs += 1
+        self._last, self._last_time = (record["n"], record["text"]), time.perf_counter()
+        return record["text"]
+
+    # ------------------------------------------------------------
+    # Checkpoints (called by the game loop)
+    # ------------------------------------------------------------
+
+    def tick(self):
+        """A world tick is about to run."""
+        if self._sink is None and self._records is None:
+            return
+        self.ticks += 1
+        if self.recording:
+            self._write({"type": "tick", "n": self.ticks, "rng": rng_position()})
+        else:
+            self._check_rng(self._next("tick"))
+
+    def finish(self, world, player):
+        """The session ended normally: record or verify the final state."""
+        if self._last is not None:
+            self.timings.append(self._last + (time.perf_counter() - self._last_time,))
+            self._last = None
+
+        digest = state_digest(world, player)
+        if self.recording:
+            self._write({"type": "end", "state": digest})
+            self.close()
+        elif self.replaying:
+            if self._next("end")["state"] != digest:
+                raise ReplayDiverged("Replay ended in a different world state")
+
+    def close(self):
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+        set_input(None)
+
+
+# The process-wide replay log
+replay_log = ReplayLog()
@@ -0,0 +1,371 @@
+"""
+Struct-of-arrays room storage backed by NumPy.
+
+Instead of one Room dataclass per room, every scalar room attribute lives
+in a flat array indexed by room id: biome codes, faction-control codes,
+tag bitmasks and resource/hazard indices into shared tables. Occupants
+sit in sparse dicts and exits come from the shared grid.
+
+RoomStore behaves like the World.rooms dict and hands out RoomView
+objects, which read and write the arrays while looking like a Room to
+the rest of the game.
+"""
+
+from collections.abc import MutableSet
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only compact worlds need it
+    np = None
+
+
+# ============================================================
+# SPARSE CONTAINERS
+# ============================================================
+
+class _SparseList(list):
+    """Empty occupant list that only joins its store once written to."""
+
+    __slots__ = ("_owner", "_rid")
+
+    def __init__(self, owner, rid):
+        super().__init__()
+        self._owner = owner
+        self._rid = rid
+
+    def _attach(self):
+        self._owner.setdefault(self._rid, self)
+
+    def append(self, item):
+        self._attach()
+        super().append(item)
+
+    def extend(self, items):
+        self._attach()
+        super().extend(items)
+
+    def insert(self, index, item):
+        self._attach()
+        super().insert(index, item)
+
+
+
+# ============================================================
+# TAG VIEW
+# ============================================================
+
+class TagView(MutableSet):
+    """The tag set of one room, stored as bits of the store's tag mask."""
+
+    __slots__ = ("_store", "_rid")
+
+    def __init__(self, store, rid):
+        self._store = store
+        self._rid = rid
+
+    def __contains__(self, tag):
+        bit = self._store.tag_bits.get(tag)
+        return bit is not None and bool(self._store.tags[self._rid] & bit)
+
+    def __iter__(self):
+        mask = int(self._store.tags[self._rid])
+        return iter([t for t, bit in self._store.tag_bits.items() if mask & bit])
+
+    def __len__(self):
+        return int(self._store.tags[self._rid]).bit_count()
+
+    def add(self, tag):
+        self._store.tags[self._rid] |= self._store.tag_bit(tag)
+
+    def discard(self, tag):
+        bit = self._store.tag_bits.get(tag)
+        if bit is not None:
+            self._store.tags[self._rid] &= ~bit & 0xFFFFFFFF
+
+    def __repr__(self):
+        return repr(set(self))
+
+
+# ============================================================
+# ROOM VIEW
+# ============================================================
+
+class RoomView:
+    """A thin Room stand-in that reads and writes a RoomStore row."""
+
+    __slots__ = ("_store", "id")
+
+    def __init__(self, store, rid):
+        self._store = store
+        self.id = rid
+
+    # --- text -------------------------------------------------
+
+    @property
+    def name(self):
+        return self._store.names.get(self.id) or f"{self.biome.title()} Area {self.id}"
+
+    @name.setter
+    def name(self, value):
+        self._store.names[self.id] = value
+
+    @property
+    def description(self):
+        return self._store.descriptions[self._store.biome[self.id]]
+
+    # --- biome + tables ----------------------------------------
+
+    @property
+    def biome(self):
+        return self._store.biome_table[self._store.biome[self.id]]
+
+    @biome.setter
+    def biome(self, value):
+        self._store.biome[self.id] = self._store.biome_code(value)
+
+    @property
+    def resources(self):
+        return list(self._store.resource_table[self._store.resources[self.id]])
+
+    @resources.setter
+    def resources(self, value):
+        self._store.resources[self.id] = self._store.resource_code(value)
+
+    @property
+    def hazards(self):
+        return list(self._store.hazard_table[self._store.hazards[self.id]])
+
+    @hazards.setter
+    def hazards(self, value):
+        self._store.hazards[self.id] = self._store.hazard_code(value)
+
+    # --- tags + war --------------------------------------------
+
+    @property
+    def tags(self):
+        return TagView(self._store, self.id)
+
+    @tags.setter
+    def tags(self, value):
+        self._store.tags[self.id] = 0
+        view = TagView(self._store, self.id)
+        for tag in value:
+            view.add(tag)
+
+    @property
+    def faction_control(self):
+        code = self._store.faction[self.id]
+        return None if code < 0 else self._store.faction_table[code]
+
+    @faction_control.setter
+    def faction_control(self, value):
+        self._store.faction[self.id] = self._store.faction_code(value)
+
+    @property
+    def contested(self):
+        return bool(self._store.contested[self.id])
+
+    @contested.setter
+    def contested(self, value):
+        self._store.contested[self.id] = value
+
+    # --- sparse data -------------------------------------------
+
+    @property
+    def npcs(self):
+        found = self._store.npcs.get(self.id)
+        return found if found is not None else _SparseList(self._store.npcs, self.id)
+
+    @npcs.setter
+    def npcs(self, value):
+        self._store.npcs[self.id] = value
+
+    @property
+    def animals(self):
+        found = self._store.animals.get(self.id)
+        return found if found is not None else _SparseList(self._store.animals, self.id)
+
+    @animals.setter
+    def animals(self, value):
+        self._store.animals[self.id] = value
+
+    @property
+    def exits(self):
+        return self._store.grid.exits(self.id)
+
+    @property
+    def locked_exits(self):
+        return self._store.grid.locked_exits(self.id)
+
+    def __repr__(self):
+        return f"<RoomView {self.id} {self.biome} control={self.faction_control}>"
+
+
+# ============================================================
+# ROOM STORE
+# ============================================================
+
+class RoomStore:
+    """
+    Dict-like room container for World(compact=True).
+
+    rooms[rid] = Room(...) copies the room into the arrays; rooms[rid]
+    returns a RoomView. World-wide queries (faction counts, tag and biome
+    searches) are vectorized scans over the arrays.
+    """
+
+    def __init__(self, grid, biomes, factions):
+        if np is None:
+            raise ImportError("World(compact=True) requires NumPy (pip install numpy)")
+
+        # Exits come from the world's shared GridAdjacency
+        self.grid = grid
+        self.size = grid.size
+        self.count = count = grid.count
+
+        # Shared tables; codes index into these
+        self.biome_table = list(biomes)
+        self.faction_table = list(factions)
+        self.resource_table = [()]
+        self.hazard_table = [()]
+        self.tag_bits = {}
+        self.descriptions = []
+
+        # One entry per room
+        self.present = np.zeros(count, dtype=bool)
+        self.biome = np.zeros(count, dtype=np.uint8)
+        self.faction = np.full(count, -1, dtype=np.int8)
+        self.tags = np.zeros(count, dtype=np.uint32)
+        self.resources = np.zeros(count, dtype=np.uint16)
+        self.hazards = np.zeros(count, dtype=np.uint16)
+        self.contested = np.zeros(count, dtype=bool)
+
+        # Sparse, only for rooms that have them
+        self.names = {}
+        self.npcs = {}
+        self.animals = {}
+
+    # ------------------------------------------------------------
+    # Table codes
+    # ------------------------------------------------------------
+
+    def biome_code(self, biome: str, description: str | None = None) -> int:
+        if biome not in self.biome_table:
+            self.biome_table.append(biome)
+        code = self.biome_table.index(biome)
+        while len(self.descriptions) <= code:
+            self.descriptions.append("")
+        if description is not None:
+            self.descriptions[code] = description
+        return code
+
+    def faction_code(self, faction: str | None) -> int:
+        if faction is None:
+            return -1
+        if faction not in self.faction_table:
+            self.faction_table.append(faction)
+        return self.faction_table.index(faction)
+
+    def tag_bit(self, tag: str) -> int:
+        bit = self.tag_bits.get(tag)
+        if bit is None:
+            if len(self.tag_bits) >= 32:
+                raise ValueError("RoomStore supports at most 32 distinct tags")
+            bit = 1 << len(self.tag_bits)
+            self.tag_bits[tag] = bit
+        return bit
+
+    @staticmethod
+    def _table_code(table, items) -> int:
+        key = tuple(items)
+        try:
+            return table.index(key)
+        except ValueError:
+            table.append(key)
+            return len(table) - 1
+
+    def resource_code(self, resources) -> int:
+        return self._table_code(self.resource_table, resources)
+
+    def hazard_code(self, hazards) -> int:
+        return self._table_code(self.hazard_table, hazards)
+
+    # ------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------
+
+    def __getitem__(self, room_id: int) -> RoomView:
+        if not (0 <= room_id < self.count and self.present[room_id]):
+            raise KeyError(room_id)
+        return RoomView(self, room_id)
+
+    def __setitem__(self, room_id: int, room):
+        """Copy a Room (or RoomView) into the arrays."""
+        rid = room_id
+        self.present[rid] = True
+        self.biome[rid] = self.biome_code(room.biome, room.description)
+        self.faction[rid] = self.faction_code(room.faction_control)
+        self.resources[rid] = self.resource_code(room.resources)
+        self.hazards[rid] = self.hazard_code(room.hazards)
+        self.contested[rid] = room.contested
+
+        mask = 0
+        for tag in room.tags:
+            mask |= self.tag_bit(tag)
+        self.tags[rid] = mask
+
+        if room.name != f"{room.biome.title()} Area {rid}":
+            self.names[rid] = room.name
+        if room.npcs:
+            self.npcs[rid] = room.npcs
+        if room.animals:
+            self.animals[rid] = room.animals
+
+    def __contains__(self, room_id) -> bool:
+        return isinstance(room_id, int) and 0 <= room_id < self.count and bool(self.present[room_id])
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return int(self.present.sum())
+
+    def get(self, room_id, default=None):
+        return self[room_id] if room_id in self else default
+
+    def keys(self):
+        return np.flatnonzero(self.present).tolist()
+
+    def values(self):
+        return [RoomView(self, rid) for rid in self.keys()]
+
+    def items(self):
+        return [(rid, RoomView(self, rid)) for rid in self.keys()]
+
+    # ------------------------------------------------------------
+    # Vectorized queries
+    # ------------------------------------------------------------
+
+    def faction_counts(self) -> dict:
+        """Rooms controlled by each faction."""
+        codes = self.faction[self.present & (self.faction >= 0)]
+        counts = np.bincount(codes, minlength=len(self.faction_table))
+        return {f: int(c) for f, c in zip(self.faction_table, counts)}
+
+    def rooms_with_tag(self, tag: str) -> list:
+        bit = self.tag_bits.get(tag)
+        if bit is None:
+            return []
+        return np.flatnonzero(self.present & ((self.tags & bit) != 0)).tolist()
+
+    def rooms_in_biome(self, biome: str) -> list:
+        if biome not in self.biome_table:
+            return []
+        code = self.biome_table.index(biome)
+        return np.flatnonzero(self.present & (self.biome == code)).tolist()
+
+    def rooms_controlled_by(self, faction: str) -> list:
+        if faction not in self.faction_table:
+            return []
+        code = self.faction_table.index(faction)
+        return np.flatnonzero(self.faction == code).tolist()
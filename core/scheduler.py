@@ -0,0 +1,156 @@
+"""
+Timing-wheel scheduler keyed on world time (hours).
+
+Systems register when they next want to run instead of being polled on
+every move: a caravan every few hours, a patrol every hour, the faction
+war at midnight. World.advance_time moves the wheel forward and only the
+jobs that fell due are called, in due order.
+
+The wheel has WHEEL_SLOTS buckets of RESOLUTION hours each; a job goes
+into the bucket for its due tick and is skipped over on earlier laps, so
+jobs far in the future cost nothing until their lap comes round.
+"""
+
+import math
+
+# Hours per wheel slot (a mounted move takes half an hour)
+RESOLUTION = 0.5
+
+# Slots in the wheel (one lap = 32 hours)
+WHEEL_SLOTS = 64
+
+
+class Job:
+    __slots__ = ("due", "interval", "callback", "args", "name", "seq", "cancelled")
+
+    def __init__(self, due, interval, callback, args, name, seq):
+        self.due = due
+        self.interval = interval    # None for one-shot jobs
+        self.callback = callback
+        self.args = args
+        self.name = name
+        self.seq = seq              # ties on `due` run in scheduling order
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"Job({self.name or self.callback.__name__!s}, due={self.due})"
+
+
+class Scheduler:
+    def __init__(self, now: float = 0.0, resolution=RESOLUTION, slots=WHEEL_SLOTS):
+        self.now = now
+        self.resolution = resolution
+        self._slots = [[] for _ in range(slots)]
+        self._tick = self._tick_of(now) - 1     # last tick fully processed
+        self._seq = 0
+        self._count = 0
+
+    def _tick_of(self, time: float) -> int:
+        return math.floor(time / self.resolution)
+
+    def __len__(self):
+        return self._count
+
+    # ------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------
+
+    def _insert(self, job: Job):
+        # Never into a tick that has already been processed
+        tick = max(self._tick_of(job.due), self._tick + 1)
+        self._slots[tick % len(self._slots)].append((tick, job))
+        self._count += 1
+
+    def at(self, time: float, callback, *args, name=None) -> Job:
+        """Run callback(*args) once at world time `time`."""
+        self._seq += 1
+        job = Job(time, None, callback, args, name, self._seq)
+        self._insert(job)
+        return job
+
+    def after(self, delay: float, callback, *args, name=None) -> Job:
+        return self.at(self.now + delay, callback, *args, name=name)
+
+    def every(self, interval: float, callback, *args, start=None, name=None) -> Job:
+        """
+        Run callback(*args) every `interval` hours, first at `start`
+        (default: one interval from now). Returning False stops it.
+        """
+        self._seq += 1
+        due = self.now + interval if start is None else start
+        job = Job(due, interval, callback, args, name, self._seq)
+        self._insert(job)
+        return job
+
+    def cancel(self, job: Job):
+        """Cancelled jobs are dropped when their slot comes up."""
+        job.cancelled = True
+
+    # ------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------
+
+    def advance(self, time: float) -> int:
+        """Run every job due up to `time`; returns how many ran. Time never goes back."""
+        if time <= self.now:
+            return 0
+
+        ran = 0
+        last = self._tick_of(time)
+        while self._tick < last - 1:
+            self._tick += 1
+            ran += self._run_tick(self._tick, time)
+
+        # The tick `time` falls in is only partly over: leave it to be rescanned
+        ran += self._run_tick(last, time)
+        self._tick = last - 1
+
+        self.now = time
+        return ran
+
+    def _run_tick(self, tick: int, limit: float) -> int:
+        slot = self._slots[tick % len(self._slots)]
+        due, keep = [], []
+        for entry in slot:
+            (due if entry[0] == tick and entry[1].due <= limit else keep).append(entry)
+        if not due:
+            return 0
+        slot[:] = keep
+
+        ran = 0
+        for _, job in sorted(due, key=lambda e: (e[1].due, e[1].seq)):
+            self._count -= 1
+            if job.cancelled:
+                continue
+
+            self.now = max(self.now, job.due)
+            result = job.callback(*job.args)
+            ran += 1
+
+            if job.interval and result is not False and not job.cancelled:
+                job.due += job.interval
+                self._insert(job)
+        return ran
+
+    def skip(self, time: float):
+        """
+        Jump to `time` without running anything (a coarse fast-forward has
+        already accounted for it). Recurring jobs move to their first due
+        time after `time`; overdue one-shot jobs run on the next advance.
+        """
+        if time <= self.now:
+            return
+
+        jobs = [job for slot in self._slots for _, job in slot if not job.cancelled]
+        for slot in self._slots:
+            slot.clear()
+        self._count = 0
+
+        self.now = time
+        self._tick = self._tick_of(time) - 1
+        for job in jobs:
+            if job.interval and job.due <= time:
+                job.due += math.ceil((time - job.due) / job.interval + 1e-9) * job.interval
+                if job.due <= time:
+                    job.due += job.interval
+            self._insert(job)
@@ -0,0 +1,394 @@
+"""
+Binary world snapshots.
+
+save_world() writes a complete World (rooms, NPCs, animals, faction
+territories, garrisons, patrols, caravans...) to a compact, versioned file:
+
+    prefix   MAGIC, format version, header length
+    header   JSON: world state, lookup tables, section directory
+    sections flat arrays (biome codes, faction codes, tag masks, occupant
+             lists...) followed by one pickle per actor
+
+load_world() memory-maps the file and reads the arrays in place. Rooms
+are built the first time they are looked up; every NPC and animal is
+unpickled and indexed (core.entities) while loading, so the simulation
+runs on the whole map, not just the rooms that have been visited.
+"""
+
+import json
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from collections import Counter
+
+from core.territory import mask_of
+
+MAGIC = b"MYTHWSNP"
+VERSION = 1
+
+_PREFIX = struct.Struct("<8sHI")  # magic, version, header length
+_ALIGN = 8
+
+# World-level lists of NPCs that are saved by actor index
+_NPC_LISTS = (
+    "wandering_npcs",
+    "traveling_storytellers",
+    "quest_givers",
+    "faction_emissaries",
+    "bandit_ambushers",
+)
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+# ============================================================
+# LAZY ACTORS + ROOMS
+# ============================================================
+
+class ActorTable:
+    """Unpickles actors on first use and keeps them, so identity is shared."""
+
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+        self._loaded = {}
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def get(self, index: int):
+        actor = self._loaded.get(index)
+        if actor is None:
+            start, end = self._offsets[index], self._offsets[index + 1]
+            actor = pickle.loads(self._blob[start:end])
+            self._loaded[index] = actor
+        return actor
+
+    @property
+    def loaded(self) -> int:
+        return len(self._loaded)
+
+
+class SnapshotRooms:
+    """
+    Dict-like World.rooms for a loaded snapshot.
+
+    rooms[rid] builds the Room from the mapped arrays on first access.
+    Iteration only covers rooms built so far, like a chunked world's
+    resident rooms.
+    """
+
+    def __init__(self, world, arrays: dict, header: dict, actors: ActorTable, mapping):
+        self.world = world
+        self.count = world.size * world.size
+        self._a = arrays
+        self._h = header
+        self._actors = actors
+        self._mmap = mapping   # keeps the mapping alive
+        self._rooms = {}
+
+        self._tag_bits = [(t, 1 << i) for i, t in enumerate(header["tag_table"])]
+        self._names = {int(k): v for k, v in header["names"].items()}
+        self._descriptions = {int(k): v for k, v in header["descriptions"].items()}
+
+    def _build(self, rid: int):
+        from core.world import Room
+
+        a, h, world = self._a, self._h, self.world
+        biome = h["biome_table"][a["biome"][rid]]
+        faction = a["faction"][rid]
+        mask = a["tags"][rid]
+        npcs, animals = world.entities.views(rid)
+
+        return Room(
+            id=rid,
+            name=self._names.get(rid) or f"{biome.title()} Area {rid}",
+            description=self._descriptions.get(rid) or world._biome_description(biome),
+            biome=biome,
+            resources=list(h["resource_table"][a["resources"][rid]]),
+            hazards=list(h["hazard_table"][a["hazards"][rid]]),
+            npcs=npcs,
+            animals=animals,
+            tags={t for t, bit in self._tag_bits if mask & bit},
+            faction_control=None if faction < 0 else h["faction_table"][faction],
+            contested=bool(a["contested"][rid]),
+            grid=world.grid,
+        )
+
+    # --- mapping interface ---------------------------------------
+
+    def __getitem__(self, room_id: int):
+        room = self._rooms.get(room_id)
+        if room is None:
+            if room_id not in self:
+                raise KeyError(room_id)
+            room = self._rooms[room_id] = self._build(room_id)
+        return room
+
+    def __setitem__(self, room_id: int, room):
+        self._rooms[room_id] = room
+
+    def __contains__(self, room_id) -> bool:
+        return isinstance(room_id, int) and 0 <= room_id < self.count
+
+    def __iter__(self):
+        return iter(list(self._rooms))
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def get(self, room_id, default=None):
+        return self[room_id] if room_id in self else default
+
+    def keys(self):
+        return list(self._rooms.keys())
+
+    def values(self):
+        return list(self._rooms.values())
+
+    def items(self):
+        return list(self._rooms.items())
+
+    def is_resident(self, room_id: int) -> bool:
+        return room_id in self._rooms
+
+
+# ============================================================
+# SAVE
+# ============================================================
+
+def save_world(world, path: str):
+    """Write a complete snapshot of `world` to `path`."""
+    if world.chunked:
+        raise SnapshotError("Chunked worlds rebuild from their seed; snapshot an eager world")
+
+    n = world.size * world.size
+
+    biome_table, faction_table, tag_table = [], [], []
+    resource_table, hazard_table = [[]], [[]]
+
+    def code(table, value):
+        if value not in table:
+            table.append(value)
+        return table.index(value)
+
+    biome = array("B", bytes(n))
+    faction = array("b", bytes(n))
+    tags = array("I", [0]) * n
+    resources = array("H", [0]) * n
+    hazards = array("H", [0]) * n
+    contested = array("B", bytes(n))
+    npc_offsets, npc_ids = array("I", [0]), array("I")
+    animal_offsets, animal_ids = array("I", [0]), array("I")
+    names, descriptions = {}, {}
+
+    actors, actor_index = [], {}
+
+    def actor_id(actor) -> int:
+        key = id(actor)
+        if key not in actor_index:
+            actor_index[key] = len(actors)
+            actors.append(actor)
+        return actor_index[key]
+
+    for rid in range(n):
+        room = world.rooms[rid]
+
+        biome[rid] = code(biome_table, room.biome)
+        faction[rid] = -1 if room.faction_control is None else code(faction_table, room.faction_control)
+        resources[rid] = code(resource_table, list(room.resources))
+        hazards[rid] = code(hazard_table, list(room.hazards))
+        contested[rid] = room.contested
+
+        mask = 0
+        for tag in room.tags:
+            mask |= 1 << code(tag_table, tag)
+        tags[rid] = mask
+
+        if room.name != f"{room.biome.title()} Area {rid}":
+            names[rid] = room.name
+        if room.description != world._biome_description(room.biome):
+            descriptions[rid] = room.description
+
+        npc_ids.extend(actor_id(a) for a in room.npcs)
+        npc_offsets.append(len(npc_ids))
+        animal_ids.extend(actor_id(a) for a in room.animals)
+        animal_offsets.append(len(animal_ids))
+
+    if len(tag_table) > 32:
+        raise SnapshotError("Snapshots support at most 32 distinct room tags")
+
+    # Tracked NPCs that may not sit in any room (e.g. intercepted emissaries)
+    lists = {name: [actor_id(npc) for npc in getattr(world, name)] for name in _NPC_LISTS}
+    patrols = [[actor_id(npc) for npc in patrol] for patrol in world.faction_patrols]
+    caravans = [
+        [actor_id(merchant), [actor_id(g) for g in guards]]
+        for merchant, guards in world.traveling_merchants
+    ]
+    # Defenders standing in for a garrison while the player is in the room
+    mustered = {rid: [actor_id(npc) for npc in npcs] for rid, npcs in world._mustered.items()}
+
+    blob = bytearray()
+    actor_offsets = array("Q", [0])
+    for actor in actors:
+        blob += pickle.dumps(actor, protocol=pickle.HIGHEST_PROTOCOL)
+        actor_offsets.append(len(blob))
+
+    sections = [
+        ("biome", biome), ("faction", faction), ("tags", tags),
+        ("resources", resources), ("hazards", hazards), ("contested", contested),
+        ("npc_offsets", npc_offsets), ("npc_ids", npc_ids),
+        ("animal_offsets", animal_offsets), ("animal_ids", animal_ids),
+        ("actor_offsets", actor_offsets), ("actors", array("B", blob)),
+    ]
+
+    directory, offset = {}, 0
+    for name, arr in sections:
+        length = len(arr) * arr.itemsize
+        directory[name] = [offset, length, arr.typecode]
+        offset = _align(offset + length)
+
+    header = {
+        "byteorder": sys.byteorder,
+        "size": world.size,
+        "seed": world.seed,
+        "chunk_size": world.chunk_size,
+        "start_room_id": world.start_room_id,
+        "day": world.day,
+        "time_of_day": world.time_of_day,
+        "season": world.season,
+        "weather": world.weather,
+        "temperature": world.temperature,
+        "faction_strength": world.faction_strength,
+        "garrisons": world.garrisons.entries(),
+        "mustered": mustered,
+        "territory_factions": world.territories.keys(),
+        "biome_table": biome_table,
+        "faction_table": faction_table,
+        "tag_table": tag_table,
+        "resource_table": resource_table,
+        "hazard_table": hazard_table,
+        "names": names,
+        "descriptions": descriptions,
+        "links": world.grid.links,
+        "locked": world.grid.locked,
+        "lists": lists,
+        "patrols": patrols,
+        "caravans": caravans,
+        "animal_dens": world.animal_dens,
+        "animal_census": [[name, hostile, count] for (name, hostile), count in world.animal_census.items()],
+        "migration_routes": bool(world.migration_routes),
+        "populated": world._populated,
+        "sections": directory,
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header_bytes))
+
+    with open(path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for name, arr in sections:
+            f.seek(data_start + directory[name][0])
+            arr.tofile(f)
+
+
+# ============================================================
+# LOAD
+# ============================================================
+
+def load_world(path: str):
+    """Open a snapshot written by save_world() and return a World."""
+    from core.world import World
+
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, header_len = _PREFIX.unpack_from(mapping, 0)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path} is not a world snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version} (expected {VERSION})")
+
+    header = json.loads(mapping[_PREFIX.size:_PREFIX.size + header_len])
+    if header["byteorder"] != sys.byteorder:
+        raise SnapshotError("Snapshot was written on a machine with a different byte order")
+
+    data_start = _align(_PREFIX.size + header_len)
+    view = memoryview(mapping)
+    arrays = {
+        name: view[data_start + offset:data_start + offset + length].cast(typecode)
+        for name, (offset, length, typecode) in header["sections"].items()
+    }
+
+    world = World(size=header["size"], seed=header["seed"], chunk_size=header["chunk_size"])
+    actors = ActorTable(arrays["actor_offsets"], arrays["actors"])
+    world.rooms = SnapshotRooms(world, arrays, header, actors, mapping)
+
+    # Scalar state
+    for key in ("start_room_id", "day", "time_of_day", "season", "weather", "temperature"):
+        setattr(world, key, header[key])
+    world.faction_strength = header["faction_strength"]
+    world.garrisons.load(header.get("garrisons", ()))
+    world._populated = header["populated"]
+    world.grid.links = {int(k): v for k, v in header["links"].items()}
+    world.grid.locked = {int(k): v for k, v in header["locked"].items()}
+
+    # Indexes + territories straight from the mapped arrays
+    biome_table, tag_table = header["biome_table"], header["tag_table"]
+    faction_table = header["faction_table"]
+
+    for b in biome_table:
+        world.biome_index.setdefault(b, set())
+    world.tag_index = {t: set() for t in tag_table}
+    for f in header["territory_factions"]:
+        world.territories.ensure(f)
+    biome_sets = [world.biome_index[b] for b in biome_table]
+    tag_bits = [(world.tag_index[t], 1 << i) for i, t in enumerate(tag_table)]
+
+    for rid, code in enumerate(arrays["biome"]):
+        biome_sets[code].add(rid)
+    for rid, mask in enumerate(arrays["tags"]):
+        if mask:
+            for tag_set, bit in tag_bits:
+                if mask & bit:
+                    tag_set.add(rid)
+    world.territories.load(arrays["faction"], faction_table)
+    world.territories.contested = mask_of(arrays["contested"])
+
+    # Every occupant is indexed now, so the simulation (herds, quests,
+    # find_npc) sees rooms that haven't been built yet
+    for kind, table in (("npc", "npcs"), ("animal", "animals")):
+        offsets, ids = arrays[f"{kind}_offsets"], arrays[f"{kind}_ids"]
+        for rid in range(world.grid.count):
+            start, end = offsets[rid], offsets[rid + 1]
+            if start != end:
+                world.entities.adopt(rid, table, [actors.get(i) for i in ids[start:end]])
+
+    # Tracked actors are few; materialize them now so lists share identity
+    for name, ids in header["lists"].items():
+        setattr(world, name, [actors.get(i) for i in ids])
+    world.faction_patrols = [[actors.get(i) for i in patrol] for patrol in header["patrols"]]
+    world.traveling_merchants = [
+        (actors.get(m), [actors.get(g) for g in guards]) for m, guards in header["caravans"]
+    ]
+    world._mustered = {int(rid): [actors.get(i) for i in ids] for rid, ids in header.get("mustered", {}).items()}
+
+    world.animal_dens = list(header["animal_dens"])
+    world.animal_census = Counter({(name, hostile): count for name, hostile, count in header["animal_census"]})
+    world._built_chunks = set(world._all_chunk_coords())
+    if header["migration_routes"]:
+        world.migration_routes = {b: sorted(rooms) for b, rooms in world.biome_index.items()}
+
+    # Schedules restart from the saved clock
+    world.start_clock()
+    world.schedule_agents()
+    world.paths.prepare_factions()
+    return world
@@ -0,0 +1,190 @@
+"""
+Faction territories as bitsets.
+
+Every faction owns one Python int whose bit i is set when the faction
+controls room i. Area counts are kept alongside, so the UI gets them for
+free, and the war's frontier (controlled rooms that touch a room the
+faction doesn't hold) falls out of four whole-map shifts instead of a
+per-room loop:
+
+    west neighbor  -> mask << 1     (minus the first column)
+    east neighbor  -> mask >> 1     (minus the last column)
+    north neighbor -> mask << size
+    south neighbor -> mask >> size
+"""
+
+import sys
+from array import array
+
+
+def _words(mask: int) -> array:
+    """`mask` as 64-bit words, least significant first."""
+    words = array("Q", mask.to_bytes((mask.bit_length() + 63) // 64 * 8, "little"))
+    if sys.byteorder == "big":
+        words.byteswap()
+    return words
+
+
+def mask_of(flags) -> int:
+    """Bitset from a bytes-like of 0/1 flags, one per room."""
+    flags = bytes(flags)
+    data = bytearray((len(flags) + 7) // 8)
+    start = flags.find(1)
+    while start != -1:
+        data[start >> 3] |= 1 << (start & 7)
+        start = flags.find(1, start + 1)
+    return int.from_bytes(data, "little")
+
+
+def _tile_rows(row: int, size: int) -> int:
+    """Repeat one `size`-bit row pattern over all `size` rows."""
+    mask, rows = row, 1
+    while rows < size:
+        step = min(rows, size - rows)
+        mask |= (mask & ((1 << (step * size)) - 1)) << (rows * size)
+        rows += step
+    return mask
+
+
+def iter_bits(mask: int):
+    """Set bit positions of `mask`, ascending."""
+    for i, word in enumerate(_words(mask)):
+        base = i * 64
+        while word:
+            low = word & -word
+            yield base + low.bit_length() - 1
+            word ^= low
+
+
+def nth_bit(mask: int, n: int) -> int:
+    """Position of the n-th (0-based) set bit of `mask`, ascending."""
+    for i, word in enumerate(_words(mask)):
+        count = word.bit_count()
+        if n < count:
+            for _ in range(n):
+                word &= word - 1
+            return i * 64 + (word & -word).bit_length() - 1
+        n -= count
+    raise IndexError("bit index out of range")
+
+
+class Territories:
+    """
+    faction -> bitset of controlled rooms. World.set_control is the only
+    writer; everything else reads masks, areas and frontiers.
+    """
+
+    def __init__(self, grid, factions=()):
+        self.grid = grid
+        self.size = size = grid.size
+        self.full = (1 << grid.count) - 1
+
+        # Rooms that have a west / east grid neighbor
+        row = (1 << size) - 1
+        self._has_west = _tile_rows(row & ~1, size)
+        self._has_east = _tile_rows(row >> 1, size)
+
+        self.masks = {}     # faction -> int bitset
+        self.areas = {}     # faction -> number of rooms
+        self.contested = 0  # rooms on a border between factions (see core.war)
+        for faction in factions:
+            self.ensure(faction)
+
+    def ensure(self, faction: str):
+        self.masks.setdefault(faction, 0)
+        self.areas.setdefault(faction, 0)
+
+    # ------------------------------------------------------------
+    # Mapping-style access
+    # ------------------------------------------------------------
+
+    def keys(self):
+        return list(self.masks.keys())
+
+    def __iter__(self):
+        return iter(self.masks)
+
+    def __contains__(self, faction) -> bool:
+        return faction in self.masks
+
+    # ------------------------------------------------------------
+    # Writes (via World.set_control)
+    # ------------------------------------------------------------
+
+    def add(self, faction: str, room_id: int):
+        self.ensure(faction)
+        bit = 1 << room_id
+        if not self.masks[faction] & bit:
+            self.masks[faction] |= bit
+            self.areas[faction] += 1
+
+    def discard(self, faction: str, room_id: int):
+        bit = 1 << room_id
+        if self.masks.get(faction, 0) & bit:
+            self.masks[faction] ^= bit
+            self.areas[faction] -= 1
+
+    def load(self, faction_codes, faction_table):
+        """Rebuild every mask from per-room faction codes (-1 = none)."""
+        count = self.grid.count
+        bits = [bytearray((count + 7) // 8) for _ in faction_table]
+        for rid, code in enumerate(faction_codes):
+            if code >= 0:
+                bits[code][rid >> 3] |= 1 << (rid & 7)
+
+        for faction, data in zip(faction_table, bits):
+            mask = int.from_bytes(data, "little")
+            self.masks[faction] = mask
+            self.areas[faction] = mask.bit_count()
+
+    # ------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------
+
+    def controls(self, faction: str, room_id: int) -> bool:
+        return bool(self.masks.get(faction, 0) >> room_id & 1)
+
+    def owner(self, room_id: int):
+        """The faction that controls a room, or None."""
+        return next((f for f, mask in self.masks.items() if mask >> room_id & 1), None)
+
+    def area(self, faction: str) -> int:
+        return self.areas.get(faction, 0)
+
+    def counts(self) -> dict:
+        return dict(self.areas)
+
+    def rooms(self, faction: str) -> list:
+        """Controlled room ids, ascending."""
+        return list(iter_bits(self.masks.get(faction, 0)))
+
+    def nth_room(self, faction: str, n: int) -> int:
+        """The n-th controlled room id, in ascending order."""
+        return nth_bit(self.masks[faction], n)
+
+    def spread(self, mask: int) -> int:
+        """Bitset of every grid neighbor of the rooms in `mask` (custom links excluded)."""
+        size = self.size
+        return (
+            ((mask & self._has_west) >> 1)
+            | ((mask & self._has_east) << 1)
+            | (mask >> size)
+            | (mask << size)
+        ) & self.full
+
+    def frontier(self, faction: str) -> int:
+        """Bitset of controlled rooms with at least one neighbor the faction doesn't hold."""
+        mask = self.masks.get(faction, 0)
+        if not mask:
+            return 0
+
+        frontier = mask & self.spread(self.full & ~mask)
+
+        # Custom links reach past the grid; treat their rooms as frontier
+        for rid in self.grid.links:
+            if mask >> rid & 1:
+                frontier |= 1 << rid
+        return frontier
+
+    def frontier_rooms(self, faction: str) -> list:
+        return list(iter_bits(self.frontier(faction)))
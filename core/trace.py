@@ -0,0 +1,285 @@
+"""
+Structured tracing for the world simulation.
+
+One module-level Tracer replaces the old `if DEBUG: print(...)` calls:
+
+    from core.trace import tracer
+
+    tracer.debug("war", "patrol clash", room=rid, winner=winner)
+
+    with tracer.span("war.expand"):
+        ...
+
+Events have a subsystem ("world", "war", "movement", ...), a level and
+keyword fields. They are dropped before any formatting happens unless the
+subsystem's level lets them through, so a disabled call costs one dict
+lookup. Each subsystem may log at most `rate_limit` events per tick; the
+rest are counted and reported once when the next tick begins.
+
+Spans time a block of code and are only recorded while a JSONL file is
+open (tracer.open(path)) or a core.profiler.Profiler is attached
+(tracer.profiler); every event that passes its level is written to the
+file too, one JSON object per line:
+
+    {"type": "span", "tick": 3, "name": "war.day", "start": 1.25, "ms": 4.1, "day": 3}
+    {"type": "event", "tick": 3, "subsystem": "war", "level": "debug", "msg": "...", ...}
+
+The environment configures the tracer at startup (configure_from_env):
+
+    MYTH_TRACE="info,war=debug,movement=off"
+    MYTH_TRACE_FILE=trace.jsonl
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Levels
+TRACE = 5
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+OFF = 100
+
+LEVELS = {"trace": TRACE, "debug": DEBUG, "info": INFO, "warn": WARN, "error": ERROR, "off": OFF}
+_NAMES = {value: name for name, value in LEVELS.items()}
+
+# Events per subsystem per tick before the rest are suppressed
+RATE_LIMIT = 50
+
+
+class _NullSpan:
+    """Shared stand-in when spans aren't being recorded."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "fields", "start", "waited")
+
+    def __init__(self, tracer, name, fields):
+        self.tracer = tracer
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        self.waited = self.tracer.waited
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        tracer = self.tracer
+
+        # Time spent waiting on the player isn't the simulation's
+        waited = tracer.waited - self.waited
+        busy = end - self.start - waited
+
+        if tracer.profiler is not None:
+            tracer.profiler.record(self.name, busy)
+        if tracer._sink is not None:
+            record = {
+                "type": "span",
+                "tick": tracer.tick,
+                "name": self.name,
+                "start": round(self.start - tracer._origin, 6),
+                "ms": round(busy * 1000, 4),
+                **self.fields,
+            }
+            if waited:
+                record["wait_ms"] = round(waited * 1000, 4)
+            tracer._write(record)
+        return False
+
+
+class Tracer:
+    def __init__(self, level=WARN, stream=None, rate_limit=RATE_LIMIT):
+        self.level = level              # default for subsystems without their own
+        self.levels = {}                # subsystem -> level
+        self.stream = stream            # text output (None = sys.stdout)
+        self.rate_limit = rate_limit    # 0 = unlimited
+
+        self.tick = 0
+        self._counts = Counter()        # subsystem -> events this tick
+        self._suppressed = Counter()    # subsystem -> events dropped this tick
+        self._sink = None               # open JSONL file
+        self._origin = time.perf_counter()
+
+        self.profiler = None            # core.profiler.Profiler fed by spans
+        self._local = threading.local() # per thread: seconds spent waiting (see waiting)
+
+    # ------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------
+
+    def set_level(self, level, subsystem: str | None = None):
+        """Level for one subsystem, or the default; accepts names or numbers."""
+        if isinstance(level, str):
+            level = LEVELS[level.lower()]
+        if subsystem is None:
+            self.level = level
+        else:
+            self.levels[subsystem] = level
+
+    def configure(self, spec: str):
+        """Parse "info,war=debug,movement=off" style settings."""
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "=" in part:
+                subsystem, level = part.split("=", 1)
+                self.set_level(level.strip(), subsystem.strip())
+            else:
+                self.set_level(part)
+
+    def configure_from_env(self, environ=os.environ):
+        if environ.get("MYTH_TRACE"):
+            self.configure(environ["MYTH_TRACE"])
+        if environ.get("MYTH_TRACE_FILE"):
+            self.open(environ["MYTH_TRACE_FILE"])
+
+    def open(self, path: str):
+        """Record spans and events to a JSONL file."""
+        self.close()
+        self._sink = open(path, "a", encoding="utf-8")
+        atexit.register(self.close)
+
+    def close(self):
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def silence(self):
+        """
+        Drop everything (benchmarks, worker processes). A forked worker
+        shares the parent's file, so it is detached rather than closed.
+        """
+        self.level = OFF
+        self.levels = {}
+        self._sink = None
+        self.profiler = None
+
+    @contextmanager
+    def silenced(self):
+        """silence() for the duration of a block, then restore the settings."""
+        saved = self.level, self.levels, self._sink, self.profiler
+        self.silence()
+        try:
+            yield self
+        finally:
+            self.level, self.levels, self._sink, self.profiler = saved
+
+    # ------------------------------------------------------------
+    # Ticks + spans
+    # ------------------------------------------------------------
+
+    def begin_tick(self):
+        """Start a new simulation tick and reset the rate limits."""
+        if self._suppressed:
+            for subsystem, count in self._suppressed.items():
+                self._output(subsystem, WARN, "events suppressed", {"count": count, "in_tick": self.tick})
+            self._suppressed.clear()
+        self._counts.clear()
+        self.tick += 1
+
+    def span(self, name: str, **fields):
+        """Context manager timing a block; free when nothing records spans."""
+        if self._sink is None and self.profiler is None:
+            return _NULL_SPAN
+        return _Span(self, name, fields)
+
+    @property
+    def waited(self) -> float:
+        return getattr(self._local, "waited", 0.0)
+
+    @contextmanager
+    def waiting(self):
+        """
+        Wrap blocking on the player, so open spans leave that time out.
+        Counted per thread: a background tick's spans aren't shortened by
+        the main thread typing text meanwhile.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._local.waited = self.waited + time.perf_counter() - start
+
+    # ------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------
+
+    def enabled(self, subsystem: str, level: int) -> bool:
+        return level >= self.levels.get(subsystem, self.level)
+
+    def log(self, subsystem: str, level: int, msg: str, **fields):
+        if level < self.levels.get(subsystem, self.level):
+            return
+
+        if self.rate_limit:
+            self._counts[subsystem] += 1
+            if self._counts[subsystem] > self.rate_limit:
+                self._suppressed[subsystem] += 1
+                return
+
+        self._output(subsystem, level, msg, fields)
+
+    def trace(self, subsystem: str, msg: str, **fields):
+        if TRACE >= self.levels.get(subsystem, self.level):
+            self.log(subsystem, TRACE, msg, **fields)
+
+    def debug(self, subsystem: str, msg: str, **fields):
+        if DEBUG >= self.levels.get(subsystem, self.level):
+            self.log(subsystem, DEBUG, msg, **fields)
+
+    def info(self, subsystem: str, msg: str, **fields):
+        if INFO >= self.levels.get(subsystem, self.level):
+            self.log(subsystem, INFO, msg, **fields)
+
+    def warn(self, subsystem: str, msg: str, **fields):
+        if WARN >= self.levels.get(subsystem, self.level):
+            self.log(subsystem, WARN, msg, **fields)
+
+    def error(self, subsystem: str, msg: str, **fields):
+        if ERROR >= self.levels.get(subsystem, self.level):
+            self.log(subsystem, ERROR, msg, **fields)
+
+    # ------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------
+
+    def _output(self, subsystem, level, msg, fields):
+        name = _NAMES.get(level, str(level))
+        text = " ".join([f"[{name.upper()}] {subsystem}: {msg}"] + [f"{k}={v}" for k, v in fields.items()])
+        print(text, file=self.stream or sys.stdout)
+
+        if self._sink is not None:
+            self._write({
+                "type": "event",
+                "tick": self.tick,
+                "subsystem": subsystem,
+                "level": name,
+                "msg": msg,
+                **fields,
+            })
+
+    def _write(self, record: dict):
+        self._sink.write(json.dumps(record, default=str) + "\n")
+
+
+# The process-wide tracer
+tracer = Tracer()
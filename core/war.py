@@ -0,0 +1,206 @@
+"""
+Vectorized faction war.
+
+One pass over the territory bitsets (see core.territory) decides a whole
+day of expansion: every room bordering a faction is rolled at once with
+the faction's aggression, and contested borders (controlled rooms that
+touch another faction's land) come out of the same masks. The result is
+a WarDiff that World.simulate_faction_war applies and keeps as the day's
+record.
+"""
+
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+
+from core.territory import iter_bits
+
+# Share of a faction's aggression used as its daily capture chance per border room
+CAPTURE_SCALE = 0.25
+
+# Bits of precision for bernoulli_mask
+_PRECISION = 16
+
+
+# ============================================================
+# RANDOM BITSETS
+# ============================================================
+
+def bernoulli_mask(bits: int, p: float, rng=random) -> int:
+    """
+    A `bits`-wide int where each bit is set with probability p (to 1/65536).
+    Walks p's binary digits from the least significant up: a 1 digit ORs in
+    fresh random bits, a 0 digit ANDs them, so the chance converges on p.
+    """
+    scaled = round(p * (1 << _PRECISION))
+    if scaled <= 0 or bits <= 0:
+        return 0
+    if scaled >= 1 << _PRECISION:
+        return (1 << bits) - 1
+
+    mask = 0
+    # Digits below the lowest 1 would only AND into zero
+    for i in range((scaled & -scaled).bit_length() - 1, _PRECISION):
+        if scaled >> i & 1:
+            mask |= rng.getrandbits(bits)
+        else:
+            mask &= rng.getrandbits(bits)
+    return mask
+
+
+# ============================================================
+# DAILY DIFF
+# ============================================================
+
+@dataclass
+class WarDiff:
+    """Everything the war changed on one day."""
+
+    day: int
+    captured: dict = field(default_factory=dict)    # room_id -> (previous owner, new owner)
+    contested: list = field(default_factory=list)   # rooms that became contested
+    calmed: list = field(default_factory=list)      # rooms that stopped being contested
+
+    def record(self, room_id: int, previous, faction):
+        """Note an ownership change, merging repeat changes of the same room."""
+        first = self.captured.get(room_id, (previous, None))[0]
+        if first == faction:
+            self.captured.pop(room_id, None)
+        else:
+            self.captured[room_id] = (first, faction)
+
+    def gains(self) -> Counter:
+        """Net rooms won (positive) or lost (negative) per faction."""
+        net = Counter()
+        for previous, faction in self.captured.values():
+            if faction:
+                net[faction] += 1
+            if previous:
+                net[previous] -= 1
+        return net
+
+    def __bool__(self):
+        return bool(self.captured or self.contested or self.calmed)
+
+
+@dataclass
+class FastForwardSummary:
+    """What a coarse multi-day skip (World.fast_forward) changed."""
+
+    start_day: int
+    days: int
+    areas_before: dict
+    areas_after: dict = field(default_factory=dict)
+    diff: WarDiff | None = None
+    patrol_clashes: int = 0
+    camps_taken: int = 0
+    emissaries_lost: int = 0
+    morale: Counter = field(default_factory=Counter)    # faction strength gained
+    reinforcements: Counter = field(default_factory=Counter)    # defenders added to garrisons
+
+    @property
+    def end_day(self) -> int:
+        return self.start_day + self.days
+
+    def lines(self) -> list:
+        """Short human-readable report, biggest territorial changes first."""
+        lines = [f"Days {self.start_day}-{self.end_day}: {len(self.diff.captured)} rooms changed hands."]
+
+        changes = sorted(
+            self.areas_after,
+            key=lambda f: -abs(self.areas_after[f] - self.areas_before.get(f, 0)),
+        )
+        for faction in changes:
+            before, after = self.areas_before.get(faction, 0), self.areas_after[faction]
+            if before or after:
+                lines.append(f"  {faction}: {before} -> {after} rooms ({after - before:+d})")
+
+        if self.patrol_clashes:
+            lines.append(f"  Patrol clashes: {self.patrol_clashes}")
+        if self.camps_taken:
+            lines.append(f"  Camps taken: {self.camps_taken}")
+        if self.emissaries_lost:
+            lines.append(f"  Emissaries intercepted: {self.emissaries_lost}")
+        if self.reinforcements:
+            lines.append(f"  Defenders garrisoned: {self.reinforcements.total()}")
+        return lines
+
+
+# ============================================================
+# FRONTS
+# ============================================================
+
+def front_captures(territories, masks: dict, factions: dict, rng=random) -> dict:
+    """
+    Roll one day of expansion over `masks` (faction -> bitset) for every
+    faction in `factions` (name -> data with "aggression"). Returns
+    {faction: bitset of rooms won}, in the order the factions rolled.
+
+    Each faction rolls every room next to its land that it doesn't hold,
+    from the start-of-day borders. When several factions take the same
+    room, the one drawn first in a random faction order keeps it.
+    """
+    order = list(factions)
+    rng.shuffle(order)
+
+    count = territories.grid.count
+    claimed = 0
+    won_by = {}
+
+    for faction in order:
+        mask = masks.get(faction, 0)
+        if not mask:
+            continue
+
+        targets = territories.spread(mask)
+        for rid, links in territories.grid.links.items():
+            if mask >> rid & 1:
+                for target in links.values():
+                    targets |= 1 << target
+        targets &= ~mask & ~claimed
+
+        chance = factions[faction]["aggression"] * CAPTURE_SCALE
+        won = targets & bernoulli_mask(count, chance, rng)
+        claimed |= won
+        won_by[faction] = won
+
+    return won_by
+
+
+def expand_fronts(territories, factions: dict, rng=random) -> dict:
+    """One day of expansion as {room_id: faction}, from the live territories."""
+    captures = {}
+    for faction, won in front_captures(territories, territories.masks, factions, rng).items():
+        for rid in iter_bits(won):
+            captures[rid] = faction
+    return captures
+
+
+def contested_mask(territories) -> int:
+    """Controlled rooms that border land held by a different faction."""
+    held = 0
+    for mask in territories.masks.values():
+        held |= mask
+
+    contested = 0
+    for mask in territories.masks.values():
+        if mask:
+            contested |= mask & territories.spread(held & ~mask)
+    return contested
+
+
+def coarse_fronts(territories, factions: dict, days: int, rng=random) -> dict:
+    """
+    `days` of expansion on copies of the masks only; no room is touched.
+    Returns the final faction -> bitset.
+    """
+    masks = dict(territories.masks)
+    for _ in range(days):
+        for faction, won in front_captures(territories, masks, factions, rng).items():
+            if not won:
+                continue
+            for other, mask in masks.items():
+                if other != faction and mask & won:
+                    masks[other] = mask & ~won
+            masks[faction] |= won
+    return masks
@@ -1,6 +1,25 @@
 import random
+from collections import Counter
 from dataclasses import dataclass, field
 from actors.animal import Animal
+from core.chunks import (
+    CHUNK_SIZE,
+    ChunkedRooms,
+    chunk_of,
+    chunk_room_ids,
+    chunk_seed,
+    chunks_per_side,
+)
+from core.entities import EntityIndex
+from core.garrisons import Garrisons
+from core.grid import GridAdjacency
+from core.pathfinding import ROUTE_BUDGET, Pathfinder
+from core.scheduler import Scheduler
+from core.territory import Territories, iter_bits
+from core import war
+from core import parallel
+from core.trace import tracer
+from core.room_store import RoomStore
 
 # ============================================================
 # CONSTANTS
@@ -38,15 +57,81 @@ FACTIONS = {
 
 WEATHERS = ["clear", "rain", "storm", "fog", "snow"]
 
-# Light debug logging
-DEBUG = True
+# Spans longer than this many days are simulated coarsely (World.fast_forward)
+COARSE_AFTER_DAYS = 3
+
+# Chunked worlds: random chunks searched for rooms of a biome when placing
+# territories, patrols and legendary NPCs (see World._rooms_in_biome)
+BIOME_SAMPLE_CHUNKS = 4
+
+# Hours between moves of scheduled travelers (see World.schedule_agents)
+PATROL_HOURS = 1
+EMISSARY_HOURS = 2
+CARAVAN_HOURS = 3
+
+BIOME_RESOURCES = {
+    "forest": ("berries", "wood"),
+    "plains": ("herbs", "game"),
+    "swamp": ("mushrooms",),
+    "mountain": ("ore", "stone"),
+    "desert": ("cactus", "scrap"),
+}
+
+BIOME_HAZARDS = {
+    "swamp": ("poisonous gas",),
+    "mountain": ("loose rocks",),
+    "desert": ("heatstroke",),
+}
+
+# Generation odds
+ANIMAL_CHANCE = 0.75        # room has animals at all
+DEN_CHANCE = 0.1
+AMBIENT_NPC_CHANCE = 0.55
+SPECIAL_TAGS = (
+    ("campfire", 0.04),
+    ("shrine", 0.03),
+    ("treasure", 0.03),
+    ("miniboss", 0.01),
+)
+
+ANIMAL_POOLS = {
+    "forest": [
+        ("Deer", False), ("Rabbit", False),
+        ("Wolf", True), ("Boar", True)
+    ],
+    "plains": [
+        ("Horse", False), ("Bison", False),
+        ("Wild Dog", True)
+    ],
+    "swamp": [
+        ("Frog", False),
+        ("Giant Leech", True), ("Crocodile", True)
+    ],
+    "mountain": [
+        ("Goat", False), ("Eagle", False),
+        ("Mountain Lion", True)
+    ],
+    "desert": [
+        ("Lizard", False),
+        ("Scorpion", True), ("Sand Wolf", True)
+    ],
+}
+
+AMBIENT_NPCS = {
+    "forest": ["Wanderer", "Herbalist", "Scout"],
+    "plains": ["Traveler", "Hunter", "Nomad"],
+    "swamp": ["Bog Walker", "Hermit", "Mire Scout"],
+    "mountain": ["Climber", "Miner", "Ridge Scout"],
+    "desert": ["Drifter", "Sand Scout", "Nomad"],
+}
+AMBIENT_PERSONALITIES = ["curious", "friendly", "neutral"]
 
 
 # ============================================================
 # ROOM STRUCTURE
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     id: int
     name: str
@@ -56,30 +141,79 @@ class Room:
     resources: list = field(default_factory=list)
     hazards: list = field(default_factory=list)
 
+    # Occupants views owned by World.entities once the room is registered;
+    # move or despawn through World.move_entity / World.despawn
     npcs: list = field(default_factory=list)
     animals: list = field(default_factory=list)
 
-    exits: dict = field(default_factory=dict)
-    locked_exits: dict = field(default_factory=dict)
-
     tags: set = field(default_factory=set)  # camp, shrine, treasure, miniboss, den
 
     # War simulation metadata
     faction_control: str | None = None
     contested: bool = False
 
+    # Shared world adjacency; exits are derived from the room's coordinates
+    grid: GridAdjacency | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def exits(self) -> dict:
+        return self.grid.exits(self.id) if self.grid else {}
+
+    @property
+    def locked_exits(self) -> dict:
+        return self.grid.locked_exits(self.id) if self.grid else {}
+
 
 # ============================================================
 # WORLD CLASS
 # ============================================================
 
 class World:
-    def __init__(self, size=15):
+    def __init__(self, size=15, seed=None, chunked=False, chunk_size=CHUNK_SIZE, compact=False):
         # Player chooses size at game start
         self.size = size
-        self.rooms: dict[int, Room] = {}
         self.start_room_id: int | None = None
 
+        # Every chunk derives its own seed from the world seed, so the same
+        # seed always produces the same rooms (eagerly or chunk by chunk)
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.chunk_size = chunk_size
+
+        # Neighbors come from grid coordinates; only exceptions are stored
+        self.grid = GridAdjacency(size)
+
+        # Chunked worlds only keep rooms near the player (or touched by the
+        # simulation) in memory; everything else is rebuilt from its seed
+        self.chunked = chunked
+        self.resident_radius = 1
+
+        # Compact worlds keep room data in NumPy arrays (see core.room_store)
+        self.compact = compact
+        if chunked and compact:
+            raise ValueError("A world can be chunked or compact, not both")
+
+        if chunked:
+            self.rooms = ChunkedRooms(self, chunk_size)
+        elif compact:
+            self.rooms = RoomStore(self.grid, BIOMES, FACTIONS)
+        else:
+            self.rooms: dict[int, Room] = {}
+
+        self._populated = False
+        self._built_chunks = set()
+        self._biome_codes = {}      # (cx, cy) -> bytes, chunked worlds only
+
+        # Lookup indexes, kept in sync by add_tag / remove_tag / set_biome
+        self.biome_index = {b: set() for b in BIOMES}
+        self.tag_index = {}
+        self.animal_census = Counter()  # (name, hostile) -> count
+
+        # Where every NPC and animal is; all movement goes through it
+        self.entities = EntityIndex(self)
+
+        # Shortest paths and cached distance fields (core.pathfinding)
+        self.paths = Pathfinder(self)
+
         # World state
         self.day = 1
         self.time_of_day = 8
@@ -88,8 +222,15 @@ class World:
         self.temperature = 20.0
 
         # Faction war state
-        self.faction_territories = {f: set() for f in FACTIONS.keys()}
+        self.territories = Territories(self.grid, FACTIONS.keys())  # faction -> room bitset
         self.faction_strength = {f: 100 for f in FACTIONS.keys()}  # morale/war power
+        self.garrisons = Garrisons()    # (room, faction) -> defender count
+        self._mustered = {}             # room_id -> garrison NPCs while the player is there
+        self.last_war_diff = None   # WarDiff of the latest war day
+        self._war_diff = None       # the one being recorded, during a war day
+
+        # Wake-ups keyed on world time; the war runs at midnight
+        self.start_clock()
 
         # NPC systems (populated in Section 2)
         self.wandering_npcs = []
@@ -104,29 +245,44 @@ class World:
         self.animal_dens = []
         self.migration_routes = {}
 
-        if DEBUG:
-            print(f"[DEBUG] World initialized with size {self.size}x{self.size}")
+        # Minimap glyph cache (0 = needs redraw)
+        self._glyphs = bytearray(size * size)
+
+        tracer.info("world", "world initialized", size=self.size)
 
     # ============================================================
     # POPULATE WORLD — ONE CALL TO SPAWN EVERYTHING
     # ============================================================
 
-    def populate_world(self):
-        """Runs all NPC and faction systems after base world generation."""
+    def populate_world(self, workers=None):
+        """
+        Runs all NPC and faction systems after base world generation.
+        workers > 1 rolls the per-room ambient NPCs in worker processes.
+        """
         # Faction territory setup
         self.assign_faction_territories()
 
         # NPC ecosystems
-        self.spawn_ambient_npcs()
+        self.spawn_ambient_npcs(workers)
         self.spawn_shrine_guardians()
+
+        # Chunks built from here on get their local NPCs when they load
+        self._populated = True
+
         self.spawn_camps()
         self.spawn_patrols()
         self.spawn_caravans()
         self.spawn_emissaries()
         self.spawn_legendary_npcs()
 
-        if DEBUG:
-            print("[DEBUG] World population complete.")
+        # Travelers move on their own schedules from now on
+        self.schedule_agents()
+
+        # Emissaries' distance fields are too slow to build during a move
+        if not self.chunked:
+            self.paths.prepare_factions()
+
+        tracer.info("world", "population complete")
 
 
 
@@ -136,54 +292,182 @@ class World:
     # WORLD GENERATION
     # ============================================================
 
-    def generate(self):
-        width = self.size
-        height = self.size
+    def generate(self, workers=None):
+        """
+        Build the map. workers > 1 builds bands of chunk rows in parallel
+        processes; chunk seeds don't depend on the split, so the world is
+        identical to a single-process build with the same seed.
+        """
+        self.start_room_id = 0
 
-        room_id = 0
-        for y in range(height):
-            for x in range(width):
-                biome = random.choice(BIOMES)
-                name = f"{biome.title()} Area {room_id}"
-                desc = self._biome_description(biome)
+        if self.chunked:
+            # Only the starting chunk is built; other chunks' biomes are
+            # decoded when something asks for them (biome_of, _rooms_in_biome)
+            self.rooms.load_chunk(*self._chunk_of(self.start_room_id))
+        else:
+            coords = self._all_chunk_coords()
+            if workers and workers > 1:
+                chunks = parallel.generate_chunks(self, coords, workers)
+            else:
+                chunks = [self._build_chunk(cx, cy) for cx, cy in coords]
+
+            built = []
+            for (cx, cy), rooms in zip(coords, chunks):
+                self._register_chunk(cx, cy, rooms)
+                built.extend(rooms)
+
+            # Keep the familiar row-major room order
+            built.sort(key=lambda r: r.id)
+            for room in built:
+                self.rooms[room.id] = room
 
-                room = Room(
-                    id=room_id,
-                    name=name,
-                    description=desc,
-                    biome=biome,
-                )
+        # After rooms exist, set up migration routes
+        self._setup_migration_routes()
+
+        tracer.info("world", "base generation complete")
 
-                # Exits
-                if x > 0:
-                    room.exits["west"] = room_id - 1
-                if x < width - 1:
-                    room.exits["east"] = room_id + 1
-                if y > 0:
-                    room.exits["north"] = room_id - width
-                if y < height - 1:
-                    room.exits["south"] = room_id + width
+    # ============================================================
+    # CHUNKS
+    # ============================================================
 
-                # Resources + hazards
-                room.resources = self._generate_resources(biome)
-                room.hazards = self._generate_hazards(biome)
+    def _chunk_of(self, room_id: int) -> tuple:
+        return chunk_of(room_id, self.size, self.chunk_size)
 
-                # Animals
-                self._spawn_animals(room)
+    def _chunk_rng(self, cx: int, cy: int, stream: str) -> random.Random:
+        return random.Random(chunk_seed(self.seed, cx, cy, stream))
 
-                # Special tags (shrines, camps, treasure)
-                self._maybe_mark_special(room)
+    def _all_chunk_coords(self):
+        n = chunks_per_side(self.size, self.chunk_size)
+        return [(cx, cy) for cy in range(n) for cx in range(n)]
 
-                self.rooms[room_id] = room
-                room_id += 1
+    def _iter_chunks(self):
+        """(cx, cy, rooms) for every chunk in memory."""
+        if self.chunked:
+            for cx, cy in self.rooms.resident_chunks():
+                yield cx, cy, self.rooms.load_chunk(cx, cy)
+            return
 
-        self.start_room_id = 0
+        for cx, cy in self._all_chunk_coords():
+            ids = chunk_room_ids(cx, cy, self.size, self.chunk_size)
+            yield cx, cy, [self.rooms[rid] for rid in ids]
+
+    def _chunk_biome_codes(self, cx: int, cy: int) -> bytes:
+        """Biome of every room in a chunk, drawn from its own stream."""
+        codes = self._biome_codes.get((cx, cy))
+        if codes is None:
+            rng = self._chunk_rng(cx, cy, "biome")
+            count = len(chunk_room_ids(cx, cy, self.size, self.chunk_size))
+            codes = bytes(rng.randrange(len(BIOMES)) for _ in range(count))
+            if self.chunked:
+                self._biome_codes[(cx, cy)] = codes
+        return codes
+
+    def _build_chunk(self, cx: int, cy: int) -> list:
+        """Build every room of one chunk from the chunk's seed."""
+        rng = self._chunk_rng(cx, cy, "rooms")
+
+        ids = chunk_room_ids(cx, cy, self.size, self.chunk_size)
+        codes = self._chunk_biome_codes(cx, cy)
+
+        rooms = []
+        for room_id, code in zip(ids, codes):
+            room = self._new_room(room_id, BIOMES[code])
+
+            # Animals
+            self._spawn_animals(room, rng)
+
+            # Special tags (shrines, camps, treasure)
+            self._maybe_mark_special(room, rng)
+
+            rooms.append(room)
+
+        return rooms
+
+    def _new_room(self, room_id: int, biome: str) -> Room:
+        """A room with its biome's text, resources and hazards."""
+        return Room(
+            id=room_id,
+            name=f"{biome.title()} Area {room_id}",
+            description=self._biome_description(biome),
+            biome=biome,
+            resources=self._generate_resources(biome),
+            hazards=self._generate_hazards(biome),
+            grid=self.grid,
+        )
 
-        # After rooms exist, set up migration routes
-        self._setup_migration_routes()
+    def _register_chunk(self, cx: int, cy: int, rooms: list):
+        """Hook freshly built rooms into the world's shared state."""
+        for room in rooms:
+            room.grid = self.grid
+            self._index_room(room)
+            self.entities.adopt_room(room)
+
+        if self.chunked:
+            self._apply_territories(rooms)
+
+        # Rebuilding an evicted chunk must not register its dens twice
+        if (cx, cy) not in self._built_chunks:
+            self._built_chunks.add((cx, cy))
+            self.animal_dens.extend(r.id for r in rooms if "den" in r.tags)
+            self.animal_census.update((a.name, a.hostile) for r in rooms for a in r.animals)
+
+    def _unregister_chunk(self, cx: int, cy: int, rooms: list):
+        """An evicted chunk's occupants leave the entity index."""
+        for room in rooms:
+            self.entities.drop_room(room)
+
+    def _populate_chunk(self, cx: int, cy: int, rooms: list):
+        """Local NPCs for a chunk that loads after populate_world()."""
+        self._spawn_ambient_in(cx, cy, rooms)
+        for room in rooms:
+            if "shrine" in room.tags:
+                self._spawn_guardian(room.id)
+
+    def _apply_territories(self, rooms: list):
+        """
+        Chunked worlds: the territory bitsets are the record of ownership,
+        so a chunk built (or rebuilt) now takes its owners and contested
+        flags from them. One shift per faction cuts out the chunk's window.
+        """
+        lo = min(room.id for room in rooms)
+        width = max(room.id for room in rooms) - lo + 1
+        window = (1 << width) - 1
+
+        owned = []
+        for faction, mask in self.territories.masks.items():
+            bits = mask >> lo & window
+            if bits:
+                owned.append((faction, bits))
+        contested = self.territories.contested >> lo & window
+        for room in rooms:
+            bit = room.id - lo
+            room.faction_control = next((f for f, m in owned if m >> bit & 1), None)
+            room.contested = bool(contested >> bit & 1)
+
+    def _resident_room(self, room_id: int):
+        """The room if it is in memory; None for a chunked world's unbuilt rooms."""
+        if self.chunked and not self.rooms.is_resident(room_id):
+            return None
+        return self.rooms[room_id]
 
-        if DEBUG:
-            print("[DEBUG] Base world generation complete.")
+    def biome_of(self, room_id: int) -> str:
+        """A room's biome without building it (a chunked world decodes its chunk's biomes only)."""
+        room = self._resident_room(room_id)
+        if room is not None:
+            return room.biome
+
+        cx, cy = self._chunk_of(room_id)
+        y, x = divmod(room_id, self.size)
+        x0, y0 = cx * self.chunk_size, cy * self.chunk_size
+        width = min(self.chunk_size, self.size - x0)
+        return BIOMES[self._chunk_biome_codes(cx, cy)[(y - y0) * width + x - x0]]
+
+    def update_residency(self, room_id: int):
+        """Chunked worlds: keep the player's surroundings, drop far pristine chunks."""
+        if not self.chunked:
+            return
+        self.rooms.mark_visited(room_id)
+        self.rooms.evict_far_chunks(room_id, self.resident_radius)
 
     # ============================================================
     # BIOME DESCRIPTIONS
@@ -208,102 +492,77 @@ class World:
     # ============================================================
 
     def _generate_resources(self, biome: str) -> list:
-        return {
-            "forest": ["berries", "wood"],
-            "plains": ["herbs", "game"],
-            "swamp": ["mushrooms"],
-            "mountain": ["ore", "stone"],
-            "desert": ["cactus", "scrap"],
-        }.get(biome, [])
+        return list(BIOME_RESOURCES.get(biome, ()))
 
     def _generate_hazards(self, biome: str) -> list:
-        return {
-            "swamp": ["poisonous gas"],
-            "mountain": ["loose rocks"],
-            "desert": ["heatstroke"],
-        }.get(biome, [])
+        return list(BIOME_HAZARDS.get(biome, ()))
 
     # ============================================================
     # ANIMAL SPAWNING
     # ============================================================
 
-    def _spawn_animals(self, room: Room):
+    def _spawn_animals(self, room: Room, rng=random):
         biome = room.biome
 
         # 75% chance to spawn animals
-        if random.random() < 0.75:
-
-            pools = {
-                "forest": [
-                    ("Deer", False), ("Rabbit", False),
-                    ("Wolf", True), ("Boar", True)
-                ],
-                "plains": [
-                    ("Horse", False), ("Bison", False),
-                    ("Wild Dog", True)
-                ],
-                "swamp": [
-                    ("Frog", False),
-                    ("Giant Leech", True), ("Crocodile", True)
-                ],
-                "mountain": [
-                    ("Goat", False), ("Eagle", False),
-                    ("Mountain Lion", True)
-                ],
-                "desert": [
-                    ("Lizard", False),
-                    ("Scorpion", True), ("Sand Wolf", True)
-                ],
-            }
-
-            pool = pools.get(biome, [("Strange Bird", False)])
+        if rng.random() < ANIMAL_CHANCE:
+            pool = ANIMAL_POOLS.get(biome, [("Strange Bird", False)])
 
             # 1–3 animals per room
-            count = random.randint(1, 3)
+            count = rng.randint(1, 3)
             for _ in range(count):
-                name, hostile = random.choice(pool)
-                animal = Animal(name=name, hostile=hostile, biome=biome, room_id=room.id)
+                name, hostile = rng.choice(pool)
+                animal = Animal(name=name, hostile=hostile, biome=biome, room_id=room.id, rng=rng)
                 room.animals.append(animal)
 
         # 10% chance of a den
-        if random.random() < 0.1:
+        if rng.random() < DEN_CHANCE:
             room.tags.add("den")
-            self.animal_dens.append(room.id)
 
     # ============================================================
     # SPECIAL ROOM TAGS
     # ============================================================
 
-    def _maybe_mark_special(self, room: Room):
-        if random.random() < 0.04:
-            room.tags.add("campfire")
-        if random.random() < 0.03:
-            room.tags.add("shrine")
-        if random.random() < 0.03:
-            room.tags.add("treasure")
-        if random.random() < 0.01:
-            room.tags.add("miniboss")
+    def _maybe_mark_special(self, room: Room, rng=random):
+        for tag, chance in SPECIAL_TAGS:
+            if rng.random() < chance:
+                room.tags.add(tag)
 
     # ============================================================
     # MIGRATION ROUTES
     # ============================================================
 
     def _setup_migration_routes(self):
-        self.migration_routes = {b: [] for b in BIOMES}
-        for room_id, room in self.rooms.items():
-            self.migration_routes[room.biome].append(room_id)
+        # Chunked worlds don't list a biome's rooms map-wide; they look them
+        # up per chunk when needed (_rooms_in_biome)
+        if self.chunked:
+            return
+        self.migration_routes = {b: self._rooms_in_biome(b) for b in BIOMES}
 
-        if DEBUG:
-            print("[DEBUG] Migration routes established.")
+        tracer.debug("world", "migration routes established")
     # ============================================================
     # NPC SYSTEMS — SPAWN TABLES + HELPERS
     # ============================================================
 
     def _random_room_id(self):
-        return random.choice(list(self.rooms.keys()))
+        return random.randrange(self.size * self.size)
 
     def _rooms_in_biome(self, biome):
-        return [rid for rid, r in self.rooms.items() if r.biome == biome]
+        """
+        Rooms of a biome, ascending. A chunked world doesn't decode the
+        whole map for this: the rooms come from BIOME_SAMPLE_CHUNKS random
+        chunks.
+        """
+        if not self.chunked:
+            return sorted(self.biome_index.get(biome, ()))
+
+        code = BIOMES.index(biome)
+        coords = self._all_chunk_coords()
+        found = []
+        for cx, cy in random.sample(coords, min(BIOME_SAMPLE_CHUNKS, len(coords))):
+            ids = chunk_room_ids(cx, cy, self.size, self.chunk_size)
+            found.extend(rid for rid, c in zip(ids, self._chunk_biome_codes(cx, cy)) if c == code)
+        return sorted(found)
 
     def _spawn_npc(self, npc_id, name, personality, faction, room_id, **flags):
         """Centralized NPC creation — ensures compatibility with your AI NPC class."""
@@ -322,7 +581,7 @@ class World:
             setattr(npc, k, v)
 
         # Add to room
-        self.rooms[room_id].npcs.append(npc)
+        self.entities.add(npc, room_id)
         return npc
 
     # ============================================================
@@ -343,43 +602,54 @@ class World:
             chosen = random.sample(candidates, min(territory_size, len(candidates)))
 
             for rid in chosen:
-                self.rooms[rid].faction_control = faction
-                self.faction_territories[faction].add(rid)
+                self.set_control(rid, faction)
 
-        if DEBUG:
-            print("[DEBUG] Faction territories assigned.")
+        tracer.debug("world", "faction territories assigned")
 
     # ============================================================
     # AMBIENT NPCS (BIOME-SPECIFIC)
     # ============================================================
 
-    def spawn_ambient_npcs(self):
+    def spawn_ambient_npcs(self, workers=None):
         """Biome-based ambient NPCs that wander and talk to the player."""
-        for room_id, room in self.rooms.items():
-            if random.random() > 0.55:
-                continue
+        chunks = list(self._iter_chunks())
 
-            biome = room.biome
+        if workers and workers > 1 and not self.chunked:
+            jobs = [(cx, cy, [(r.id, r.biome) for r in rooms]) for cx, cy, rooms in chunks]
+            for specs in parallel.ambient_specs(self.seed, jobs, workers):
+                for spec in specs:
+                    self._spawn_npc(**spec)
+            return
 
-            biome_npcs = {
-                "forest": ["Wanderer", "Herbalist", "Scout"],
-                "plains": ["Traveler", "Hunter", "Nomad"],
-                "swamp": ["Bog Walker", "Hermit", "Mire Scout"],
-                "mountain": ["Climber", "Miner", "Ridge Scout"],
-                "desert": ["Drifter", "Sand Scout", "Nomad"],
-            }
+        for cx, cy, rooms in chunks:
+            self._spawn_ambient_in(cx, cy, rooms)
+
+    def _spawn_ambient_in(self, cx, cy, rooms):
+        room_biomes = [(r.id, r.biome) for r in rooms]
+        specs = self._ambient_specs(room_biomes, self._chunk_rng(cx, cy, "ambient"))
+        for spec in specs:
+            self._spawn_npc(**spec)
+
+    @staticmethod
+    def _ambient_specs(room_biomes, rng) -> list:
+        """Roll the ambient NPCs for (room_id, biome) pairs; no world access."""
+        specs = []
+        for room_id, biome in room_biomes:
+            if rng.random() > AMBIENT_NPC_CHANCE:
+                continue
 
-            name = random.choice(biome_npcs.get(biome, ["Traveler"]))
-            personality = random.choice(["curious", "friendly", "neutral"])
+            name = rng.choice(AMBIENT_NPCS.get(biome, ["Traveler"]))
+            personality = rng.choice(AMBIENT_PERSONALITIES)
 
-            npc_id = f"ambient_{room_id}_{random.randint(1000,9999)}"
-            self._spawn_npc(
+            npc_id = f"ambient_{room_id}_{rng.randint(1000,9999)}"
+            specs.append(dict(
                 npc_id=npc_id,
                 name=name,
                 personality=personality,
                 faction=None,
                 room_id=room_id,
-            )
+            ))
+        return specs
 
     # ============================================================
     # SHRINES + GUARDIANS
@@ -387,19 +657,19 @@ class World:
 
     def spawn_shrine_guardians(self):
         """Spawn mystic guardians at shrine rooms."""
-        for room_id, room in self.rooms.items():
-            if "shrine" not in room.tags:
-                continue
+        for room_id in self.rooms_with_tag("shrine"):
+            self._spawn_guardian(room_id)
 
-            npc_id = f"guardian_{room_id}"
-            self._spawn_npc(
-                npc_id=npc_id,
-                name="Shrine Guardian",
-                personality="serious",
-                faction="Swamp Covenant" if room.biome == "swamp" else "Mystics",
-                room_id=room_id,
-                is_guardian=True,
-            )
+    def _spawn_guardian(self, room_id):
+        npc_id = f"guardian_{room_id}"
+        self._spawn_npc(
+            npc_id=npc_id,
+            name="Shrine Guardian",
+            personality="serious",
+            faction="Swamp Covenant" if self.rooms[room_id].biome == "swamp" else "Mystics",
+            room_id=room_id,
+            is_guardian=True,
+        )
 
     # ============================================================
     # CAMPS (FACTION + NEUTRAL)
@@ -412,25 +682,14 @@ class World:
             count = random.randint(2, 4)
             for i in range(count):
                 rid = self._random_room_id()
-                room = self.rooms[rid]
 
-                room.tags.add("camp")
-                room.faction_control = faction
-                self.faction_territories[faction].add(rid)
+                self.add_tag(rid, "camp")
+                self.set_control(rid, faction)
 
                 # Camp defenders
-                for j in range(random.randint(2, 4)):
-                    npc_id = f"{faction}_camp_{i}_{j}"
-                    self._spawn_npc(
-                        npc_id=npc_id,
-                        name=f"{faction} Defender",
-                        personality="serious",
-                        faction=faction,
-                        room_id=rid,
-                    )
+                self.garrisons.reinforce(rid, faction, random.randint(2, 4))
 
-        if DEBUG:
-            print("[DEBUG] Camps spawned.")
+        tracer.debug("spawn", "camps spawned")
 
     # ============================================================
     # PATROLS
@@ -464,8 +723,7 @@ class World:
 
                 self.faction_patrols.append(patrol)
 
-        if DEBUG:
-            print("[DEBUG] Patrols spawned.")
+        tracer.debug("spawn", "patrols spawned")
 
     # ============================================================
     # CARAVANS
@@ -503,8 +761,7 @@ class World:
 
             self.traveling_merchants.append((merchant, guards))
 
-        if DEBUG:
-            print("[DEBUG] Caravans spawned.")
+        tracer.debug("spawn", "caravans spawned")
 
     # ============================================================
     # EMISSARIES
@@ -534,8 +791,7 @@ class World:
 
                 self.faction_emissaries.append(npc)
 
-        if DEBUG:
-            print("[DEBUG] Emissaries spawned.")
+        tracer.debug("spawn", "emissaries spawned")
 
     # ============================================================
     # LEGENDARY NPCS
@@ -551,7 +807,8 @@ class World:
             "desert": ("Sand Wraith", "silent"),
         }
 
-        for biome, rooms in self.migration_routes.items():
+        for biome in BIOMES:
+            rooms = self.migration_routes.get(biome) if not self.chunked else self._rooms_in_biome(biome)
             if not rooms:
                 continue
 
@@ -569,62 +826,77 @@ class World:
                     is_legendary=True,
                 )
 
-                if DEBUG:
-                    print(f"[DEBUG] Legendary NPC spawned: {name} in room {rid}")
+                tracer.info("spawn", "legendary NPC spawned", name=name, room=rid)
     # ============================================================
     # FACTION WAR SIMULATION
     # ============================================================
 
     def simulate_faction_war(self):
-        """Runs once per day or when triggered by world events."""
-        # Each faction attempts to expand or defend territory
-        for faction in FACTIONS.keys():
-            self._faction_attempt_expand(faction)
-            self._faction_attempt_defend(faction)
-
-        # Patrol clashes
-        self._resolve_patrol_clashes()
-
-        # Camps may be destroyed or captured
-        self._resolve_camp_conflicts()
-
-        # Emissaries attempt diplomacy
-        self._resolve_emissary_actions()
-
-        if DEBUG:
-            print("[DEBUG] Faction war simulation step complete.")
+        """
+        Runs once per day or when triggered by world events.
+        Returns the day's WarDiff (also kept as last_war_diff).
+        Runs inside the caller's tick (a move, a rest); it doesn't begin one.
+        """
+        with tracer.span("war.day", day=self.day):
+            diff = self._war_diff = war.WarDiff(self.day)
+
+            # Every faction pushes its whole border at once, then reinforces
+            with tracer.span("war.expand"):
+                self._expand_fronts()
+            with tracer.span("war.defend"):
+                for faction in FACTIONS.keys():
+                    self._faction_attempt_defend(faction)
+
+            # Patrol clashes
+            with tracer.span("war.patrol_clashes"):
+                self._resolve_patrol_clashes()
+
+            # Camps may be destroyed or captured
+            with tracer.span("war.camps"):
+                self._resolve_camp_conflicts()
+
+            # Emissaries attempt diplomacy
+            with tracer.span("war.emissaries"):
+                self._resolve_emissary_actions()
+
+            # Borders as they stand at the end of the day
+            with tracer.span("war.contested"):
+                self._mark_contested(diff)
+
+            self._war_diff = None
+            self.last_war_diff = diff
+
+        tracer.debug("war", "war day complete", day=self.day, captured=len(diff.captured))
+        return diff
 
     # ------------------------------------------------------------
     # Territory Expansion
     # ------------------------------------------------------------
 
-    def _faction_attempt_expand(self, faction):
-        """Faction tries to expand into adjacent neutral or enemy rooms."""
-        controlled = list(self.faction_territories[faction])
-        random.shuffle(controlled)
-
-        for rid in controlled[:5]:  # limit expansion attempts
-            room = self.rooms[rid]
+    def _expand_fronts(self):
+        """Factions expand into adjacent neutral or enemy rooms (see core.war)."""
+        # Chance to expand depends on aggression
+        for rid, faction in war.expand_fronts(self.territories, FACTIONS).items():
+            self.set_control(rid, faction)
 
-            for direction, neighbor_id in room.exits.items():
-                neighbor = self.rooms[neighbor_id]
+            tracer.debug("war", "expanded", faction=faction, room=rid)
 
-                # Skip if already controlled
-                if neighbor.faction_control == faction:
-                    continue
+    # ------------------------------------------------------------
+    # Contested Borders
+    # ------------------------------------------------------------
 
-                # Chance to expand depends on aggression
-                aggression = FACTIONS[faction]["aggression"]
-                if random.random() < aggression * 0.25:
-                    previous = neighbor.faction_control
-                    neighbor.faction_control = faction
-                    self.faction_territories[faction].add(neighbor_id)
+    def _mark_contested(self, diff):
+        """Flag rooms that border another faction's land; only changes touch rooms."""
+        contested = war.contested_mask(self.territories)
 
-                    if previous and previous != faction:
-                        self.faction_territories[previous].discard(neighbor_id)
+        for rid in iter_bits(contested ^ self.territories.contested):
+            flag = bool(contested >> rid & 1)
+            room = self._resident_room(rid)
+            if room is not None:
+                room.contested = flag
+            (diff.contested if flag else diff.calmed).append(rid)
 
-                    if DEBUG:
-                        print(f"[DEBUG] {faction} expanded into room {neighbor_id}")
+        self.territories.contested = contested
 
     # ------------------------------------------------------------
     # Territory Defense
@@ -632,34 +904,27 @@ class World:
 
     def _faction_attempt_defend(self, faction):
         """Faction reinforces key rooms."""
-        controlled = list(self.faction_territories[faction])
-        if not controlled:
+        area = self.territories.area(faction)
+        if not area:
             return
 
         # Reinforce 1–2 random rooms
-        for rid in random.sample(controlled, min(2, len(controlled))):
-            room = self.rooms[rid]
+        for n in random.sample(range(area), min(2, area)):
+            rid = self.territories.nth_room(faction, n)
 
-            # Add a defender
-            npc_id = f"{faction}_defender_{rid}_{random.randint(1000,9999)}"
-            self._spawn_npc(
-                npc_id=npc_id,
-                name=f"{faction} Defender",
-                personality="serious",
-                faction=faction,
-                room_id=rid,
-            )
+            # Add a defender to the room's garrison
+            self.garrisons.reinforce(rid, faction)
 
-            if DEBUG:
-                print(f"[DEBUG] {faction} reinforced room {rid}")
+            tracer.debug("war", "reinforced", faction=faction, room=rid)
 
     # ------------------------------------------------------------
     # Patrol Clashes
     # ------------------------------------------------------------
 
     def _resolve_patrol_clashes(self):
-        """If two patrols from different factions meet, they clash."""
+        """If two patrols from different factions meet, they clash. Returns the clash count."""
         patrol_positions = {}
+        clashes = 0
 
         for patrol in self.faction_patrols:
             if not patrol:
@@ -677,73 +942,87 @@ class World:
                 continue
 
             # Resolve conflict
-            winner = random.choice(list(factions_present))
+            winner = random.choice(sorted(factions_present))
             losers = [f for f in factions_present if f != winner]
 
             # Remove losing patrols
             for patrol in patrols:
                 if patrol[0].faction in losers:
                     for npc in patrol:
-                        self.rooms[rid].npcs.remove(npc)
+                        self.entities.remove(npc)
                     patrol.clear()
 
-            if DEBUG:
-                print(f"[DEBUG] Patrol clash in room {rid}. Winner: {winner}")
+            clashes += 1
+
+            tracer.debug("war", "patrol clash", room=rid, winner=winner)
+
+        return clashes
 
     # ------------------------------------------------------------
     # Camp Conflicts
     # ------------------------------------------------------------
 
     def _resolve_camp_conflicts(self):
-        """Enemy factions may destroy or capture camps."""
-        for rid, room in self.rooms.items():
-            if "camp" not in room.tags:
-                continue
-
+        """Enemy factions may destroy or capture camps. Returns the number of fights."""
+        fights = 0
+        for rid in self.rooms_with_tag("camp"):
+            room = self.rooms[rid]
             factions_present = {npc.faction for npc in room.npcs if npc.faction}
+            factions_present |= self.garrisons.factions_in(rid)
 
             if len(factions_present) <= 1:
                 continue
 
             # Conflict
-            winner = random.choice(list(factions_present))
+            winner = random.choice(sorted(factions_present))
             losers = [f for f in factions_present if f != winner]
 
-            # Remove losing NPCs
-            room.npcs = [npc for npc in room.npcs if npc.faction == winner]
+            # Remove losing NPCs and garrisons
+            for npc in [npc for npc in room.npcs if npc.faction != winner]:
+                self.entities.remove(npc)
+            self.garrisons.keep_only(rid, winner)
 
-            # Camp changes hands
-            previous = room.faction_control
-            room.faction_control = winner
+            # Camp changes hands (guardians and caravan guards can win too)
+            self.set_control(rid, winner)
 
-            if previous and previous != winner:
-                self.faction_territories[previous].discard(rid)
-            self.faction_territories[winner].add(rid)
+            fights += 1
 
-            if DEBUG:
-                print(f"[DEBUG] Camp conflict in room {rid}. Winner: {winner}")
+            tracer.debug("war", "camp conflict", room=rid, winner=winner)
+
+        return fights
 
     # ------------------------------------------------------------
     # Emissary Diplomacy
     # ------------------------------------------------------------
 
     def _resolve_emissary_actions(self):
-        """Emissaries attempt diplomacy or get intercepted."""
+        """Emissaries attempt diplomacy or get intercepted. Returns the number lost."""
+        survivors = []
         for npc in self.faction_emissaries:
             rid = npc.room_id
             room = self.rooms[rid]
 
+            # Already lost a camp fight this step
+            if self.entities.room_of(npc) is None:
+                continue
+
             factions_present = {n.faction for n in room.npcs if n.faction}
+            factions_present |= self.garrisons.factions_in(rid)
 
-            # If emissary meets enemy patrol → intercepted
+            # If emissary meets enemy patrol or garrison → intercepted
             if any(f != npc.faction for f in factions_present):
-                if DEBUG:
-                    print(f"[DEBUG] Emissary {npc.npc_id} intercepted in room {rid}")
-                room.npcs.remove(npc)
+                tracer.debug("war", "emissary intercepted", npc=npc.npc_id, room=rid)
+                self.entities.remove(npc)
                 continue
 
             # Otherwise, emissary strengthens morale
             self.faction_strength[npc.faction] += 1
+            survivors.append(npc)
+
+        # Intercepted emissaries are gone for good
+        lost = len(self.faction_emissaries) - len(survivors)
+        self.faction_emissaries = survivors
+        return lost
 
     # ============================================================
     # NPC MOVEMENT SYSTEMS
@@ -752,68 +1031,233 @@ class World:
     def move_patrols(self):
         """Patrols move randomly within their biome."""
         for patrol in self.faction_patrols:
-            if not patrol:
-                continue
+            self.move_patrol(patrol)
 
-            leader = patrol[0]
-            current = self.rooms[leader.room_id]
+    def move_patrol(self, patrol):
+        """One step of a patrol; returns False once it has been wiped out."""
+        if not patrol:
+            return False
 
-            # Choose a random exit
-            if not current.exits:
-                continue
+        leader = patrol[0]
 
-            new_rid = random.choice(list(current.exits.values()))
+        # Choose a random exit
+        new_rid = self.random_neighbor(leader.room_id)
+        if new_rid is None:
+            return True
 
-            # Move entire patrol
-            for npc in patrol:
-                npc.room_id = new_rid
+        # Move entire patrol
+        for npc in patrol:
+            self.entities.move(npc, new_rid)
 
-            if DEBUG:
-                print(f"[DEBUG] Patrol moved to room {new_rid}")
+        tracer.trace("movement", "patrol moved", room=new_rid)
+        return True
 
     def move_caravans(self):
-        """Caravans move slowly across the world."""
+        """Caravans travel from camp to camp along the cheapest roads."""
         for merchant, guards in self.traveling_merchants:
-            current = self.rooms[merchant.room_id]
+            self.move_caravan(merchant, guards)
 
-            if not current.exits:
-                continue
+    def move_caravan(self, merchant, guards):
+        """One step of a caravan toward its destination; returns the new room or None."""
+        if not self.entities.placed(merchant):
+            # Lost a camp fight
+            return None
+
+        destination = getattr(merchant, "destination", None)
+        if destination is None or destination == merchant.room_id:
+            # Arrived (or new): pick the next stop
+            camps = self.rooms_with_tag("camp")
+            destination = merchant.destination = random.choice(camps) if camps else self._random_room_id()
+            merchant.route = None
+
+        # Budgeted A* legs toward the destination, kept until used up (or
+        # until they stop matching the map)
+        route = getattr(merchant, "route", None)
+        if not route or route[0] not in self.neighbors(merchant.room_id):
+            path = self.paths.find(merchant.room_id, destination, budget=ROUTE_BUDGET)
+            route = merchant.route = path[1:] if path else None
+        if not route:
+            merchant.destination = merchant.route = None
+            return None
 
-            new_rid = random.choice(list(current.exits.values()))
-            merchant.room_id = new_rid
+        new_rid = route.pop(0)
 
-            for g in guards:
-                g.room_id = new_rid
+        self.entities.move(merchant, new_rid)
 
-            if DEBUG:
-                print(f"[DEBUG] Caravan moved to room {new_rid}")
+        for g in guards:
+            self.entities.move(g, new_rid)
+
+        tracer.trace("movement", "caravan moved", room=new_rid)
+        return new_rid
 
     def move_emissaries(self):
-        """Emissaries wander toward random faction territories."""
+        """Emissaries travel toward a random foreign faction's territory."""
         for npc in self.faction_emissaries:
-            current = self.rooms[npc.room_id]
+            self.move_emissary(npc)
+
+    def move_emissary(self, npc):
+        """One step of an emissary; returns False once it has been intercepted."""
+        if npc not in self.faction_emissaries:
+            return False
+
+        target = getattr(npc, "target_faction", None)
+        if target is None or self.territories.controls(target, npc.room_id):
+            # Arrived (or new): choose the next court to visit
+            options = [f for f in self.territories if f != npc.faction and self.territories.area(f)]
+            if not options:
+                return True
+            target = npc.target_faction = random.choice(options)
+            npc.route = None
+
+        # Follow the faction's distance field while it leads somewhere
+        route = getattr(npc, "route", None)
+        new_rid = None
+        if route is None:
+            field = self.paths.toward_faction(target)
+            new_rid = field.next_room(npc.room_id) if field else None
+            if new_rid is None:
+                # No field, or it ended in land the faction has lost since:
+                # walk budgeted legs toward a room it holds now
+                route = npc.route = []
+
+        if route is not None:
+            area = self.territories.area(target)
+            if area and (not route or route[0] not in self.neighbors(npc.room_id)):
+                goal = self.territories.nth_room(target, random.randrange(area))
+                path = self.paths.find(npc.room_id, goal, budget=ROUTE_BUDGET)
+                route = npc.route = path[1:] if path else []
+            new_rid = route.pop(0) if route else None
+
+        if new_rid is None:
+            npc.target_faction = npc.route = None
+            return True
+
+        self.entities.move(npc, new_rid)
+
+        tracer.trace("movement", "emissary moved", room=new_rid)
+        return True
 
-            if not current.exits:
-                continue
+    # ------------------------------------------------------------
+    # Schedules
+    # ------------------------------------------------------------
 
-            new_rid = random.choice(list(current.exits.values()))
-            npc.room_id = new_rid
+    @property
+    def world_time(self) -> float:
+        """Hours since the start of day 1."""
+        return (self.day - 1) * 24 + self.time_of_day
 
-            if DEBUG:
-                print(f"[DEBUG] Emissary moved to room {new_rid}")
+    def start_clock(self):
+        """A fresh scheduler at the current time, with the midnight war step."""
+        self.scheduler = Scheduler(self.world_time)
+        self.scheduler.every(24, self._new_day, start=self.day * 24, name="war")
+
+    def _new_day(self):
+        self.day += 1
+        self.time_of_day = 0
+
+        # Daily war simulation
+        self.simulate_faction_war()
+
+    def schedule_agents(self):
+        """Patrols, caravans and emissaries each wake up at their own pace."""
+        for patrol in self.faction_patrols:
+            self.scheduler.every(PATROL_HOURS, self.move_patrol, patrol, name="patrol")
+        for merchant, guards in self.traveling_merchants:
+            self.scheduler.every(CARAVAN_HOURS, self._caravan_wake, merchant, guards, name="caravan")
+        for npc in self.faction_emissaries:
+            self.scheduler.every(EMISSARY_HOURS, self.move_emissary, npc, name="emissary")
+
+    def _caravan_wake(self, merchant, guards):
+        self.move_caravan(merchant, guards)
+        return self.entities.placed(merchant)
+
+    # ------------------------------------------------------------
+    # Fast Forward (coarse mode)
+    # ------------------------------------------------------------
+
+    def fast_forward(self, days: int):
+        """
+        Skip `days` whole days at a coarse level of detail and return a
+        war.FastForwardSummary. Fronts advance day by day on the territory
+        bitsets alone and rooms are updated once at the end. Clashes, camp
+        fights and interceptions depend only on where NPCs stand, which
+        doesn't change while time is skipped, so they are settled once.
+        Surviving emissaries add their morale for every day, and each
+        day's reinforcements go to garrisons in the final territory.
+        """
+        if days <= 0:
+            return None
+
+        with tracer.span("war.fast_forward", days=days):
+            summary = war.FastForwardSummary(self.day, days, self.faction_counts())
+            diff = self._war_diff = war.WarDiff(self.day + days)
+            strength = dict(self.faction_strength)
+
+            summary.patrol_clashes = self._resolve_patrol_clashes()
+            summary.camps_taken = self._resolve_camp_conflicts()
+            summary.emissaries_lost = self._resolve_emissary_actions()
+            for npc in self.faction_emissaries:
+                self.faction_strength[npc.faction] += days - 1
+
+            # Fronts: bitsets only, then one pass over the rooms that changed
+            with tracer.span("war.coarse_fronts", days=days):
+                masks = war.coarse_fronts(self.territories, FACTIONS, days)
+            changed = 0
+            for faction, mask in masks.items():
+                changed |= mask ^ self.territories.masks.get(faction, 0)
+
+            owners = {}
+            for faction, mask in masks.items():
+                for rid in iter_bits(mask & changed):
+                    owners[rid] = faction
+            for rid in iter_bits(changed):
+                self.set_control(rid, owners.get(rid))
+
+            self._mark_contested(diff)
+            self._war_diff = None
+            self.last_war_diff = diff
+
+            # 1–2 defenders per faction per day, as _faction_attempt_defend would
+            for faction in FACTIONS:
+                area = self.territories.area(faction)
+                if not area:
+                    continue
+                for _ in range(days):
+                    for n in random.sample(range(area), min(2, area)):
+                        self.garrisons.reinforce(self.territories.nth_room(faction, n), faction)
+                        summary.reinforcements[faction] += 1
+
+            self.day += days
+            self.weather = random.choice(WEATHERS)
+
+            # Nothing scheduled in the skipped span runs now
+            self.scheduler.skip(self.world_time)
+
+            summary.diff = diff
+            summary.areas_after = self.faction_counts()
+            summary.morale = Counter({
+                f: s - strength.get(f, 0) for f, s in self.faction_strength.items() if s != strength.get(f, 0)
+            })
+
+            tracer.info("war", "fast-forwarded", days=days, captured=len(diff.captured))
+            return summary
 
     # ============================================================
     # TIME + WEATHER
     # ============================================================
 
     def advance_time(self, hours: int):
-        self.time_of_day += hours
-        while self.time_of_day >= 24:
-            self.time_of_day -= 24
-            self.day += 1
+        target = self.world_time + hours
+        days = int(target // 24) + 1 - self.day
 
-            # Daily war simulation
-            self.simulate_faction_war()
+        if days > COARSE_AFTER_DAYS:
+            # Long waits are skipped statistically
+            self.time_of_day = target - (self.day + days - 1) * 24
+            self.fast_forward(days)
+        else:
+            # Whatever is due by then: war days at midnight, travelers...
+            self.scheduler.advance(target)
+            self.time_of_day = target - (self.day - 1) * 24
 
         # Temperature
         if 6 <= self.time_of_day <= 18:
@@ -832,38 +1276,190 @@ class World:
     def get_room(self, room_id: int) -> Room:
         return self.rooms[room_id]
 
+    def neighbors(self, room_id: int) -> tuple:
+        return self.grid.neighbors(room_id)
+
+    def random_neighbor(self, room_id: int):
+        """A random adjacent room id (None if the room has no exits)."""
+        return self.grid.random_neighbor(room_id)
+
+    def move_entity(self, entity, room_id: int):
+        """Relocate an NPC or animal; keeps room lists and entity.room_id in step."""
+        self.entities.move(entity, room_id)
+
+    def despawn(self, entity) -> bool:
+        """Take an NPC or animal out of the world."""
+        return self.entities.remove(entity)
+
+    def find_npc(self, npc_id: str):
+        """The NPC with this id, if its room is in memory."""
+        return self.entities.find_npc(npc_id)
+
+    def link_rooms(self, room_id: int, direction: str, target_id: int):
+        """Add a one-way exit that isn't part of the regular grid."""
+        self.grid.link(room_id, direction, target_id)
+        self.paths.invalidate()
+
+    # ============================================================
+    # GARRISONS
+    # ============================================================
+
+    def materialize_garrison(self, room_id: int) -> list:
+        """
+        Turn a room's garrison counters into Defender NPCs (the player has
+        arrived or is talking). Safe to call again; only new defenders spawn.
+        """
+        garrison = self.garrisons.take(room_id)
+        if not garrison:
+            return []
+
+        mustered = self._mustered.setdefault(room_id, [])
+        spawned = []
+        for faction, count in garrison.items():
+            for _ in range(count):
+                spawned.append(self._spawn_npc(
+                    npc_id=f"{faction}_defender_{room_id}_{len(mustered) + len(spawned)}",
+                    name=f"{faction} Defender",
+                    personality="serious",
+                    faction=faction,
+                    room_id=room_id,
+                ))
+        mustered.extend(spawned)
+        return spawned
+
+    def fold_garrison(self, room_id: int):
+        """The player left: surviving Defender NPCs go back into the counters."""
+        for npc in self._mustered.pop(room_id, ()):
+            if self.entities.room_of(npc) == room_id:
+                self.entities.remove(npc)
+                self.garrisons.reinforce(room_id, npc.faction)
+
+    # ============================================================
+    # FACTION CONTROL
+    # ============================================================
+
+    def set_control(self, room_id: int, faction: str | None):
+        """
+        Single writer for room ownership: keeps the room, the faction
+        territories and the minimap cache in step. Returns the previous owner.
+        A chunked world keeps ownership in the territories alone until the
+        room is built, so the war doesn't load chunks.
+        """
+        room = self._resident_room(room_id)
+        previous = room.faction_control if room is not None else self.territories.owner(room_id)
+        if previous == faction:
+            return previous
+
+        if room is not None:
+            room.faction_control = faction
+        if previous:
+            self.territories.discard(previous, room_id)
+        if faction:
+            self.territories.add(faction, room_id)
+        if self._war_diff is not None:
+            self._war_diff.record(room_id, previous, faction)
+
+        self._invalidate_glyph(room_id)
+        return previous
+
+    # ============================================================
+    # WORLD-WIDE QUERIES
+    # ============================================================
+
+    def faction_counts(self) -> dict:
+        """Number of rooms each faction controls (kept up to date by set_control)."""
+        # Territories mirror faction_control, even for rooms not in memory
+        return self.territories.counts()
+
+    def rooms_with_tag(self, tag: str) -> list:
+        return sorted(self.tag_index.get(tag, ()))
+
+    def room_has_tag(self, room_id: int, tag: str) -> bool:
+        return room_id in self.tag_index.get(tag, ())
+
+    # ============================================================
+    # INDEXES (BIOME + TAG)
+    # ============================================================
+
+    def _index_room(self, room):
+        self.biome_index.setdefault(room.biome, set()).add(room.id)
+        for tag in room.tags:
+            self.tag_index.setdefault(tag, set()).add(room.id)
+
+    def add_tag(self, room_id: int, tag: str):
+        self.rooms[room_id].tags.add(tag)
+        self.tag_index.setdefault(tag, set()).add(room_id)
+        self._invalidate_glyph(room_id)
+
+    def remove_tag(self, room_id: int, tag: str):
+        self.rooms[room_id].tags.discard(tag)
+        self.tag_index.get(tag, set()).discard(room_id)
+        self._invalidate_glyph(room_id)
+
+    def set_biome(self, room_id: int, biome: str):
+        room = self.rooms[room_id]
+        self.biome_index[room.biome].discard(room_id)
+        room.biome = biome
+        self.biome_index.setdefault(biome, set()).add(room_id)
+        self.paths.invalidate()
+
     # ============================================================
     # ASCII MINIMAP
     # ============================================================
 
-    def ascii_minimap(self, player_room_id: int) -> str:
-        width = self.size
-        height = self.size
+    def _invalidate_glyph(self, room_id: int):
+        self._glyphs[room_id] = 0
+
+    def _room_glyph(self, room) -> str:
+        if "miniboss" in room.tags:
+            return "M"
+        if "treasure" in room.tags:
+            return "T"
+        if "shrine" in room.tags:
+            return "S"
+        if "camp" in room.tags:
+            return "C"
+        if "den" in room.tags:
+            return "D"
+        if room.faction_control:
+            # First letter of faction
+            return room.faction_control[0]
+        return "."
+
+    def ascii_minimap(self, player_room_id: int, radius: int | None = None) -> str:
+        """
+        Map centered on the player, `radius` rooms in every direction
+        (the whole map when radius is None). Glyphs are cached and only
+        redrawn for rooms whose tags or faction control changed.
+        """
+        size = self.size
+        py, px = divmod(player_room_id, size)
+
+        if radius is None:
+            x0, y0, x1, y1 = 0, 0, size - 1, size - 1
+        else:
+            x0, x1 = max(0, px - radius), min(size - 1, px + radius)
+            y0, y1 = max(0, py - radius), min(size - 1, py + radius)
+
+        glyphs = self._glyphs
         lines = []
 
-        for y in range(height):
+        for y in range(y0, y1 + 1):
             row = []
-            for x in range(width):
-                rid = y * width + x
-                room = self.rooms[rid]
-
+            for rid in range(y * size + x0, y * size + x1 + 1):
                 if rid == player_room_id:
                     row.append("P")
-                elif "miniboss" in room.tags:
-                    row.append("M")
-                elif "treasure" in room.tags:
-                    row.append("T")
-                elif "shrine" in room.tags:
-                    row.append("S")
-                elif "camp" in room.tags:
-                    row.append("C")
-                elif "den" in room.tags:
-                    row.append("D")
-                elif room.faction_control:
-                    # First letter of faction
-                    row.append(room.faction_control[0])
-                else:
-                    row.append(".")
+                    continue
+
+                glyph = glyphs[rid]
+                if not glyph:
+                    # Chunks that were never in memory stay unexplored
+                    if self.chunked and not self.rooms.is_resident(rid):
+                        row.append(" ")
+                        continue
+                    glyph = glyphs[rid] = ord(self._room_glyph(self.rooms[rid]))
+
+                row.append(chr(glyph))
 
             lines.append("".join(row))
 
@@ -1,18 +1,25 @@
-from ui.text_effects import type_text, dramatic, banner, reveal, clear_screen, pause
+from ui.text_effects import ask, type_text, dramatic, banner, reveal, clear_screen, pause
 from ui.text_randomizer import rt, TEXT_VARIANTS
+from ui import text_effects
 from core.world import World
 from core.player import Player
 from systems.survival import apply_biome_effects, update_survival
 from systems.encounters import auto_encounter
-from systems.world_events import (
-    move_wandering_entities,
-    herd_behavior,
-    predator_hunting,
-    random_world_event,
-)
+from systems.world_events import random_world_event
+from systems.lod import LodSimulation, LOD_HOURS
+from systems.shards import ShardedTick
+from systems.background import BackgroundTicker
 from systems.combat import start_combat
 from systems.dialogue import talk_to_npc  # NEW: high-level NPC talk entry
-import random
+from core.trace import tracer
+from core.replay import replay_log
+from core.profiler import Profiler
+import os
+import sys
+
+
+# Rooms shown around the player on the minimap
+MINIMAP_RADIUS = 7
 
 
 # ---------------------------------------------------------
@@ -143,7 +150,6 @@ def mount_animal(player, world, name):
 # ---------------------------------------------------------
 def move_followers(world, player, old_room_id, new_room_id):
     old_room = world.get_room(old_room_id)
-    new_room = world.get_room(new_room_id)
 
     moving = []
     for npc in list(old_room.npcs):
@@ -151,16 +157,22 @@ def move_followers(world, player, old_room_id, new_room_id):
             moving.append(npc)
 
     for npc in moving:
-        old_room.npcs.remove(npc)
-        npc.room_id = new_room_id
-        new_room.npcs.append(npc)
+        world.move_entity(npc, new_room_id)
         dramatic(f"{npc.name} follows you.")
 
 
 # ---------------------------------------------------------
 # MOVEMENT + WORLD TICK
 # ---------------------------------------------------------
-def handle_move(direction, world, player):
+def tick_world(world, player):
+    """Everything scheduled during one move (runs on the ticker's thread)."""
+    # Scheduled jobs that fall due during the move run here: the LOD
+    # tick around the player, patrols, caravans, emissaries, the war
+    with tracer.span("tick.world", room=player.room_id):
+        world.advance_time(0.5 if player.mount else 1)
+
+
+def handle_move(direction, world, player, ticker):
     room = world.get_room(player.room_id)
 
     if direction not in room.exits:
@@ -168,15 +180,32 @@ def handle_move(direction, world, player):
         return
 
     old_room_id = player.room_id
+    world.fold_garrison(old_room_id)
     player.room_id = room.exits[direction]
-    world.advance_time(1)
 
-    # Mounted bonus
+    # Mounted bonus: half the travel time
     if player.mount:
-        world.advance_time(-0.5)
         player.fatigue = max(0, player.fatigue - 1)
 
+    # Chunked worlds: keep the area around the player loaded
+    world.update_residency(player.room_id)
+
     new_room = world.get_room(player.room_id)
+    enter_text = rt("enter_room", name=new_room.name)
+
+    # --- WORLD SIMULATION TICK ---
+    # Runs in the background while the room name is typed out; nothing
+    # below reads the world or draws random numbers until it is joined
+    tracer.begin_tick()
+    replay_log.tick()
+    ticker.start(tick_world, world, player)
+
+    clear_screen()
+    dramatic(enter_text)
+    ticker.join()
+
+    # Defenders stationed here show up as NPCs
+    world.materialize_garrison(player.room_id)
 
     # Move followers with player
     move_followers(world, player, old_room_id, player.room_id)
@@ -184,15 +213,9 @@ def handle_move(direction, world, player):
     biome_msg = apply_biome_effects(player, world, new_room)
     status, warning = update_survival(player, world)
 
-    # --- WORLD SIMULATION TICK ---
-    move_wandering_entities(world)
-    herd_behavior(world)
-    predator_hunting(world)
-    event_msg = random_world_event(world, player)
-
-    clear_screen()
+    with tracer.span("tick.events"):
+        event_msg = random_world_event(world, player)
 
-    dramatic(rt("enter_room", name=new_room.name))
     describe_room(world, player)
 
     if biome_msg:
@@ -205,149 +228,243 @@ def handle_move(direction, world, player):
         dramatic(event_msg)
 
     # Auto encounter
-    result = auto_encounter(player, world)
+    with tracer.span("encounter"):
+        result = auto_encounter(player, world)
     if isinstance(result, str):
         dramatic(result)
 
 
+# ---------------------------------------------------------
+# WORLD SETUP
+# ---------------------------------------------------------
+def build_world(snapshot_path=None):
+    """
+    Load the world from a snapshot if one exists; otherwise generate it
+    (and save it to snapshot_path so the next start is instant).
+    """
+    from core.snapshot import load_world, save_world
+
+    if snapshot_path and os.path.exists(snapshot_path):
+        return load_world(snapshot_path)
+
+    world = World(size=10)
+    world.generate()
+    world.populate_world()
+
+    if snapshot_path:
+        save_world(world, snapshot_path)
+    return world
+
+
 # ---------------------------------------------------------
 # MAIN LOOP
 # ---------------------------------------------------------
 def main():
+    # Optional: python main.py <snapshot file>
+    snapshot_path = sys.argv[1] if len(sys.argv) > 1 else None
+
+    # MYTH_TRACE / MYTH_TRACE_FILE (see core.trace)
+    tracer.configure_from_env()
+    # MYTH_REPLAY=session.jsonl records the session (see core.replay)
+    replay_log.configure_from_env(snapshot=snapshot_path)
+    # Tick stage latencies for `stats`; MYTH_PROFILE_FILE dumps them on quit
+    tracer.profiler = Profiler()
+    tracer.profiler.configure_from_env()
+
+    run_game(snapshot_path)
+
+
+def start_session(world, player):
+    """Start simulating around the player; returns (sim, ticker) for handle_command."""
+    world.materialize_garrison(player.room_id)
+    # Herds, predators and wanderers tick on world time: in detail near
+    # the player, or everywhere across worker processes with MYTH_SHARDS=<n>
+    shards = int(os.environ.get("MYTH_SHARDS") or 0)
+    sim = ShardedTick(world, shards_per_side=shards) if shards > 1 else LodSimulation(world)
+    world.scheduler.every(LOD_HOURS, lambda: sim.step(player.room_id), name="lod")
+    # Move ticks overlap the typewriter output (synchronous when headless)
+    ticker = BackgroundTicker(background=not text_effects.HEADLESS)
+    return sim, ticker
+
+
+def end_session(world, player, sim, ticker):
+    if isinstance(sim, ShardedTick):
+        sim.close()
+    ticker.close()
+    replay_log.finish(world, player)
+    if tracer.profiler is not None:
+        tracer.profiler.dump()
+
+
+def handle_command(cmd, world, player, ticker) -> bool:
+    """Run one typed command; False once the player quits."""
+    # Movement
+    if cmd in ["n", "north"]:
+        handle_move("north", world, player, ticker)
+    elif cmd in ["s", "south"]:
+        handle_move("south", world, player, ticker)
+    elif cmd in ["e", "east"]:
+        handle_move("east", world, player, ticker)
+    elif cmd in ["w", "west"]:
+        handle_move("west", world, player, ticker)
+
+    # Look
+    elif cmd == "look":
+        describe_room(world, player)
+
+    # Map
+    elif cmd == "map":
+        type_text("\nMinimap:")
+        for line in world.ascii_minimap(player.room_id, MINIMAP_RADIUS).split("\n"):
+            type_text(line, 0.001)
+        areas = [f"{f} {n}" for f, n in world.faction_counts().items() if n]
+        type_text("Territory: " + ", ".join(areas))
+
+    # Quest log
+    elif cmd == "quests":
+        from systems.quests import check_quest_completion
+        check_quest_completion(player, world)
+        log = player.quest_log()
+        type_text("\nQuests:")
+        for line in log.split("\n"):
+            type_text(line)
+
+    # TALK TO NPCs
+    elif cmd == "talk":
+        world.materialize_garrison(player.room_id)
+        room = world.get_room(player.room_id)
+
+        if not room.npcs:
+            dramatic("There is no one here to talk to.")
+            return True
+
+        # Choose NPC if multiple
+        if len(room.npcs) > 1:
+            type_text("Who do you want to talk to?")
+            for i, npc in enumerate(room.npcs, 1):
+                type_text(f"{i}. {npc.name}")
+            choice = ask("> ").strip()
+            if not choice.isdigit() or not (1 <= int(choice) <= len(room.npcs)):
+                dramatic("You hesitate and say nothing.")
+                return True
+            npc = room.npcs[int(choice) - 1]
+        else:
+            npc = room.npcs[0]
+
+        # Cinematic first impression / description
+        dramatic(npc.describe())
+        dramatic(npc.greet())  # uses NPC's personality + role greetings
+
+        # Hostility-triggered combat
+        if npc.is_openly_hostile():
+            from actors.enemy import Enemy
+            dramatic(f"{npc.name} snarls and reaches for a weapon.")
+            enemy = Enemy(
+                id=f"{npc.id}_hostile",
+                name=npc.name,
+                tier=2,
+                biome=world.get_room(player.room_id).biome,
+                behavior="aggressive",
+                weaknesses=["cold"],
+                abilities=["strike", "heavy_strike"],
+            )
+            start_combat(player, enemy, world)
+            return True
+
+        # High-level dialogue: structured intro → AI free-text
+        talk_to_npc(npc, player, world)
+
+        # Quest turn-in
+        from systems.quests import turn_in_quest
+        quest = turn_in_quest(player, npc)
+        if quest:
+            dramatic(rt("quest_turned_in", quest=quest.description))
+            msgs = player.gain_xp(0)
+            for m in msgs:
+                dramatic(m)
+
+    # Animal commands
+    elif cmd.startswith("feed "):
+        target = cmd.replace("feed ", "").strip()
+        dramatic(feed_animal(player, world, target))
+
+    elif cmd.startswith("tame "):
+        target = cmd.replace("tame ", "").strip()
+        dramatic(tame_animal(player, world, target))
+
+    elif cmd.startswith("mount "):
+        target = cmd.replace("mount ", "").strip()
+        dramatic(mount_animal(player, world, target))
+
+    # Rest
+    elif cmd == "rest":
+        dramatic(rt("rest"))
+        pause(1.0)
+        player.fatigue = max(0, player.fatigue - 20)
+        player.hp = min(player.max_hp, player.hp + 10)
+        tracer.begin_tick()
+        replay_log.tick()
+        world.advance_time(6)
+        type_text(rt("rest_recover"))
+
+    # Wait several days (coarse simulation)
+    elif cmd.startswith("wait "):
+        arg = cmd.replace("wait ", "").strip()
+        if not arg.isdigit() or int(arg) < 1:
+            dramatic(rt("warning"))
+            return True
+        tracer.begin_tick()
+        replay_log.tick()
+        summary = world.fast_forward(int(arg))
+        for line in summary.lines():
+            type_text(line)
+
+    # Tick stage latencies (core.profiler)
+    elif cmd == "stats":
+        if tracer.profiler is None:
+            type_text("Profiling is off.")
+            return True
+        for line in tracer.profiler.lines():
+            type_text(line, 0.001)
+
+    # Quit
+    elif cmd == "quit":
+        dramatic(rt("quit"))
+        return False
+
+    # Unknown command
+    else:
+        dramatic(rt("warning"))
+
+    return True
+
+
+def run_game(snapshot_path=None):
+    """The game loop; benchmarks.replay runs it headless from a replay log."""
     clear_screen()
     dramatic(rt("start_message"))
     pause(0.5)
     banner("Text RPG")
 
-    name = input("Enter your name: ").strip() or "Wanderer"
-    world = World(size=10)
-    world.generate()
-    world.populate_world()
+    name = ask("Enter your name: ").strip() or "Wanderer"
+    world = build_world(snapshot_path)
 
     player = Player(name, world.start_room_id)
     player.mount = None
+    sim, ticker = start_session(world, player)
 
     clear_screen()
     describe_room(world, player)
 
     while True:
         type_text(
-            "\nCommands: n/s/e/w, look, map, talk, quests, feed <animal>, tame <animal>, mount <animal>, rest, quit"
+            "\nCommands: n/s/e/w, look, map, talk, quests, feed <animal>, tame <animal>, mount <animal>, rest, wait <days>, stats, quit"
         )
-        cmd = input("> ").strip().lower()
-
-        # Movement
-        if cmd in ["n", "north"]:
-            handle_move("north", world, player)
-        elif cmd in ["s", "south"]:
-            handle_move("south", world, player)
-        elif cmd in ["e", "east"]:
-            handle_move("east", world, player)
-        elif cmd in ["w", "west"]:
-            handle_move("west", world, player)
-
-        # Look
-        elif cmd == "look":
-            describe_room(world, player)
-
-        # Map
-        elif cmd == "map":
-            type_text("\nMinimap:")
-            for line in world.ascii_minimap(player.room_id).split("\n"):
-                type_text(line, 0.001)
-
-        # Quest log
-        elif cmd == "quests":
-            from systems.quests import check_quest_completion
-            check_quest_completion(player, world)
-            log = player.quest_log()
-            type_text("\nQuests:")
-            for line in log.split("\n"):
-                type_text(line)
-
-        # TALK TO NPCs
-        elif cmd == "talk":
-            room = world.get_room(player.room_id)
-
-            if not room.npcs:
-                dramatic("There is no one here to talk to.")
-                continue
-
-            # Choose NPC if multiple
-            if len(room.npcs) > 1:
-                type_text("Who do you want to talk to?")
-                for i, npc in enumerate(room.npcs, 1):
-                    type_text(f"{i}. {npc.name}")
-                choice = input("> ").strip()
-                if not choice.isdigit() or not (1 <= int(choice) <= len(room.npcs)):
-                    dramatic("You hesitate and say nothing.")
-                    continue
-                npc = room.npcs[int(choice) - 1]
-            else:
-                npc = room.npcs[0]
-
-            # Cinematic first impression / description
-            dramatic(npc.describe())
-            dramatic(npc.greet())  # uses NPC's personality + role greetings
-
-            # Hostility-triggered combat
-            if npc.is_openly_hostile():
-                from actors.enemy import Enemy
-                dramatic(f"{npc.name} snarls and reaches for a weapon.")
-                enemy = Enemy(
-                    id=f"{npc.id}_hostile",
-                    name=npc.name,
-                    tier=2,
-                    biome=world.get_room(player.room_id).biome,
-                    behavior="aggressive",
-                    weaknesses=["cold"],
-                    abilities=["strike", "heavy_strike"],
-                )
-                start_combat(player, enemy, world)
-                continue
-
-            # High-level dialogue: structured intro → AI free-text
-            talk_to_npc(npc, player, world)
-
-            # Quest turn-in
-            from systems.quests import turn_in_quest
-            quest = turn_in_quest(player, npc)
-            if quest:
-                dramatic(rt("quest_turned_in", quest=quest.description))
-                msgs = player.gain_xp(0)
-                for m in msgs:
-                    dramatic(m)
-
-        # Animal commands
-        elif cmd.startswith("feed "):
-            target = cmd.replace("feed ", "").strip()
-            dramatic(feed_animal(player, world, target))
-
-        elif cmd.startswith("tame "):
-            target = cmd.replace("tame ", "").strip()
-            dramatic(tame_animal(player, world, target))
-
-        elif cmd.startswith("mount "):
-            target = cmd.replace("mount ", "").strip()
-            dramatic(mount_animal(player, world, target))
-
-        # Rest
-        elif cmd == "rest":
-            dramatic(rt("rest"))
-            pause(1.0)
-            player.fatigue = max(0, player.fatigue - 20)
-            player.hp = min(player.max_hp, player.hp + 10)
-            world.advance_time(6)
-            type_text(rt("rest_recover"))
-
-        # Quit
-        elif cmd == "quit":
-            dramatic(rt("quit"))
+        cmd = ask("> ").strip().lower()
+        if not handle_command(cmd, world, player, ticker):
             break
 
-        # Unknown command
-        else:
-            dramatic(rt("warning"))
+    end_session(world, player, sim, ticker)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+"""
+World ticks on a background thread.
+
+handle_move starts the tick for a move here and types out the "you
+enter ..." line while it runs. The typewriter effect spends nearly all
+its time in time.sleep, which releases the GIL, so the tick is mostly
+hidden behind the text. That line is the only thing that overlaps the
+tick: everything that reads the state of the room (garrisons, followers,
+describe_room, events, encounters) comes after join(), and no other
+command starts a tick here.
+
+Two rules keep the output correct and replays (core.replay) exact:
+
+  - between start() and join() the main thread doesn't touch the world;
+  - it doesn't draw from `random` either: text is picked with rt()
+    before the tick starts, and is only printed while it runs.
+
+With guard=True (the default unless Python runs with -O) both rules are
+checked: from start() until join() returns, calling a public method of
+the tick's arguments (the world, the player) or a `random` function from
+the thread that started the tick raises TickOverlapError. The tick's own
+thread passes through, at the cost of one wrapper call per use.
+
+Errors raised by the tick surface at join(). With background=False the
+tick simply runs inside start() (headless runs have no text to overlap).
+"""
+
+import functools
+import inspect
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TickOverlapError(AssertionError):
+    """The thread that started a tick touched its state before join()."""
+
+
+class BackgroundTicker:
+    def __init__(self, background=True, guard=__debug__):
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="world-tick") if background else None
+        self._pending = None
+        self.guard = guard
+        self._armed = []    # (owner, name, original) to put back at join()
+
+    def start(self, fn, *args):
+        """Run fn(*args) as the next tick; the previous one is joined first."""
+        self.join()
+        if self._pool is None:
+            fn(*args)
+            return
+
+        if self.guard:
+            self._arm(args)
+        self._pending = self._pool.submit(fn, *args)
+
+    def join(self):
+        """Wait for the tick in flight (if any) and re-raise its error."""
+        pending, self._pending = self._pending, None
+        try:
+            if pending is not None:
+                return pending.result()
+        finally:
+            self._disarm()
+
+    def close(self):
+        self.join()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # ------------------------------------------------------------
+    # Guard
+    # ------------------------------------------------------------
+
+    def _arm(self, targets):
+        """Wrap the targets' public methods and the `random` functions for the tick."""
+        caller = threading.get_ident()
+
+        def tripwire(label, fn):
+            @functools.wraps(fn)
+            def guarded(*args, **kwargs):
+                if threading.get_ident() == caller:
+                    raise TickOverlapError(f"{label}() called while a world tick is running; join() it first")
+                return fn(*args, **kwargs)
+            return guarded
+
+        for name, fn in vars(random).items():
+            if isinstance(getattr(fn, "__self__", None), random.Random):
+                self._armed.append((random, name, fn))
+                setattr(random, name, tripwire(f"random.{name}", fn))
+
+        for target in targets:
+            if not hasattr(target, "__dict__"):
+                continue
+            cls = type(target)
+            for name, _ in inspect.getmembers(cls, inspect.isfunction):
+                if name.startswith("_") or name in vars(target):
+                    continue
+                self._armed.append((target, name, None))
+                setattr(target, name, tripwire(f"{cls.__name__}.{name}", getattr(target, name)))
+
+    def _disarm(self):
+        for owner, name, original in reversed(self._armed):
+            if original is None:
+                delattr(owner, name)    # uncovers the class's method again
+            else:
+                setattr(owner, name, original)
+        self._armed = []
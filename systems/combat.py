@@ -1,5 +1,5 @@
 import random
-from ui.text_effects import type_text, dramatic, pause
+from ui.text_effects import ask, type_text, dramatic, pause
 from ui.text_randomizer import rt
 
 
@@ -137,7 +137,7 @@ def player_turn(player, enemy):
             pause(0.2)
 
     type_text(rt("combat_player_choice"))
-    choice = input("> ").strip().lower()
+    choice = ask("> ").strip().lower()
 
     if choice in ["1", "a", "attack"]:
         dmg, crit, blocked, dodged = calculate_damage(player, enemy)
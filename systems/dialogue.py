@@ -1,7 +1,7 @@
 from typing import Dict
 from actors.npc import NPC
 from ui.text_randomizer import rt
-from ui.text_effects import type_text, dramatic, pause
+from ui.text_effects import ask, type_text, dramatic, pause
 
 
 # ============================================================
@@ -225,7 +225,7 @@ def render_choices(node: dict):
     for i, choice_key in enumerate(keys, 1):
         type_text(f"{i}. {rt(choice_key)}")
 
-    raw = input("> ").strip()
+    raw = ask("> ").strip()
     if raw.isdigit():
         idx = int(raw) - 1
         if 0 <= idx < len(keys):
@@ -315,7 +315,7 @@ def enter_ai_conversation(npc: NPC, player, world=None):
     dramatic(f"{npc.name} watches you closely. 'Speak freely now.'")
 
     while True:
-        text = input("You: ").strip()
+        text = ask("You: ").strip()
         if not text:
             dramatic("You say nothing.")
             continue
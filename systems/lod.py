@@ -0,0 +1,213 @@
+"""
+Level-of-detail simulation around the player.
+
+The map is split into regions (one per chunk). Every player step:
+
+  - regions within `radius` of the player's get the full per-entity tick
+    (move_wandering_entities, then herds and predators through the
+    double-buffered TickEngine), limited to their rooms;
+  - a few distant regions, round robin, are caught up statistically:
+    every herd in them jumps to where a random walk of the elapsed ticks
+    would have taken it, in one move;
+  - regions coming into view are caught up first, so the handoff to the
+    full tick starts from an up-to-date state.
+
+Each region remembers the tick its movers are simulated up to, and
+movers that cross into a region on a different tick carry their own, so
+nothing is moved twice or skipped. Per-step work is bounded by the radius
+and the round-robin rate times the animals in a region, so it levels off
+as the world grows, but isn't flat: the longer a distant region waits for
+its turn, the more of its herds have moved by then.
+
+In a chunked world a catch-up never moves a herd into a chunk that isn't
+resident; the herd stays put instead.
+
+Wandering NPCs (world.wandering_npcs) only move on the full tick; the
+world doesn't spawn any at the moment.
+
+Patrols, caravans and emissaries are few and move on their own
+schedules (World.schedule_agents), so they are not part of the LOD.
+"""
+
+import random
+
+from core.chunks import chunk_room_ids, chunks_per_side
+from core.trace import tracer
+from systems.tick import TickEngine
+from systems.world_events import move_wandering_entities
+
+# Regions (chunks) around the player's that get the full tick
+LOD_RADIUS = 1
+
+# World hours between LOD ticks (see World.scheduler)
+LOD_HOURS = 1
+
+# Distant regions caught up per player step
+DISTANT_PER_TICK = 4
+
+# Catch-ups up to this many ticks are replayed step by step
+EXACT_STEPS = 4
+
+# Carried tick stamps kept before despawned movers are pruned (grows as needed)
+_CARRIED_LIMIT = 4096
+
+
+class LodSimulation:
+    def __init__(self, world, radius=LOD_RADIUS, distant_per_tick=DISTANT_PER_TICK, rng=random):
+        self.world = world
+        self.radius = radius
+        self.distant_per_tick = distant_per_tick
+        self.rng = rng
+
+        self.tick = 0
+        self._stamp = {}        # region -> tick its movers are simulated up to
+        self._carried = {}      # mover -> tick, when it differs from its region's
+        self._carried_limit = _CARRIED_LIMIT
+        self._active = set()    # regions on the full tick
+        self._cursor = 0        # round-robin position over distant regions
+        self._all_regions = None
+        self.engine = TickEngine(world)
+
+    # ------------------------------------------------------------
+    # Regions
+    # ------------------------------------------------------------
+
+    def region_of(self, room_id: int) -> tuple:
+        return self.world._chunk_of(room_id)
+
+    def active_regions(self, room_id: int) -> set:
+        cx, cy = self.region_of(room_id)
+        n = chunks_per_side(self.world.size, self.world.chunk_size)
+        r = self.radius
+        return {
+            (x, y)
+            for y in range(max(0, cy - r), min(n, cy + r + 1))
+            for x in range(max(0, cx - r), min(n, cx + r + 1))
+        }
+
+    def _region_rooms(self, region) -> list:
+        return chunk_room_ids(*region, self.world.size, self.world.chunk_size)
+
+    def _regions(self) -> list:
+        """Regions that can hold movers: resident chunks, or the whole map."""
+        if self.world.chunked:
+            return sorted(self.world.rooms.resident_chunks())
+        if self._all_regions is None:
+            self._all_regions = self.world._all_chunk_coords()
+        return self._all_regions
+
+    # ------------------------------------------------------------
+    # Tick
+    # ------------------------------------------------------------
+
+    def step(self, player_room_id: int):
+        """One world tick around the player."""
+        self.tick += 1
+        tick = self.tick
+        active = self.active_regions(player_room_id)
+
+        # Handoff: regions coming into view catch up to the previous tick
+        with tracer.span("lod.handoff"):
+            for region in sorted(active - self._active):
+                self._catch_up(region, tick - 1)
+        self._active = active
+
+        # Full detail near the player
+        with tracer.span("lod.full", regions=len(active)):
+            rooms = set()
+            for region in active:
+                rooms.update(self._region_rooms(region))
+
+            with tracer.span("tick.wander"):
+                moved = move_wandering_entities(self.world, rooms)
+            moved += self.engine.run(rooms)
+
+            for region in active:
+                self._stamp[region] = tick
+            for entity in moved:
+                if self.region_of(entity.room_id) not in active:
+                    self._carried[entity] = tick
+
+        # A few distant regions, round robin
+        with tracer.span("lod.distant"):
+            regions = self._regions()
+            done = 0
+            for _ in range(len(regions)):
+                if done >= self.distant_per_tick:
+                    break
+                self._cursor = (self._cursor + 1) % len(regions)
+                region = regions[self._cursor]
+                if region not in active:
+                    self._catch_up(region, tick)
+                    done += 1
+
+        if len(self._carried) > self._carried_limit:
+            self._carried = {
+                e: t for e, t in self._carried.items() if self.world.entities.room_of(e) is not None
+            }
+            self._carried_limit = max(_CARRIED_LIMIT, 2 * len(self._carried))
+
+    # ------------------------------------------------------------
+    # Statistical catch-up
+    # ------------------------------------------------------------
+
+    def _groups(self, region) -> list:
+        """Herds in a region (every room holding two or more animals), as lists that move together."""
+        entities = self.world.entities
+        groups = []
+        for rid in self._region_rooms(region):
+            animals = entities.animals_in(rid)
+            if len(animals) >= 2:
+                groups.append(list(animals))
+        return groups
+
+    def _catch_up(self, region, upto: int):
+        """Bring every mover in a region to tick `upto` in one jump each."""
+        world = self.world
+        since = self._stamp.get(region, 0)
+
+        for group in self._groups(region):
+            start = since
+            for entity in group:
+                start = min(start, self._carried.pop(entity, since))
+
+            dest = self._walk(group[0].room_id, upto - start)
+            if dest == group[0].room_id:
+                continue
+            if world.chunked and not world.rooms.is_resident(dest):
+                # Walking off into an unbuilt chunk would build it, and the
+                # next catch-up would spread from there to the whole map
+                continue
+
+            for entity in group:
+                world.move_entity(entity, dest)
+
+            # Landed in a region simulated up to a different tick
+            dest_region = self.region_of(dest)
+            if dest_region != region and self._stamp.get(dest_region, 0) != upto:
+                for entity in group:
+                    self._carried[entity] = upto
+
+        self._stamp[region] = upto
+
+    def _walk(self, room_id: int, steps: int) -> int:
+        """Where a random walk of `steps` grid moves from room_id ends up."""
+        world = self.world
+        if steps <= 0:
+            return room_id
+
+        if steps <= EXACT_STEPS:
+            for _ in range(steps):
+                nxt = world.random_neighbor(room_id)
+                if nxt is None:
+                    break
+                room_id = nxt
+            return room_id
+
+        # Net displacement of a long walk: roughly normal, variance steps/2 per axis
+        size = world.size
+        sigma = (steps / 2) ** 0.5
+        y, x = divmod(room_id, size)
+        x = min(size - 1, max(0, x + round(self.rng.gauss(0, sigma))))
+        y = min(size - 1, max(0, y + round(self.rng.gauss(0, sigma))))
+        return y * size + x
@@ -145,12 +145,13 @@ def generate_random_quest(world, player, npc):
 # ---------------------------------------------------------
 
 def pick_hostile_animal(world):
-    candidates = []
-    for room in world.rooms.values():
-        for a in room.animals:
-            if getattr(a, "hostile", False):
-                candidates.append(a.name)
-    return random.choice(candidates) if candidates else None
+    # Weighted by how many of each hostile animal roam the world
+    candidates = [(name, count) for (name, hostile), count in world.animal_census.items()
+                  if hostile and count > 0]
+    if not candidates:
+        return None
+    names, weights = zip(*candidates)
+    return random.choices(names, weights=weights)[0]
 
 
 # ---------------------------------------------------------
@@ -178,8 +179,7 @@ def check_quest_completion(player, world):
 
         # LOCATION QUEST
         elif quest.target_type == "location":
-            room = world.get_room(player.room_id)
-            if quest.target_name in room.tags:
+            if world.room_has_tag(player.room_id, quest.target_name):
                 quest.completed = True
 
         # ITEM QUEST (future expansion)
@@ -192,19 +192,12 @@ def check_quest_completion(player, world):
 # ---------------------------------------------------------
 
 def animal_exists(world, name):
-    for room in world.rooms.values():
-        for a in room.animals:
-            if a.name == name:
-                return True
-    return False
+    census = world.animal_census
+    return census[(name, True)] > 0 or census[(name, False)] > 0
 
 
 def npc_exists(world, name):
-    for room in world.rooms.values():
-        for n in room.npcs:
-            if n.name == name:
-                return True
-    return False
+    return world.entities.has_npc_named(name)
 
 
 # ---------------------------------------------------------
@@ -0,0 +1,410 @@
+"""
+Sharded world tick for very large maps.
+
+The map is cut into shards_per_side x shards_per_side rectangles of
+rooms. Every shard is a small stand-alone world (Shard) holding only the
+movers standing in it, as lightweight records, and runs the same tick as
+the main world on them: wandering NPCs, then herds and predators through
+the double-buffered TickEngine. Shards live in worker processes, except
+the one the player stands in, which runs in the main process so the
+entities around the player are always exact and a move never waits on
+a pipe for them.
+
+At the end of every tick each shard hands over the movers that crossed
+its border and reports the prey in its edge rooms. ShardedTick routes
+both: migrants join their new shard before its next tick, and every
+shard sees its neighbors' edge prey as read-only "ghost" counts, so a
+predator on a border hunts prey on the other side like anywhere else.
+
+The main World keeps the last known position of remote movers; they are
+synced when their shard becomes the player's (handoff) or on sync().
+Faction war, patrols, caravans and emissaries stay in the main process
+(see World.schedule_agents).
+"""
+
+import multiprocessing
+import os
+import random
+
+from core.entities import EntityIndex
+from core.territory import Territories
+from core.trace import tracer
+from systems.tick import TickEngine
+from systems.world_events import move_wandering_entities
+
+# Shards along each side of the map
+SHARDS_PER_SIDE = 2
+
+
+def split_shards(size: int, per_side: int) -> list:
+    """(x0, y0, x1, y1) room rectangles, end exclusive, in row-major order."""
+    per_side = max(1, min(per_side, size))
+    cuts = [size * i // per_side for i in range(per_side + 1)]
+    return [
+        (cuts[i], cuts[j], cuts[i + 1], cuts[j + 1])
+        for j in range(per_side)
+        for i in range(per_side)
+    ]
+
+
+# ============================================================
+# SHARD (one rectangle, runs in a worker or the main process)
+# ============================================================
+
+class Mover:
+    """What a shard needs to know about an NPC or animal."""
+
+    __slots__ = ("uid", "room_id", "is_animal", "hostile", "npc_id", "name")
+
+    def __init__(self, uid, room_id, is_animal, hostile):
+        self.uid = uid
+        self.room_id = room_id
+        self.is_animal = is_animal
+        self.hostile = hostile
+        self.npc_id = uid
+        self.name = ""
+
+    def __getstate__(self):
+        return self.uid, self.room_id, self.is_animal, self.hostile
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+
+class _RoomStub:
+    __slots__ = ("npcs", "animals")
+
+
+class _Rooms:
+    """Every room id exists; EntityIndex only attaches its views to them."""
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def __contains__(self, room_id) -> bool:
+        return 0 <= room_id < self.count
+
+    def __getitem__(self, room_id):
+        return _RoomStub()
+
+
+class Shard:
+    """
+    The slice of World the tick functions use (entities, grid, neighbors,
+    move_entity, ...), for the movers in one rectangle.
+    """
+
+    def __init__(self, index: int, rect: tuple, grid):
+        self.index = index
+        self.rect = rect
+        self.grid = grid
+        self.rooms = _Rooms(grid.count)
+        self.territories = Territories(grid)
+        self.entities = EntityIndex(self)
+        self.wandering_npcs = []
+        self.engine = TickEngine(self)
+        self._ghosts = ()
+        self._edge = self._edge_rooms()
+
+    def __getstate__(self):
+        state = (self.index, self.rect, self.grid)
+        movers = list(self.entities._where)
+        return state, movers
+
+    def __setstate__(self, data):
+        state, movers = data
+        self.__init__(*state)
+        self.receive(movers)
+
+    # ------------------------------------------------------------
+    # Geometry
+    # ------------------------------------------------------------
+
+    def owns(self, room_id: int) -> bool:
+        x0, y0, x1, y1 = self.rect
+        y, x = divmod(room_id, self.grid.size)
+        return x0 <= x < x1 and y0 <= y < y1
+
+    def _edge_rooms(self) -> list:
+        """Rooms with an exit out of the shard: the perimeter, plus link ends."""
+        x0, y0, x1, y1 = self.rect
+        size = self.grid.size
+        edge = set()
+        for x in range(x0, x1):
+            edge.add(y0 * size + x)
+            edge.add((y1 - 1) * size + x)
+        for y in range(y0, y1):
+            edge.add(y * size + x0)
+            edge.add(y * size + x1 - 1)
+
+        for rid, exits in self.grid.links.items():
+            for target in exits.values():
+                if self.owns(target) != self.owns(rid):
+                    edge.add(target if self.owns(target) else rid)
+        return sorted(rid for rid in edge if self.owns(rid))
+
+    # ------------------------------------------------------------
+    # The World interface used by systems.world_events
+    # ------------------------------------------------------------
+
+    def neighbors(self, room_id: int) -> tuple:
+        return self.grid.neighbors(room_id)
+
+    def random_neighbor(self, room_id: int):
+        return self.grid.random_neighbor(room_id)
+
+    def move_entity(self, entity, room_id: int):
+        self.entities.move(entity, room_id)
+
+    # ------------------------------------------------------------
+    # Tick
+    # ------------------------------------------------------------
+
+    def receive(self, movers):
+        """Take ownership of movers (initial load or migrants)."""
+        for mover in movers:
+            self.entities.add(mover, mover.room_id)
+            if not mover.is_animal:
+                self.wandering_npcs.append(mover)
+
+    def set_ghosts(self, ghosts: dict):
+        """Prey counts just across the border, as reported by the neighbors."""
+        prey = self.entities.prey
+        for rid in self._ghosts:
+            prey.pop(rid, None)
+        self._ghosts = [rid for rid in ghosts if not self.owns(rid)]
+        for rid in self._ghosts:
+            prey[rid] = ghosts[rid]
+
+    def tick(self) -> tuple:
+        """
+        One tick. Returns (moved, migrants, edge): movers that moved and
+        stayed, movers that left the shard, and {room_id: prey} for the
+        edge rooms after they left.
+        """
+        moved = move_wandering_entities(self)
+        moved += self.engine.run()
+
+        stayed, migrants = [], []
+        for mover in dict.fromkeys(moved):
+            (stayed if self.owns(mover.room_id) else migrants).append(mover)
+
+        # Moves into ghost rooms were counted on top of the ghosts; undo them
+        for mover in migrants:
+            self.entities.remove(mover)
+        if migrants:
+            leaving = set(migrants)
+            self.wandering_npcs = [npc for npc in self.wandering_npcs if npc not in leaving]
+
+        prey = self.entities.prey
+        edge = {rid: prey[rid] for rid in self._edge if rid in prey}
+        return stayed, migrants, edge
+
+    def positions(self) -> list:
+        return [(mover.uid, room_id) for mover, room_id in self.entities._where.items()]
+
+
+# ============================================================
+# WORKER PROCESS
+# ============================================================
+
+def _shard_worker(conn, seed):
+    """Serve shards over a pipe until told to stop."""
+    tracer.silence()
+    random.seed(seed)
+    shards = {}
+
+    while True:
+        command, payload = conn.recv()
+
+        if command == "load":
+            shards[payload.index] = payload
+            conn.send(None)
+
+        elif command == "take":
+            conn.send(shards.pop(payload))
+
+        elif command == "tick":
+            results = {}
+            for index, (migrants, ghosts) in payload.items():
+                shard = shards[index]
+                shard.receive(migrants)
+                shard.set_ghosts(ghosts)
+                _, leaving, edge = shard.tick()
+                results[index] = (leaving, edge)
+            conn.send(results)
+
+        elif command == "positions":
+            conn.send({index: shards[index].positions() for index in payload})
+
+        elif command == "stop":
+            conn.close()
+            return
+
+
+# ============================================================
+# SHARDED TICK (main process)
+# ============================================================
+
+class ShardedTick:
+    """
+    Drop-in for LodSimulation.step: step(player_room_id) ticks every
+    shard once. Call close() (or use it as a context manager) to stop the
+    workers.
+    """
+
+    def __init__(self, world, shards_per_side=SHARDS_PER_SIDE, workers=None):
+        if world.chunked:
+            raise ValueError("Sharded ticks need an eager world; chunked worlds evict their movers")
+
+        self.world = world
+        self.rects = split_shards(world.size, shards_per_side)
+        self.per_side = round(len(self.rects) ** 0.5)
+        self._cuts = [world.size * i // self.per_side for i in range(self.per_side + 1)]
+
+        self._entities = {}         # uid -> entity in the main world
+        self._inbox = {i: [] for i in range(len(self.rects))}
+        self._ghosts = {}           # room_id -> prey, from last tick's edge reports
+
+        shards = [Shard(i, rect, world.grid) for i, rect in enumerate(self.rects)]
+        for entity in self._movers():
+            uid = len(self._entities)
+            self._entities[uid] = entity
+            mover = Mover(uid, entity.room_id, getattr(entity, "is_animal", False), getattr(entity, "hostile", False))
+            shards[self.shard_of(entity.room_id)].receive([mover])
+
+        self.local = shards[self.shard_of(world.start_room_id or 0)]
+
+        # Remote shards round robin over the workers
+        workers = workers or min(os.cpu_count() or 1, max(1, len(shards) - 1))
+        ctx = multiprocessing.get_context()
+        self._pipes, self._procs, self._owner = [], [], {}
+        for w in range(workers):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_shard_worker, args=(child, f"{world.seed}:{w}"), daemon=True)
+            proc.start()
+            child.close()
+            self._pipes.append(parent)
+            self._procs.append(proc)
+
+        for shard in shards:
+            self._owner[shard.index] = self._pipes[shard.index % workers]
+            if shard is not self.local:
+                self._call(self._owner[shard.index], "load", shard)
+
+    def _movers(self):
+        world = self.world
+        for npc in world.wandering_npcs:
+            if world.entities.placed(npc):
+                yield npc
+        for _, animals in list(world.entities.animal_rooms()):
+            yield from animals
+
+    @staticmethod
+    def _call(pipe, command, payload=None):
+        pipe.send((command, payload))
+        return pipe.recv()
+
+    def shard_of(self, room_id: int) -> int:
+        y, x = divmod(room_id, self.world.size)
+        cuts = self._cuts
+        i = next(i for i in range(self.per_side) if x < cuts[i + 1])
+        j = next(j for j in range(self.per_side) if y < cuts[j + 1])
+        return j * self.per_side + i
+
+    # ------------------------------------------------------------
+    # Tick
+    # ------------------------------------------------------------
+
+    def step(self, player_room_id: int):
+        """One world tick on every shard, the player's in this process."""
+        index = self.shard_of(player_room_id)
+        if index != self.local.index:
+            with tracer.span("shards.handoff", shard=index):
+                self._handoff(index)
+
+        ghosts = self._ghosts
+
+        # Remote shards first so they run while the local one does
+        with tracer.span("shards.tick", shards=len(self.rects)):
+            batches = {}
+            for i in range(len(self.rects)):
+                if i != self.local.index:
+                    batches.setdefault(self._owner[i], {})[i] = (self._take_inbox(i), ghosts)
+            for pipe, batch in batches.items():
+                pipe.send(("tick", batch))
+
+            local = self.local
+            arrived = self._take_inbox(local.index)
+            local.receive(arrived)
+            local.set_ghosts(ghosts)
+            stayed, leaving, edge = local.tick()
+
+            results = {local.index: (leaving, edge)}
+            for pipe in batches:
+                results.update(pipe.recv())
+
+        # Keep the main world exact around the player
+        with tracer.span("shards.apply"):
+            for mover in arrived + stayed + leaving:
+                self._place(mover.uid, mover.room_id)
+
+            self._ghosts = {}
+            for index, (migrants, edge) in results.items():
+                self._ghosts.update(edge)
+                for mover in migrants:
+                    self._inbox[self.shard_of(mover.room_id)].append(mover)
+                    if mover.is_animal and not mover.hostile:
+                        self._ghosts[mover.room_id] = self._ghosts.get(mover.room_id, 0) + 1
+
+    def _take_inbox(self, index: int) -> list:
+        migrants = self._inbox[index]
+        self._inbox[index] = []
+        return migrants
+
+    def _place(self, uid: int, room_id: int):
+        entity = self._entities[uid]
+        world = self.world
+        if world.entities.room_of(entity) not in (None, room_id):
+            world.move_entity(entity, room_id)
+
+    def _handoff(self, index: int):
+        """The player crossed into another shard: swap which one runs here."""
+        old = self.local
+        self._call(self._owner[old.index], "load", old)
+        self.local = self._call(self._owner[index], "take", index)
+
+        for uid, room_id in self.local.positions():
+            self._place(uid, room_id)
+
+    def sync(self):
+        """Bring every remote mover's position into the main world."""
+        batches = {}
+        for i in range(len(self.rects)):
+            if i != self.local.index:
+                batches.setdefault(self._owner[i], []).append(i)
+        for pipe, indexes in batches.items():
+            for positions in self._call(pipe, "positions", indexes).values():
+                for uid, room_id in positions:
+                    self._place(uid, room_id)
+
+    # ------------------------------------------------------------
+    # Shutdown
+    # ------------------------------------------------------------
+
+    def close(self):
+        for pipe, proc in zip(self._pipes, self._procs):
+            try:
+                pipe.send(("stop", None))
+                pipe.close()
+            except OSError:
+                pass
+            proc.join(timeout=1)
+        self._pipes, self._procs = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
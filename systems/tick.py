@@ -0,0 +1,45 @@
+"""
+Double-buffered world tick.
+
+Every planner looks at the world as it stood when the tick began and
+records the moves it wants in one {entity: room_id} buffer; nothing
+moves until all planners are done, and then every move is committed in
+one pass. A herd that walks into a room later in the iteration order is
+therefore not moved again in the same tick, results don't depend on
+that order, and the work is proportional to the occupied rooms instead
+of rooms × moves.
+
+Planners run in order and the first one to claim an entity wins, so a
+predator in a herd travels with the herd.
+"""
+
+from core.trace import tracer
+from systems.world_events import commit_moves, occupied_rooms, plan_herds, plan_predators
+
+# Default planners, in priority order
+PLANNERS = (plan_herds, plan_predators)
+
+
+class TickEngine:
+    def __init__(self, world, planners=PLANNERS):
+        self.world = world
+        self.planners = planners
+
+    def plan(self, room_ids=None) -> dict:
+        """Intended moves for one tick; the world is not changed."""
+        occupied = occupied_rooms(self.world, room_ids)
+        moves = {}
+        for planner in self.planners:
+            with tracer.span(f"tick.{planner.__name__}"):
+                planner(self.world, occupied, moves)
+        return moves
+
+    def commit(self, moves: dict) -> list:
+        return commit_moves(self.world, moves)
+
+    def run(self, room_ids=None) -> list:
+        """Plan then commit one tick; returns the entities that moved."""
+        with tracer.span("tick.plan"):
+            moves = self.plan(room_ids)
+        with tracer.span("tick.commit", moves=len(moves)):
+            return self.commit(moves)
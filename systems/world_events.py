@@ -8,110 +8,123 @@ from ui.text_randomizer import rt
 
 def _move_entity_between_rooms(world, entity):
     if not hasattr(entity, "room_id"):
-        return
+        return False
 
-    room = world.get_room(entity.room_id)
-    exits = list(room.exits.values())
-    if not exits:
-        return
+    new_room_id = world.random_neighbor(entity.room_id)
+    if new_room_id is None:
+        return False
 
-    new_room_id = random.choice(exits)
-    new_room = world.get_room(new_room_id)
+    world.move_entity(entity, new_room_id)
+    return True
 
-    # Remove from old room
-    if entity in room.npcs:
-        room.npcs.remove(entity)
 
-    # Add to new room
-    entity.room_id = new_room_id
-    new_room.npcs.append(entity)
+def _in_rooms(entity, room_ids) -> bool:
+    return room_ids is None or entity.room_id in room_ids
 
 
 # ---------------------------------------------------------
 # WANDERING ENTITIES
 # ---------------------------------------------------------
 
-def move_wandering_entities(world):
-    # Wandering NPCs
+def move_wandering_entities(world, room_ids=None):
+    """
+    Step wandering NPCs. With room_ids, only those standing in these rooms
+    move. Returns the entities that moved. Patrols, caravans and
+    emissaries travel on their own schedules (World.schedule_agents).
+    """
+    moved = []
     for npc in getattr(world, "wandering_npcs", []):
-        _move_entity_between_rooms(world, npc)
+        if _in_rooms(npc, room_ids) and _move_entity_between_rooms(world, npc):
+            moved.append(npc)
+    return moved
 
-    # Traveling merchants
-    for merchant in getattr(world, "traveling_merchants", []):
-        _move_entity_between_rooms(world, merchant)
 
-    # Faction patrols (move as a group)
-    for patrol in getattr(world, "faction_patrols", []):
-        if not patrol:
-            continue
+# ---------------------------------------------------------
+# PLANNED MOVES (see systems.tick)
+# ---------------------------------------------------------
 
-        leader = patrol[0]
-        room = world.get_room(leader.room_id)
-        exits = list(room.exits.values())
-        if not exits:
-            continue
+def occupied_rooms(world, room_ids=None) -> list:
+    """(room_id, animals) for every room with animals, optionally only in room_ids."""
+    if room_ids is None:
+        return list(world.entities.animal_rooms())
+
+    found = []
+    for rid in room_ids:
+        animals = world.entities.animals_in(rid)
+        if animals:
+            found.append((rid, animals))
+    return found
 
-        new_room_id = random.choice(exits)
-        new_room = world.get_room(new_room_id)
 
-        for npc in patrol:
-            if npc in room.npcs:
-                room.npcs.remove(npc)
-            npc.room_id = new_room_id
-            new_room.npcs.append(npc)
+def commit_moves(world, moves: dict) -> list:
+    """Apply planned {entity: room_id} moves; returns the entities moved."""
+    for entity, room_id in moves.items():
+        world.move_entity(entity, room_id)
+    return list(moves)
 
 
 # ---------------------------------------------------------
 # HERD BEHAVIOR
 # ---------------------------------------------------------
 
-def herd_behavior(world):
-    """
-    Animals in the same room move together as a herd.
-    """
-    for room in world.rooms.values():
-        if len(room.animals) < 2:
+def plan_herds(world, occupied, moves: dict):
+    """Animals in the same room move together as a herd."""
+    for rid, animals in occupied:
+        if len(animals) < 2:
             continue
 
-        exits = list(room.exits.values())
-        if not exits:
+        new_room_id = world.random_neighbor(rid)
+        if new_room_id is None:
             continue
 
-        new_room_id = random.choice(exits)
-        new_room = world.get_room(new_room_id)
+        for a in animals:
+            moves.setdefault(a, new_room_id)
 
-        for a in list(room.animals):
-            room.animals.remove(a)
-            a.room_id = new_room_id
-            new_room.animals.append(a)
+
+def herd_behavior(world, room_ids=None):
+    """
+    Herds move one step. With room_ids, only those rooms are considered.
+    Returns the animals that moved.
+    """
+    moves = {}
+    plan_herds(world, occupied_rooms(world, room_ids), moves)
+    return commit_moves(world, moves)
 
 
 # ---------------------------------------------------------
 # PREDATOR HUNTING
 # ---------------------------------------------------------
 
-def predator_hunting(world):
+def plan_predators(world, occupied, moves: dict):
     """
-    Predators move toward adjacent rooms that contain prey.
+    Predators move toward adjacent rooms that contain prey. Only rooms
+    with predators and no prey hunt, and each checks the prey counters of
+    its own exits, so the work follows the predators, not the map.
     """
-    for room in world.rooms.values():
-        predators = [a for a in room.animals if a.hostile]
-        if not predators:
+    prey = world.entities.prey
+    predators = world.entities.predators
+
+    for rid, _ in occupied:
+        if not predators[rid] or prey[rid]:
+            continue
+
+        target = next((exit_id for exit_id in world.neighbors(rid) if prey[exit_id]), None)
+        if target is None:
             continue
 
-        for predator in list(predators):
-            # Already with prey?
-            if any(not a.hostile for a in room.animals if a is not predator):
-                continue
-
-            # Search adjacent rooms for prey
-            for exit_id in room.exits.values():
-                next_room = world.get_room(exit_id)
-                if any(not a.hostile for a in next_room.animals):
-                    room.animals.remove(predator)
-                    predator.room_id = exit_id
-                    next_room.animals.append(predator)
-                    break
+        for predator in world.entities.animals_in(rid):
+            if predator.hostile and predator not in moves:
+                moves[predator] = target
+
+
+def predator_hunting(world, room_ids=None):
+    """
+    Predators step toward prey. With room_ids, only those rooms are
+    considered. Returns the predators that moved.
+    """
+    moves = {}
+    plan_predators(world, occupied_rooms(world, room_ids), moves)
+    return commit_moves(world, moves)
 
 
 # ---------------------------------------------------------
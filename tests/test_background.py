@@ -0,0 +1,60 @@
+"""Moves whose world tick overlaps the typewriter end up exactly where synchronous ones do."""
+
+import random
+import threading
+
+import pytest
+
+from core.player import Player
+from core.replay import rng_position, state_digest
+from core.world import World
+from main import end_session, handle_move, start_session
+from systems.background import BackgroundTicker, TickOverlapError
+from ui.text_effects import set_headless, set_input
+
+ROUTE = ["north", "east", "east", "south", "west", "north", "north", "east"] * 4
+
+
+def _walk(background):
+    set_headless(True)
+    set_input(lambda prompt: "attack")  # any fight the route runs into
+    random.seed(11)
+    world = World(size=24, seed=11)
+    world.generate()
+    world.populate_world()
+
+    player = Player("Tester", world.start_room_id)
+    player.mount = None
+    sim, _ = start_session(world, player)
+    ticker = BackgroundTicker(background=background)
+    for direction in ROUTE:
+        handle_move(direction, world, player, ticker)
+    end_session(world, player, sim, ticker)
+    set_input(None)
+    return state_digest(world, player), rng_position(), world.world_time
+
+
+def test_overlapped_tick_matches_synchronous_tick():
+    assert _walk(background=True) == _walk(background=False)
+
+
+def test_guard_trips_on_world_and_random_until_join():
+    world = World(size=10, seed=1)
+    world.generate()
+
+    release = threading.Event()
+    ticker = BackgroundTicker(background=True, guard=True)
+    # The tick's own thread may use both
+    ticker.start(lambda w: (release.wait(), w.get_room(0), random.random()), world)
+
+    with pytest.raises(TickOverlapError):
+        world.get_room(0)
+    with pytest.raises(TickOverlapError):
+        random.random()
+
+    release.set()
+    ticker.join()
+    assert "get_room" not in vars(world)
+    world.get_room(0)
+    random.random()
+    ticker.close()
@@ -0,0 +1,60 @@
+"""Predator hunting keeps the EntityIndex prey/predator counters in step with the animals."""
+
+import random
+from collections import Counter
+
+from actors.animal import Animal
+from core.world import World
+from systems.tick import TickEngine
+from systems.world_events import predator_hunting
+
+
+def _world():
+    random.seed(11)
+    world = World(size=16, seed=11)
+    world.generate()
+    world.populate_world()
+    return world
+
+
+def _counted(world):
+    """Prey and predators per room, recounted from the animals themselves."""
+    prey, predators = Counter(), Counter()
+    for rid, animals in world.entities.animal_rooms():
+        for animal in animals:
+            assert animal.room_id == rid
+            (predators if animal.hostile else prey)[rid] += 1
+    return prey, predators
+
+
+def test_predator_steps_into_the_prey_room():
+    world = _world()
+    rid = world.start_room_id
+    target = world.neighbors(rid)[0]
+    for room in (rid, *world.neighbors(rid), target, *world.neighbors(target)):
+        for animal in list(world.entities.animals_in(room)):
+            world.entities.remove(animal)
+
+    wolf = Animal("Wolf", True, "forest", rid)
+    deer = Animal("Deer", False, "forest", target)
+    world.entities.add(wolf, rid)
+    world.entities.add(deer, target)
+
+    assert predator_hunting(world, [rid]) == [wolf]
+    assert world.entities.room_of(wolf) == target
+    assert world.entities.predators[target] == 1 and world.entities.prey[target] == 1
+    assert rid not in world.entities.predators
+
+
+def test_counters_match_animals_after_hunts():
+    world = _world()
+    engine = TickEngine(world)
+
+    hunted = 0
+    for _ in range(30):
+        hunted += len(predator_hunting(world))
+        engine.run()
+        prey, predators = _counted(world)
+        assert dict(world.entities.prey) == dict(prey)
+        assert dict(world.entities.predators) == dict(predators)
+    assert hunted
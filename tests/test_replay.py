@@ -0,0 +1,98 @@
+"""A recorded session plays back to the same world, and a tampered one is caught."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.replay import replay_once
+from core.replay import ReplayDiverged, replay_log
+from main import run_game
+from ui.text_effects import set_headless, set_input
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = ["Tester", "n", "e", "e", "look", "s", "w", "rest", "n", "n", "wait 1", "e", "map"]
+
+
+@pytest.fixture
+def recorded(tmp_path, monkeypatch):
+    """Path of a short session recorded headless with a fixed seed."""
+    lines = iter(SCRIPT)
+    # Seed 5 walks this route without a fight; then the player quits
+    monkeypatch.setattr("builtins.input", lambda prompt: next(lines, "quit"))
+    set_headless(True)
+
+    path = str(tmp_path / "session.jsonl")
+    replay_log.__init__()
+    replay_log.record(path, seed=5)
+    run_game()
+    yield path
+
+    replay_log.close()
+    replay_log.__init__()
+    set_input(None)
+
+
+def _records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _rewrite(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+
+
+def test_recording_has_every_checkpoint(recorded):
+    records = _records(recorded)
+    assert records[0] == {"type": "session", "version": 1, "seed": 5}
+    assert records[-1]["type"] == "end"
+    assert [r["text"] for r in records if r["type"] == "input"] == SCRIPT + ["quit"]
+    # Moves that found an exit, the rest and the wait each ticked the world
+    assert sum(r["type"] == "tick" for r in records) == 8
+
+
+def test_playback_verifies_the_final_state(recorded):
+    result = replay_once(recorded)
+    assert result["state_verified"]
+    assert result["inputs"] == sum(r["type"] == "input" for r in _records(recorded))
+
+
+def test_playback_ignores_the_hash_seed(recorded):
+    for hash_seed in ("2", "3"):
+        env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+        done = subprocess.run(
+            [sys.executable, "-m", "benchmarks.replay", recorded],
+            cwd=ROOT, env=env, capture_output=True, text=True,
+        )
+        assert done.returncode == 0, done.stderr
+        assert json.loads(done.stdout)["state_verified"]
+
+
+def test_changed_input_diverges(recorded):
+    records = _records(recorded)
+    first_move = next(r for r in records if r["type"] == "input" and r["text"] == "n")
+    first_move["text"] = "s"
+    _rewrite(recorded, records)
+
+    with pytest.raises(ReplayDiverged):
+        replay_once(recorded)
+
+
+def test_changed_end_state_diverges(recorded):
+    records = _records(recorded)
+    records[-1]["state"] ^= 1
+    _rewrite(recorded, records)
+
+    with pytest.raises(ReplayDiverged, match="different world state"):
+        replay_once(recorded)
+
+
+def test_truncated_log_is_not_verified(recorded):
+    records = _records(recorded)
+    _rewrite(recorded, records[:len(records) // 2])
+
+    assert not replay_once(recorded)["state_verified"]
@@ -0,0 +1,104 @@
+"""The timing wheel runs jobs at their due time, in due order, on any lap."""
+
+import random
+
+from core.scheduler import RESOLUTION, WHEEL_SLOTS, Scheduler
+
+LAP = RESOLUTION * WHEEL_SLOTS
+
+
+def _recorder(scheduler, log):
+    def record(name):
+        log.append((name, scheduler.now))
+    return record
+
+
+def test_job_on_a_later_lap_waits_for_its_lap():
+    scheduler, log = Scheduler(), []
+    record = _recorder(scheduler, log)
+    scheduler.at(LAP + 8, record, "late")     # same slot as hour 8
+    scheduler.at(8, record, "early")
+
+    scheduler.advance(8)
+    assert log == [("early", 8)]
+    scheduler.advance(LAP + 7.9)
+    assert log == [("early", 8)]
+    scheduler.advance(LAP + 8)
+    assert log == [("early", 8), ("late", LAP + 8)]
+    assert len(scheduler) == 0
+
+
+def test_one_advance_across_several_laps_runs_every_occurrence_in_order():
+    scheduler, log = Scheduler(now=3.0), []
+    record = _recorder(scheduler, log)
+    scheduler.every(5, record, "caravan")
+    scheduler.every(7.5, record, "patrol", start=4.0)
+    scheduler.at(50, record, "once")
+
+    assert scheduler.advance(3 + 3 * LAP) == 19 + 13 + 1
+    expected = sorted(
+        [("caravan", 3.0 + 5 * k) for k in range(1, 20)]
+        + [("patrol", 4.0 + 7.5 * k) for k in range(13)]
+        + [("once", 50)],
+        key=lambda entry: entry[1],
+    )
+    assert log == expected
+    assert len(scheduler) == 2
+
+
+def test_partial_ticks_and_ties():
+    scheduler, log = Scheduler(), []
+    record = _recorder(scheduler, log)
+    scheduler.at(10.2, record, "b")
+    scheduler.at(10.2, record, "c")
+    scheduler.at(10.0, record, "a")
+
+    scheduler.advance(10.1)     # 10.2 shares the tick but isn't due yet
+    assert log == [("a", 10.0)]
+    assert scheduler.advance(10.0) == 0     # time never goes back
+    scheduler.advance(10.3)
+    assert log == [("a", 10.0), ("b", 10.2), ("c", 10.2)]
+
+
+def test_cancel_and_returning_false_stop_a_job():
+    scheduler, runs = Scheduler(), []
+    cancelled = scheduler.every(1, runs.append, "cancelled")
+    scheduler.every(1, lambda: runs.append("twice") or len(runs) < 3)
+
+    scheduler.advance(2)
+    scheduler.cancel(cancelled)
+    scheduler.advance(10)
+    assert runs == ["cancelled", "twice", "cancelled", "twice"]
+    assert len(scheduler) == 0
+
+
+def test_skip_moves_recurring_jobs_past_the_gap():
+    scheduler, log = Scheduler(), []
+    record = _recorder(scheduler, log)
+    scheduler.every(24, record, "war", start=24)
+    scheduler.every(3, record, "caravan")
+    scheduler.at(5, record, "overdue")
+    scheduler.cancel(scheduler.at(6, record, "cancelled"))
+
+    scheduler.skip(10 * 24 + 1)
+    assert log == [] and len(scheduler) == 3
+
+    scheduler.advance(11 * 24)
+    assert log[0] == ("overdue", 10 * 24 + 1)
+    assert [t for name, t in log if name == "caravan"] == [243 + 3 * k for k in range(8)]
+    assert [t for name, t in log if name == "war"] == [11 * 24]
+
+
+def test_matches_a_sorted_list_of_due_times():
+    rng = random.Random(1)
+    scheduler, log = Scheduler(), []
+    record = _recorder(scheduler, log)
+    due = sorted(rng.uniform(0, 5 * LAP) for _ in range(300))
+    for i, time in enumerate(rng.sample(due, len(due))):
+        scheduler.at(time, record, i)
+
+    now = 0.0
+    while now < 5 * LAP:
+        now += rng.choice((0.5, 1.0, 2.5, LAP - 0.5, 40.0))
+        scheduler.advance(now)
+    assert [time for _, time in log] == due
@@ -0,0 +1,106 @@
+"""Territory bitsets agree with a plain per-room walk over the grid."""
+
+import random
+
+from core.grid import GridAdjacency
+from core.territory import Territories, iter_bits, mask_of, nth_bit
+from core.war import contested_mask
+from core.world import World
+
+SIZE = 9    # rows of 9 bits: row edges never line up with bytes or words
+
+
+def _random_territories(seed, factions=("red", "blue", "green")):
+    rng = random.Random(seed)
+    territories = Territories(GridAdjacency(SIZE), factions)
+    owners = {}
+    for rid in range(SIZE * SIZE):
+        owner = rng.choice(factions + (None, None))
+        if owner:
+            territories.add(owner, rid)
+            owners[rid] = owner
+    return territories, owners
+
+
+def _neighbors(rid):
+    return set(GridAdjacency(SIZE).exits(rid).values())
+
+
+def test_bit_helpers_match_the_set_positions():
+    rooms = [0, 5, 63, 64, 65, 127, 200, 1000]
+    mask = sum(1 << rid for rid in rooms)
+    assert list(iter_bits(mask)) == rooms
+    assert [nth_bit(mask, n) for n in range(len(rooms))] == rooms
+    assert mask_of(bytes(1 if i in rooms else 0 for i in range(1001))) == mask
+
+
+def test_add_and_discard_keep_masks_and_areas_in_step():
+    territories = Territories(GridAdjacency(SIZE), ["red"])
+    territories.add("red", 10)
+    territories.add("red", 10)
+    territories.add("blue", 80)
+    territories.discard("red", 11)
+    assert territories.area("red") == 1 and territories.area("blue") == 1
+    assert territories.controls("red", 10) and not territories.controls("red", 11)
+    assert territories.owner(80) == "blue" and territories.owner(0) is None
+
+    territories.discard("red", 10)
+    assert territories.masks["red"] == 0 and territories.counts() == {"red": 0, "blue": 1}
+
+
+def test_reads_match_a_per_room_walk():
+    territories, owners = _random_territories(seed=3)
+    for faction in territories:
+        held = sorted(rid for rid, owner in owners.items() if owner == faction)
+        assert territories.rooms(faction) == held
+        assert territories.area(faction) == len(held)
+        assert [territories.nth_room(faction, n) for n in range(len(held))] == held
+    assert all(territories.owner(rid) == owners.get(rid) for rid in range(SIZE * SIZE))
+
+
+def test_spread_stays_on_the_grid():
+    territories = Territories(GridAdjacency(SIZE))
+    for rid in (0, SIZE - 1, SIZE, 40, SIZE * SIZE - 1):
+        assert set(iter_bits(territories.spread(1 << rid))) == _neighbors(rid)
+
+
+def test_frontier_and_contested_borders():
+    territories, owners = _random_territories(seed=8)
+    for faction in territories:
+        frontier = {
+            rid for rid, owner in owners.items()
+            if owner == faction and any(owners.get(n) != faction for n in _neighbors(rid))
+        }
+        assert set(territories.frontier_rooms(faction)) == frontier
+
+    contested = {
+        rid for rid, owner in owners.items()
+        if any(owners.get(n) not in (None, owner) for n in _neighbors(rid))
+    }
+    assert set(iter_bits(contested_mask(territories))) == contested
+
+
+def test_linked_rooms_are_frontier():
+    territories = Territories(GridAdjacency(SIZE))
+    for rid in range(SIZE * SIZE):
+        territories.add("red", rid)
+    assert territories.frontier("red") == 0
+
+    territories.grid.link(40, "down", 0)
+    assert territories.frontier_rooms("red") == [40]
+
+
+def test_world_ownership_matches_the_bitsets():
+    random.seed(4)
+    world = World(size=16, seed=4)
+    world.generate()
+    world.populate_world()
+    for _ in range(3):
+        world.simulate_faction_war()
+
+    for rid, room in world.rooms.items():
+        assert world.territories.owner(rid) == room.faction_control
+        assert room.contested == bool(world.territories.contested >> rid & 1)
+    assert world.faction_counts() == {
+        f: sum(r.faction_control == f for r in world.rooms.values()) for f in world.territories
+    }
@@ -3,6 +3,34 @@ import sys
 import time
 import shutil
 
+from core.trace import tracer
+
+# Headless runs (replays, soak tests) skip delays, screen clears and output
+HEADLESS = False
+
+# Where player input comes from (see ask / set_input)
+_input = input
+
+
+def set_headless(headless=True):
+    global HEADLESS
+    HEADLESS = headless
+
+
+def set_input(source):
+    """Read player input from source(prompt) instead of input() (None restores it)."""
+    global _input
+    _input = source if source is not None else input
+
+
+# ---------------------------------------------------------
+# PLAYER INPUT
+# ---------------------------------------------------------
+def ask(prompt="> "):
+    """Every line the player types goes through here."""
+    with tracer.waiting():
+        return _input(prompt)
+
 # ---------------------------------------------------------
 # CORE TYPEWRITER EFFECT
 # ---------------------------------------------------------
@@ -11,11 +39,15 @@ def type_text(text, speed=0.02):
     Cinematic typewriter effect.
     speed = delay per character.
     """
-    for ch in text:
-        sys.stdout.write(ch)
-        sys.stdout.flush()
-        time.sleep(speed)
-    print()
+    if HEADLESS:
+        return
+    # Typing is presentation, not simulation time (see core.profiler)
+    with tracer.waiting():
+        for ch in text:
+            sys.stdout.write(ch)
+            sys.stdout.flush()
+            time.sleep(speed)
+        print()
 
 
 # ---------------------------------------------------------
@@ -23,20 +55,23 @@ def type_text(text, speed=0.02):
 # ---------------------------------------------------------
 def dramatic(text):
     type_text(text, speed=0.04)
-    time.sleep(0.4)
+    pause(0.4)
 
 
 # ---------------------------------------------------------
 # INSTANT PRINT (for debugging or fast UI)
 # ---------------------------------------------------------
 def instant(text):
-    print(text)
+    if not HEADLESS:
+        print(text)
 
 
 # ---------------------------------------------------------
 # CLEAR SCREEN
 # ---------------------------------------------------------
 def clear_screen():
+    if HEADLESS:
+        return
     os.system("cls" if os.name == "nt" else "clear")
 
 
@@ -44,6 +79,8 @@ def clear_screen():
 # CINEMATIC BANNER
 # ---------------------------------------------------------
 def banner(text):
+    if HEADLESS:
+        return
     clear_screen()
     width = shutil.get_terminal_size().columns
     line = "=" * width
@@ -63,12 +100,14 @@ def reveal(text, speed=0.02):
     """
     for line in text.split("\n"):
         type_text(line, speed)
-        time.sleep(0.2)
+        pause(0.2)
 
 
 # ---------------------------------------------------------
 # CINEMATIC PAUSE
 # ---------------------------------------------------------
 def pause(seconds=0.5):
-    time.sleep(seconds)
+    if not HEADLESS:
+        with tracer.waiting():
+            time.sleep(seconds)
 